@@ -0,0 +1,111 @@
+# synthetic dataset for the memory backend
+# Sizes are configurable so the same scenarios can run against a few hundred
+# rows or production-like volumes.
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+DISABILITIES = ["Visual", "Hearing", "Mobility", "Speech", "Intellectual", "Psychosocial", "Chronic Illness"]
+INDUSTRIES = ["IT", "BPO", "Retail", "Manufacturing", "Healthcare", "Education", "Finance", "Logistics"]
+JOB_TYPES = ["Full-time", "Part-time", "Contract", "Remote"]
+LOCATIONS = ["Manila", "Quezon City", "Cebu", "Davao", "Makati", "Pasig", "Taguig", "Iloilo"]
+PASSWORD = "benchmark-pass"
+
+
+def skillVocabulary(size: int) -> list:
+    base = [
+        "python", "sql", "excel", "customer service", "data entry", "communication", "javascript", "react",
+        "accounting", "bookkeeping", "sales", "marketing", "graphic design", "writing", "transcription",
+        "java", "php", "networking", "technical support", "project management", "teaching", "nursing",
+        "cooking", "driving", "carpentry", "welding", "sewing", "inventory", "logistics", "photography",
+    ]
+    return (base + [f"skill {i}" for i in range(size)])[:max(size, 5)]
+
+def buildDataset(employees: int = 200, employers: int = 20, jobs: int = 1000, skills: int = 60,
+                 history_per_employee: int = 5, messages_per_employee: int = 3,
+                 notifications_per_user: int = 10, seed: int = 7) -> dict:
+    # rows per table, plus auth users and the ids scenarios need to address them
+    rng = random.Random(seed)
+    vocabulary = skillVocabulary(skills)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    stamp = lambda i: (start + timedelta(minutes=i)).isoformat()
+
+    auth_users, employee_rows, employer_rows = [], [], []
+    for i in range(employers):
+        user_id = f"00000000-0000-4000-8000-{i:012d}"
+        email = f"employer{i}@bench.local"
+        auth_users.append({"id": user_id, "email": email, "password": PASSWORD})
+        employer_rows.append({
+            "id": i + 1, "user_id": user_id, "email": email, "role": "employer",
+            "company_name": f"Company {i}", "company_level": "SME", "website_url": f"https://company{i}.example",
+            "company_type": "Private", "industry": rng.choice(INDUSTRIES), "admin_name": f"Admin {i}",
+            "logo_url": "", "description": "Benchmark employer", "location": rng.choice(LOCATIONS),
+            "tags": "inclusive", "created_at": stamp(i),
+        })
+    skill_ids = {skill: n + 1 for n, skill in enumerate(vocabulary)}
+    for i in range(employees):
+        user_id = f"00000000-0000-4000-9000-{i:012d}"
+        email = f"employee{i}@bench.local"
+        auth_users.append({"id": user_id, "email": email, "password": PASSWORD})
+        disability = rng.choice(DISABILITIES)
+        skills = rng.sample(vocabulary, rng.randint(3, 8))
+        employee_rows.append({
+            "id": i + 1, "user_id": user_id, "email": email, "role": "employee",
+            "full_name": f"EMPLOYEE {i}", "disability": disability,
+            "skills": json.dumps(skills), "skill_names": sorted(skills), "skill_ids": [skill_ids[skill] for skill in sorted(skills)],
+            "address": rng.choice(LOCATIONS), "phone_number": f"0917{i:07d}", "short_bio": "Benchmark employee",
+            "resume_url": "", "profile_pic_url": "", "pwd_id_front_url": "", "is_verified": rng.random() < 0.6,
+            "created_at": stamp(i),
+        })
+
+    job_rows = []
+    for i in range(jobs):
+        employer = employer_rows[i % employers]
+        job_skills = rng.sample(vocabulary, 5)
+        min_salary = rng.randrange(15000, 40000, 1000)
+        job_rows.append({
+            "id": i + 1, "user_id": employer["user_id"], "title": f"{job_skills[0].title()} Associate {i}",
+            "job_description": f"Looking for someone with {', '.join(job_skills)}.",
+            **{f"skill_{n + 1}": skill for n, skill in enumerate(job_skills)},
+            "allowed_disabilities": rng.sample(DISABILITIES, rng.randint(1, 4)),
+            "pwd_friendly": rng.random() < 0.85, "company_name": employer["company_name"],
+            "location": rng.choice(LOCATIONS), "job_type": rng.choice(JOB_TYPES), "industry": employer["industry"],
+            "experience": f"{rng.randint(0, 5)} years", "fixed_salary": None,
+            "min_salary": min_salary, "max_salary": min_salary + 10000, "created_at": stamp(i),
+        })
+
+    history_rows, message_rows, notification_rows = [], [], []
+    history_jobs = {}
+    for employee in employee_rows:
+        picked = rng.sample(job_rows, min(history_per_employee, len(job_rows)))
+        history_jobs[employee["user_id"]] = [job["id"] for job in picked]
+        for job in picked:
+            history_rows.append({"user_id": employee["user_id"], "job_id": job["id"], "applied": False})
+        for job in picked[:messages_per_employee]:
+            message_rows.append({
+                "sender_id": job["user_id"], "receiver_id": employee["user_id"], "job_id": str(job["id"]),
+                "type": "text", "message": "Thanks for your interest!", "is_read": rng.random() < 0.5,
+                "created_at": stamp(len(message_rows)),
+            })
+    for user in employee_rows + employer_rows:
+        for n in range(notifications_per_user):
+            notification_rows.append({
+                "title": "Update", "user_id": rng.choice(employee_rows)["user_id"], "receiver_id": user["user_id"],
+                "content": "You have a new update", "category": "message", "is_read": n % 3 == 0,
+                "created_at": stamp(len(notification_rows)),
+            })
+
+    return {
+        "_auth_users": auth_users,
+        "employee": employee_rows,
+        "employers": employer_rows,
+        "jobs": job_rows,
+        "skill_vocabulary": [{"id": skill_id, "name": skill} for skill, skill_id in skill_ids.items()],
+        "employee_history": history_rows,
+        "messages": message_rows,
+        "notifications": notification_rows,
+        "_history_jobs": history_jobs,
+    }
+
+def datasetSizes(dataset: dict) -> dict:
+    return {name: len(rows) for name, rows in dataset.items() if not name.startswith("_") or name == "_auth_users"}
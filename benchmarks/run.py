@@ -0,0 +1,189 @@
+# in-process load test for the hot endpoints
+#
+#   python -m benchmarks.run --requests 500 --concurrency 20 --jobs 10000
+#   python -m benchmarks.run --compare benchmarks/results/old.json benchmarks/results/new.json
+#
+# The app is driven through httpx.ASGITransport against the memory backends, so
+# no network, Supabase project or Redis is needed. Results are written as JSON.
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+# the stand-in backends have to be selected before the app is imported
+os.environ.setdefault("SUPABASE_BACKEND", "memory")
+os.environ.setdefault("REDIS_BACKEND", "memory")
+
+import httpx
+
+from benchmarks.dataset import buildDataset, datasetSizes, PASSWORD
+from benchmarks.scenarios import SCENARIOS, BenchContext, isErrorResponse
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    # nearest-rank percentile of an already sorted list
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+def summarize(latencies: list, errors: int, elapsed: float, requests_seen: int, queries_seen: float) -> dict:
+    ordered = sorted(latencies)
+    ms = lambda seconds: round(seconds * 1000, 3)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": ms(sum(ordered) / len(ordered)) if ordered else 0.0,
+            "p50": ms(percentile(ordered, 50)),
+            "p95": ms(percentile(ordered, 95)),
+            "p99": ms(percentile(ordered, 99)),
+            "max": ms(ordered[-1]) if ordered else 0.0,
+        },
+        "db_queries_per_request": round(queries_seen / requests_seen, 2) if requests_seen else 0.0,
+    }
+
+async def runScenario(client, ctx: BenchContext, scenario, requests: int, concurrency: int) -> dict:
+    from utils.metrics.service import getQueryTotals
+
+    latencies, errors = [], 0
+    counter = iter(range(requests))
+    requests_before, queries_before = getQueryTotals()
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            response = await scenario(client, ctx, i)
+            latencies.append(time.perf_counter() - start)
+            if isErrorResponse(response):
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    requests_after, queries_after = getQueryTotals()
+    return summarize(latencies, errors, elapsed, requests_after - requests_before, queries_after - queries_before)
+
+async def loginAll(client, ctx: BenchContext, dataset: dict):
+    for row in dataset["employee"] + dataset["employers"]:
+        path = "/employee/login" if row["role"] == "employee" else "/employer/login"
+        response = await client.post(path, json={"email": row["email"], "password": PASSWORD})
+        body = response.json()
+        if body.get("Status") != "Success":
+            raise RuntimeError(f"benchmark login failed for {row['email']}: {body}")
+        ctx.tokens[row["user_id"]] = body["Token"]
+
+async def runBenchmark(args) -> dict:
+    import index
+    from utils.memory_backend.supabase_client import getMemoryStore
+
+    dataset = buildDataset(employees=args.employees, employers=args.employers, jobs=args.jobs, skills=args.skills)
+    getMemoryStore().seed(dataset)
+    ctx = BenchContext(dataset)
+    names = args.scenarios or list(SCENARIOS)
+
+    transport = httpx.ASGITransport(app=index.app)
+    results = {}
+    await index.app.router.startup()
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            # the app prints per-request debug lines, keep them out of the report
+            with contextlib.redirect_stdout(io.StringIO()):
+                await loginAll(client, ctx, dataset)
+                for name in names:
+                    scenario = SCENARIOS[name]
+                    for i in range(args.warmup):
+                        await scenario(client, ctx, i)
+                    results[name] = await runScenario(client, ctx, scenario, args.requests, args.concurrency)
+            for name in names:
+                printScenario(name, results[name])
+    finally:
+        await index.app.router.shutdown()
+
+    return {
+        "meta": {
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "commit": gitCommit(),
+            "python": platform.python_version(),
+            "requests_per_scenario": args.requests,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+            "dataset": datasetSizes(dataset),
+        },
+        "scenarios": results,
+    }
+
+def gitCommit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def printScenario(name: str, result: dict):
+    latency = result["latency_ms"]
+    print(
+        f"{name:<22} {result['throughput_rps']:>9.1f} req/s  p50 {latency['p50']:>8.2f}ms  "
+        f"p95 {latency['p95']:>8.2f}ms  p99 {latency['p99']:>8.2f}ms  "
+        f"queries/req {result['db_queries_per_request']:>6.2f}  errors {result['errors']}"
+    )
+
+def compareResults(old_path: str, new_path: str):
+    # side by side p50/p95/throughput/query deltas of two saved runs
+    with open(old_path, encoding="utf-8") as f:
+        old = json.load(f)["scenarios"]
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)["scenarios"]
+    delta = lambda a, b: f"{((b - a) / a * 100):+.1f}%" if a else "n/a"
+    print(f"{'scenario':<22} {'p50':>18} {'p95':>18} {'req/s':>18} {'queries/req':>14}")
+    for name in new:
+        if name not in old:
+            continue
+        o, n = old[name], new[name]
+        print(
+            f"{name:<22} "
+            f"{n['latency_ms']['p50']:>9.2f} ({delta(o['latency_ms']['p50'], n['latency_ms']['p50']):>7}) "
+            f"{n['latency_ms']['p95']:>9.2f} ({delta(o['latency_ms']['p95'], n['latency_ms']['p95']):>7}) "
+            f"{n['throughput_rps']:>9.1f} ({delta(o['throughput_rps'], n['throughput_rps']):>7}) "
+            f"{o['db_queries_per_request']:>6.2f} -> {n['db_queries_per_request']:<6.2f}"
+        )
+
+def parseArgs(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the hot API endpoints in-process.")
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="requests in flight at once")
+    parser.add_argument("--warmup", type=int, default=10, help="unmeasured requests per scenario")
+    parser.add_argument("--employees", type=int, default=200)
+    parser.add_argument("--employers", type=int, default=20)
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--skills", type=int, default=60, help="size of the skill vocabulary")
+    parser.add_argument("--scenarios", nargs="*", choices=list(SCENARIOS), help="subset to run (default: all)")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/bench-<timestamp>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two result files and exit")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parseArgs(argv)
+    if args.compare:
+        compareResults(*args.compare)
+        return
+    report = asyncio.run(runBenchmark(args))
+    output = args.output or os.path.join(RESULTS_DIR, f"bench-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"results written to {output}")
+
+if __name__ == "__main__":
+    sys.exit(main())
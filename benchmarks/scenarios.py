@@ -0,0 +1,87 @@
+# scripted request mixes, one per hot endpoint
+# Each scenario is called with (client, ctx, i) where i is the request number,
+# so requests rotate over the seeded users instead of hammering one row.
+from benchmarks.dataset import PASSWORD
+
+
+class BenchContext:
+    # ids and session tokens shared by every scenario of a run
+    def __init__(self, dataset: dict):
+        self.employees = [row["user_id"] for row in dataset["employee"]]
+        self.employee_emails = [row["email"] for row in dataset["employee"]]
+        self.employers = [row["user_id"] for row in dataset["employers"]]
+        self.history_jobs = dataset["_history_jobs"]
+        self.job_owner = {row["id"]: row["user_id"] for row in dataset["jobs"]}
+        self.tokens = {}
+
+    def employee(self, i: int) -> str:
+        return self.employees[i % len(self.employees)]
+
+    def employer(self, i: int) -> str:
+        return self.employers[i % len(self.employers)]
+
+    def headers(self, user_id: str) -> dict:
+        return {"Authorization": f"Bearer {self.tokens[user_id]}"}
+
+async def login(client, ctx: BenchContext, i: int):
+    email = ctx.employee_emails[i % len(ctx.employee_emails)]
+    return await client.post("/employee/login", json={"email": email, "password": PASSWORD})
+
+async def preload(client, ctx: BenchContext, i: int):
+    return await client.get("/preload", headers=ctx.headers(ctx.employee(i)))
+
+async def recoJobs(client, ctx: BenchContext, i: int):
+    return await client.get("/reco-jobs", headers=ctx.headers(ctx.employee(i)))
+
+async def applyJob(client, ctx: BenchContext, i: int):
+    user_id = ctx.employee(i)
+    jobs = ctx.history_jobs[user_id]
+    job_id = jobs[(i // len(ctx.employees)) % len(jobs)]
+    return await client.post(f"/apply-job/{job_id}", headers=ctx.headers(user_id))
+
+async def sendMessage(client, ctx: BenchContext, i: int):
+    user_id = ctx.employee(i)
+    job_id = ctx.history_jobs[user_id][0]
+    return await client.post("/message/send-message", headers=ctx.headers(user_id), json={
+        "sender_id": user_id,
+        "receiver_id": ctx.job_owner[job_id],
+        "job_id": str(job_id),
+        "type": "text",
+        "message": f"benchmark message {i}",
+    })
+
+async def inboxMessages(client, ctx: BenchContext, i: int):
+    user_id = ctx.employee(i)
+    return await client.get(f"/inbox-messages/{user_id}", headers=ctx.headers(user_id))
+
+async def allNotifications(client, ctx: BenchContext, i: int):
+    user_id = ctx.employer(i)
+    return await client.get(f"/notification/get-all-notifications/{user_id}", headers=ctx.headers(user_id))
+
+async def unreadNotifications(client, ctx: BenchContext, i: int):
+    user_id = ctx.employee(i)
+    return await client.get(f"/notification/get-unread-notifications/{user_id}", headers=ctx.headers(user_id))
+
+# run in this order: apply_job and send_message add the most rows, so they go last
+SCENARIOS = {
+    "login": login,
+    "preload": preload,
+    "reco_jobs": recoJobs,
+    "inbox_messages": inboxMessages,
+    "all_notifications": allNotifications,
+    "unread_notifications": unreadNotifications,
+    "apply_job": applyJob,
+    "send_message": sendMessage,
+}
+
+def isErrorResponse(response) -> bool:
+    # the API reports most failures as 200 with {"Status": "Error"}
+    if response.status_code >= 400:
+        return True
+    try:
+        body = response.json()
+    except ValueError:
+        return False
+    if not isinstance(body, dict):
+        return False
+    return str(body.get("Status", "")).lower() == "error" or "error" in body
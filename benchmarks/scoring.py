@@ -0,0 +1,128 @@
+# skill-match scoring: per-job python loop vs the sparse matrix engine
+#
+#   python -m benchmarks.scoring --jobs 10000 100000 --users 200
+#
+# Runs without the app or any backend. For each job count it times
+#   loop          calculateJobMatchScore, once per user
+#   engine        JobSkillMatrix built per call, then scored
+#   engine_score  scoring against an already built matrix
+#   engine_batch  every user scored in one sparse product
+#   loop_reco / engine_reco   the same with /reco-jobs' 0.4 cut-off (--min-score)
+# and checks that every variant returns the same recommendations as the loop.
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+from benchmarks.dataset import buildDataset
+from benchmarks.run import RESULTS_DIR, gitCommit, percentile
+from utils.recomendation.service import calculateJobMatchScore, parseSkills
+from utils.scoring.service import JobSkillMatrix
+
+
+def timeCalls(calls: list) -> dict:
+    latencies = []
+    for call in calls:
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+    ordered = sorted(latencies)
+    ms = lambda seconds: round(seconds * 1000, 3)
+    return {
+        "calls": len(ordered),
+        "total_ms": ms(sum(ordered)),
+        "per_user_ms": ms(sum(ordered) / len(ordered)),
+        "p50_ms": ms(percentile(ordered, 50)),
+        "p95_ms": ms(percentile(ordered, 95)),
+    }
+
+def sameRecommendations(expected: list, actual: list) -> bool:
+    if len(expected) != len(actual):
+        return False
+    return all(
+        a["id"] == b["id"] and a["skill_match_score"] == b["skill_match_score"]
+        and set(a["matched_skills"]) == set(b["matched_skills"])
+        for a, b in zip(expected, actual)
+    )
+
+def benchJobCount(jobs: int, users: int, skills: int, min_score: float) -> dict:
+    dataset = buildDataset(employees=users, jobs=jobs, skills=skills, history_per_employee=0,
+                           messages_per_employee=0, notifications_per_user=0)
+    job_rows = dataset["jobs"]
+    skill_sets = [asyncio.run(parseSkills(row["skills"])) for row in dataset["employee"]]
+
+    loop = lambda s: asyncio.run(calculateJobMatchScore(s, job_rows))
+    loopReco = lambda s: [job for job in loop(s) if job["skill_match_score"] >= min_score]
+    expected = [loop(s) for s in skill_sets]
+    expected_reco = [[job for job in e if job["skill_match_score"] >= min_score] for e in expected]
+    built = JobSkillMatrix(job_rows)
+    checks = {
+        "engine": all(sameRecommendations(e, JobSkillMatrix(job_rows).recommend(s)) for e, s in zip(expected[:5], skill_sets)),
+        "engine_score": all(sameRecommendations(e, built.recommend(s)) for e, s in zip(expected, skill_sets)),
+        "engine_batch": all(sameRecommendations(e, a) for e, a in zip(expected, built.recommendMany(skill_sets))),
+        "engine_reco": all(sameRecommendations(e, built.recommend(s, min_score)) for e, s in zip(expected_reco, skill_sets)),
+    }
+
+    build_started = time.perf_counter()
+    JobSkillMatrix(job_rows)
+    build_ms = round((time.perf_counter() - build_started) * 1000, 3)
+
+    batch_started = time.perf_counter()
+    built.recommendMany(skill_sets)
+    batch_ms = (time.perf_counter() - batch_started) * 1000
+
+    return {
+        "jobs": jobs,
+        "users": users,
+        "min_score": min_score,
+        "matches_per_user": round(sum(map(len, expected)) / len(expected), 1),
+        "reco_matches_per_user": round(sum(map(len, expected_reco)) / len(expected_reco), 1),
+        "matrix_build_ms": build_ms,
+        "parity": checks,
+        "loop": timeCalls([lambda s=s: loop(s) for s in skill_sets]),
+        "engine": timeCalls([lambda s=s: JobSkillMatrix(job_rows).recommend(s) for s in skill_sets]),
+        "engine_score": timeCalls([lambda s=s: built.recommend(s) for s in skill_sets]),
+        "engine_batch": {"calls": 1, "total_ms": round(batch_ms, 3), "per_user_ms": round(batch_ms / users, 3)},
+        "loop_reco": timeCalls([lambda s=s: loopReco(s) for s in skill_sets]),
+        "engine_reco": timeCalls([lambda s=s: JobSkillMatrix(job_rows).recommend(s, min_score) for s in skill_sets]),
+    }
+
+def printResult(result: dict):
+    print(f"\n{result['jobs']} jobs, {result['users']} users, {result['matches_per_user']} matches/user "
+          f"({result['reco_matches_per_user']} >= {result['min_score']}), matrix build {result['matrix_build_ms']:.1f}ms")
+    for name, baseline in (("loop", "loop"), ("engine", "loop"), ("engine_score", "loop"), ("engine_batch", "loop"),
+                           ("loop_reco", "loop_reco"), ("engine_reco", "loop_reco")):
+        per_user = result[name]["per_user_ms"]
+        speedup = f"{result[baseline]['per_user_ms'] / per_user:.1f}x" if per_user else "n/a"
+        parity = "" if name not in result["parity"] else ("  parity ok" if result["parity"][name] else "  PARITY MISMATCH")
+        print(f"  {name:<13} {per_user:>10.3f} ms/user  {speedup:>7}{parity}")
+
+def parseArgs(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the skill-match scoring engine against the python loop.")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[10000, 100000], help="job counts to test")
+    parser.add_argument("--users", type=int, default=100, help="users scored per job count")
+    parser.add_argument("--skills", type=int, default=60, help="size of the skill vocabulary")
+    parser.add_argument("--min-score", type=float, default=0.4, help="cut-off used by the *_reco variants")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/scoring-<timestamp>.json)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parseArgs(argv)
+    results = []
+    for jobs in args.jobs:
+        result = benchJobCount(jobs, args.users, args.skills, args.min_score)
+        printResult(result)
+        results.append(result)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"scoring-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"meta": {"commit": gitCommit(), "skills": args.skills, "min_score": args.min_score}, "results": results}, f, indent=2)
+    print(f"\nresults written to {output}")
+    return 0 if all(all(result["parity"].values()) for result in results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
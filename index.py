@@ -1,5 +1,9 @@
-from fastapi import FastAPI, Request, HTTPException, File, UploadFile, Form, WebSocket
+import time
+_import_started = time.perf_counter()  # cold start: timed until the end of this module
+
+from fastapi import FastAPI, Request, HTTPException, File, UploadFile, Form, WebSocket, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 import json
 from models.model import loginCreds, jobCreation, updateJob, PasswordReset, PasswordResetConfirm
 import ast
@@ -8,10 +12,26 @@ import asyncio
 import re
 import base64
 from datetime import date
-from utils.recomendation.service import parseSkills, calculateJobMatchScore
+from utils.skillvocab.service import canonicalSkills, lookupSkillIds, readEmployeeSkills, employeeColumns, hasNormalizedSkills, normalizedSkillColumns
+from utils.talentindex.service import indexEmployee, markTalentIndexStale, searchTalent
 from utils.Oauth_other.service import limitNewUsers, checkIfEmployerExists, checkIfEmployeeExists
-from utils.session.service import getAuthUserIdFromRequest, settingAuthUserToRedis, deleteSessionRedis
+from utils.session.service import getAuthUserIdFromRequest, getAuthUserRoleFromRequest, requireRole, settingAuthUserToRedis, deleteSessionRedis, invalidateSessionRole, ROLE_TABLES
 from utils.notification.service import sendNotification, getUserPushToken, sendPushNotification, getJobStatusNotificationContent, getNotificationContent
+from utils.database.service import runQuery, shutdownQueryExecutor, getRowLoader
+from utils.projection.service import getColumns
+from utils.metrics.service import startRequestStats, observeRequest, renderMetrics, trackAsyncCall
+from utils.querybudget.service import enforceQueryBudget
+from utils.skillindex.service import indexJob, removeJobFromIndex, markSkillIndexStale, loadCandidateJobs, getIndexedSkills, parseDisabilities
+from utils.history.service import recordRecommendedJobs
+from utils.exclusion.service import getExcludedJobIds, excludeJob, dropExcludedJobIds
+from utils.applicantrank.service import scoreApplicant, hasMatchScoreColumn, getApplicantScores, addApplicant, dropJobApplicants
+from utils.textindex.service import recordDescriptionChange, saveDescriptionIndex
+from utils.minhash.service import INDEX_COLUMNS as SIGNATURE_COLUMNS, SIMILAR_JOBS_MIN_SCORE, indexJobSignature, findDuplicateJob, removeJobSignature, markMinHashIndexStale, findSimilarJobs
+from utils.recocache.service import RECO_MIN_SCORE, rankScores, getCachedScores, storeRecommendations, buildRecommendations, loadJobRows, patchManyJobRecommendations, invalidateUserRecommendations, markRecoCacheStale
+from utils.startup.service import loadEnvironment, isEagerStartup, lazyImport, recordImportTime, getStartupStats
+from utils.llm.service import getGroqClient
+from utils.scoring.service import rankJobMatches
+from utils.ranking.service import DEFAULT_PAGE_SIZE, clampPageSize, decodeCursor, selectPage
 
 app = FastAPI()
 app.add_middleware(
@@ -22,27 +42,87 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+# per-route latency and query count, reported on /metrics (plus the query budget check)
+@app.middleware("http")
+async def timingMiddleware(request: Request, call_next):
+    stats = startRequestStats()
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        route = request.scope.get("route")
+        route_path = route.path if route is not None else "unmatched"
+        observeRequest(route_path, request.method, status, time.perf_counter() - start, stats)
+    # development / staging only: flag requests over their query budget or repeating a query shape
+    enforceQueryBudget(route_path, request.method, stats)
+    return response
+
 import os
-from utils.general.service import getSupabaseClient, getSupabaseServiceClient
-from groq import Groq
-from dotenv import load_dotenv
+from utils.general.service import getSupabaseClient, getSupabaseServiceClient, getSupabaseAuthClient, initSupabaseRegistry, closeSupabaseRegistry, getSupabasePoolStats
+from utils.redis_server.redis_client import getRedisClient
 
-load_dotenv()
+loadEnvironment()
 
 url = os.getenv("SUPABASE_URL")
 service_key = os.getenv("SUPABASE_SERVICE_KEY")
 
 
+# build the shared supabase client registry (and its connection pool) once per process
+# STARTUP_MODE=eager also builds the clients and loads the SDKs here instead of on first use
+@app.on_event("startup")
+async def startup():
+    initSupabaseRegistry()
+    if isEagerStartup():
+        started = time.perf_counter()
+        getSupabaseClient()
+        getSupabaseServiceClient()
+        getRedisClient()
+        lazyImport("groq")
+        lazyImport("scipy.sparse")
+        recordImportTime("eager_warmup", time.perf_counter() - started)
+
+@app.on_event("shutdown")
+async def shutdown():
+    if _background_tasks:
+        await asyncio.gather(*_background_tasks, return_exceptions=True)
+    try:
+        saveDescriptionIndex()
+    except Exception as e:
+        print(f"⚠️ Could not save the description index: {e}")
+    shutdownQueryExecutor()
+    closeSupabaseRegistry()
+
+
 @app.get("/")
 async def root ():
     return {"message":"working"}
 
+@app.get("/metrics")
+async def metrics():
+    return PlainTextResponse(renderMetrics(), media_type="text/plain; version=0.0.4")
+
+@app.get("/pool-stats")
+async def poolStats():
+    return {
+        "Status": "Success",
+        "Pool": getSupabasePoolStats()
+    }
+
+@app.get("/startup-stats")
+async def startupStats():
+    return {
+        "Status": "Success",
+        "Startup": getStartupStats()
+    }
+
 
 @app.get("/preload")
 async def preload(request: Request):
     try:
-        # Get the auth user ID from the request
-        auth_userID = await getAuthUserIdFromRequest(request)
+        # Get the auth user ID and role from the request
+        auth_userID, role = await getAuthUserRoleFromRequest(request)
         supabase = getSupabaseServiceClient()
     except Exception as e:
         return {
@@ -53,10 +133,16 @@ async def preload(request: Request):
         }
     
 
+    if not role:
+        return {
+            "Status": "Error",
+            "isAuthenticated": False,
+            "Message": "User not found in either employee or employer tables"
+        }
+
     try:
-        # Check both employee and employer tables
-        employee_check = supabase.table("employee").select("*").eq("user_id", auth_userID).execute()
-        employer_check = supabase.table("employers").select("*").eq("user_id", auth_userID).execute()
+        # The session already knows the role, so only that profile table is read
+        user_check = await runQuery(supabase.table(ROLE_TABLES[role]).select(getColumns(f"{role}_profile")).eq("user_id", auth_userID))
     except Exception as e:
         return {
             "Status": "Error",
@@ -67,19 +153,12 @@ async def preload(request: Request):
     
 
     try:
-        if employee_check.data:
+        if user_check.data:
             return {
                 "Status": "Success",
                 "isAuthenticated": True,
-                "role": "employee",
-                "userData": employee_check.data
-            }
-        elif employer_check.data:
-            return {
-                "Status": "Success",
-                "isAuthenticated": True,
-                "role": "employer",
-                "userData": employer_check.data
+                "role": role,
+                "userData": user_check.data
             }
         else:
             return {
@@ -130,7 +209,7 @@ async def signUp(
         }
     try:
         # First step: Sign up the user
-        supabase = getSupabaseClient()
+        supabase = getSupabaseAuthClient()
         response = supabase.auth.sign_up(
             {
                 "email": email, 
@@ -320,8 +399,12 @@ async def signUp(
                 "pwd_id_front_url": pwd_id_front_url,
                 "pwd_id_back_url": pwd_id_back_url
                 }
+            data_to_be_inserted.update(await normalizeEmployeeSkills(supabase_insert, skills))
             # Insert all data into the database
-            insert_data = supabase_insert.table("employee").insert(data_to_be_inserted).execute()
+            insert_data = await runQuery(supabase_insert.table("employee").insert(data_to_be_inserted))
+            # a new profile row changes the user's role, drop any cached role from live sessions
+            await invalidateSessionRole(response.user.id)
+            await syncTalentIndex(supabase_insert, response.user.id)
             return {
                 "Status": "Successfull",
                 "Message": f"{full_name} has been successfully signed up",
@@ -350,7 +433,7 @@ async def employee_login(user: loginCreds):
         }
     
     try:
-        supabase = getSupabaseClient()
+        supabase = getSupabaseAuthClient()
         response = supabase.auth.sign_in_with_password(
             {
                 "email": user.email,
@@ -396,7 +479,7 @@ async def employee_login(user: loginCreds):
     
     # check if user exists in employee table
     try:
-        employee_check = supabase.table("employee").select("*").eq("user_id", auth_userID).single().execute()
+        employee_check = await runQuery(supabase.table("employee").select(getColumns("role_check")).eq("user_id", auth_userID).single())
     except Exception as e:
         return {
             "Status": "Error",
@@ -410,10 +493,12 @@ async def employee_login(user: loginCreds):
             "Message": "Account not found. Please contact support."
         }
     
-    # store session in Redis
+    # store session in Redis (role is resolved here once so protected routes skip the lookup)
     session_data = {
         "auth_userID": auth_userID,
-        "refresh_token": refresh_token
+        "refresh_token": refresh_token,
+        "role": "employee",
+        "profile_id": employee_check.data.get("id")
     }
     
     try:
@@ -469,7 +554,7 @@ async def signUp(
     
     # sign up the user
     try:
-        supabase = getSupabaseClient()
+        supabase = getSupabaseAuthClient()
         response = supabase.auth.sign_up(
             {
                 "email": email, 
@@ -559,7 +644,9 @@ async def signUp(
         
         # Insert data into database
         try:
-            insert_data = supabase_insert.table("employers").insert(user_data).execute()
+            insert_data = await runQuery(supabase_insert.table("employers").insert(user_data))
+            # a new profile row changes the user's role, drop any cached role from live sessions
+            await invalidateSessionRole(response.user.id)
             
             if insert_data.data:
                 return {
@@ -597,7 +684,7 @@ async def employer_login(user: loginCreds):
     
     # attempt authentication
     try:
-        supabase = getSupabaseClient()
+        supabase = getSupabaseAuthClient()
         response = supabase.auth.sign_in_with_password(
             {
                 "email": user.email,
@@ -644,7 +731,7 @@ async def employer_login(user: loginCreds):
     
     # check if user exists in employers table
     try:
-        employer_check = supabase.table("employers").select("*").eq("user_id", auth_userID).single().execute()
+        employer_check = await runQuery(supabase.table("employers").select(getColumns("role_check")).eq("user_id", auth_userID).single())
     except Exception as e:
         return {
             "Status": "Error",
@@ -658,10 +745,12 @@ async def employer_login(user: loginCreds):
             "Message": "Account not found or not registered as an employer"
         }
     
-    # store session in Redis
+    # store session in Redis (role is resolved here once so protected routes skip the lookup)
     session_data = {
         "auth_userID": auth_userID,
-        "refresh_token": refresh_token
+        "refresh_token": refresh_token,
+        "role": "employer",
+        "profile_id": employer_check.data.get("id")
     }
     
     try:
@@ -684,7 +773,7 @@ async def employer_login(user: loginCreds):
 async def viewProfile(request: Request):
     # authentication
     try:
-        auth_userID = await getAuthUserIdFromRequest(request)
+        auth_userID, role = await getAuthUserRoleFromRequest(request)
         if not auth_userID:
             return {
                 "Status": "Error",
@@ -698,38 +787,24 @@ async def viewProfile(request: Request):
             "Details": f"{e}"
         }
     
-    # check employer table first
-    try:
-        response_employer = supabase.table("employers").select("*").eq("user_id", auth_userID).single().execute()
-    except Exception as e:
-        # Continue to check employee table - this might just mean user is not an employer
-        response_employer = None
-    
-    if response_employer and response_employer.data:
-        return {
-            "Status": "Success",
-            "Message": "Employer profile retrieved successfully",
-            "Profile": response_employer.data,
-            "UserType": "employer"
-        }
-    
-    # check employee table
-    try:
-        response_employee = supabase.table("employee").select("*").eq("user_id", auth_userID).single().execute()
-    except Exception as e:
-        return {
-            "Status": "Error",
-            "Message": "Failed to retrieve profile data",
-            "Details": f"{e}"
-        }
-    
-    if response_employee and response_employee.data:
-        return {
-            "Status": "Success",
-            "Message": "Employee profile retrieved successfully",
-            "Profile": response_employee.data,
-            "UserType": "employee"
-        }
+    # read the profile table that matches the session role
+    if role:
+        try:
+            response_profile = await runQuery(supabase.table(ROLE_TABLES[role]).select("*").eq("user_id", auth_userID).single())
+        except Exception as e:
+            return {
+                "Status": "Error",
+                "Message": "Failed to retrieve profile data",
+                "Details": f"{e}"
+            }
+        
+        if response_profile and response_profile.data:
+            return {
+                "Status": "Success",
+                "Message": f"{role.capitalize()} profile retrieved successfully",
+                "Profile": response_profile.data,
+                "UserType": role
+            }
     
     # not found in either table
     return {
@@ -759,7 +834,7 @@ async def updateEmployerProfile(
     
     # authentication
     try:
-        auth_userID = await getAuthUserIdFromRequest(request)
+        auth_userID, role = await getAuthUserRoleFromRequest(request)
         if not auth_userID:
             return {
                 "Status": "Error",
@@ -774,16 +849,7 @@ async def updateEmployerProfile(
         }
     
     # verify user is an employer
-    try:
-        search_employer = supabase.table("employers").select("user_id").eq("user_id", auth_userID).single().execute()
-    except Exception as e:
-        return {
-            "Status": "Error",
-            "Message": "Failed to verify employer account",
-            "Details": f"{e}"
-        }
-    
-    if not search_employer.data:
+    if role != "employer":
         return {
             "Status": "Error",
             "Message": "Account not found in employers table"
@@ -873,7 +939,7 @@ async def updateEmployerProfile(
 
     # update database
     try:
-        update_employer_res = supabase.table("employers").update(updated_details).eq("user_id", auth_userID).execute()
+        update_employer_res = await runQuery(supabase.table("employers").update(updated_details).eq("user_id", auth_userID))
         
         if update_employer_res.data:
             return {
@@ -915,7 +981,7 @@ async def updateEmployeeProfile(
     
     # authentication
     try:
-        auth_userID = await getAuthUserIdFromRequest(request)
+        auth_userID, role = await getAuthUserRoleFromRequest(request)
         if not auth_userID:
             return {
                 "Status": "Error",
@@ -930,16 +996,7 @@ async def updateEmployeeProfile(
         }
     
     # verify user is an employee
-    try:
-        search_employee = supabase.table("employee").select("user_id").eq("user_id", auth_userID).single().execute()
-    except Exception as e:
-        return {
-            "Status": "Error",
-            "Message": "Failed to verify employee account",
-            "Details": f"{e}"
-        }
-    
-    if not search_employee.data:
+    if role != "employee":
         return {
             "Status": "Error",
             "Message": "Account not found in employees table"
@@ -1080,9 +1137,18 @@ async def updateEmployeeProfile(
 
     # update database
     try:
-        update_employee_res = supabase.table("employee").update(updated_details).eq("user_id", auth_userID).execute()
+        if "skills" in updated_details:
+            updated_details.update(await normalizeEmployeeSkills(supabase, skills))
+        update_employee_res = await runQuery(supabase.table("employee").update(updated_details).eq("user_id", auth_userID))
         
         if update_employee_res.data:
+            if {"skills", "disability"} & updated_details.keys():
+                await syncTalentIndex(supabase, auth_userID)
+            if {"skills", "short_bio", "disability"} & updated_details.keys():
+                try:
+                    await invalidateUserRecommendations(auth_userID)
+                except Exception as e:
+                    print(f"⚠️ Recommendation cache invalidation failed: {e}")
             return {
                 "Status": "Success",
                 "Message": "Profile updated successfully",
@@ -1111,66 +1177,54 @@ async def updateEmployeeProfile(
 # This endpoint is for empployers to be able create jobs, view al jobs listings they created, view a specific job listinsg details, delete, and update
 
 @app.post("/jobs/create-jobs")
-async def createJob(job: jobCreation, request: Request):
-    #check if the user is authenticated
-    try:
-        auth_userID = await getAuthUserIdFromRequest(request)
-        #check first if the user exist as an employer
-        supabase = getSupabaseServiceClient()
-    except Exception as e:
+async def createJob(job: jobCreation, request: Request, block_duplicates: bool = False, session: dict = Depends(requireRole("employer"))):
+    # only employers get past requireRole, everyone else gets a 401 / 403
+    auth_userID = session["auth_userID"]
+    supabase = getSupabaseServiceClient()
+
+    # structure teh data to be created
+    jobs_data = {
+        "user_id": auth_userID,
+        "title": job.title,
+        "job_description": job.description,
+        "skill_1": job.skill_1,
+        "skill_2": job.skill_2,
+        "skill_3": job.skill_3,
+        "skill_4": job.skill_4,
+        "skill_5": job.skill_5,
+        "allowed_disabilities": job.allowed_disabilities,
+        "pwd_friendly": job.pwd_friendly,
+        "company_name": job.company_name,
+        "location": job.location,
+        "job_type": job.job_type,
+        "industry": job.industry,
+        "experience": job.experience,
+        "fixed_salary": job.fixed_salary if job.fixed_salary is not None else None,
+        "min_salary": job.min_salary if job.min_salary is not None else None,
+        "max_salary": job.max_salary if job.max_salary is not None else None
+    }
+    # reposts of one of the employer's own jobs are flagged, or refused with block_duplicates
+    duplicate = await checkDuplicateJob(supabase, jobs_data)
+    if duplicate and block_duplicates:
         return {
             "Status": "Error",
-            "Message": "Internal Server Error"
+            "Message": "This job looks like a repost of one of your existing jobs",
+            "Suspected Duplicate": duplicate
         }
-    
-    #check if the user exist as an employer
     try:
-        search_id = supabase.table("employers").select("user_id").eq("user_id", auth_userID).single().execute()
-    except Exception as e:
-        return {
-            "Status": "Error",
-            "Message": "User not found in employers table"
-        }
-    
-    if search_id:
-        # structure teh data to be created
-        jobs_data = {
-            "user_id": auth_userID,
-            "title": job.title,
-            "job_description": job.description,
-            "skill_1": job.skill_1,
-            "skill_2": job.skill_2,
-            "skill_3": job.skill_3,
-            "skill_4": job.skill_4,
-            "skill_5": job.skill_5,
-            "allowed_disabilities": job.allowed_disabilities,
-            "pwd_friendly": job.pwd_friendly,
-            "company_name": job.company_name,
-            "location": job.location,
-            "job_type": job.job_type,
-            "industry": job.industry,
-            "experience": job.experience,
-            "fixed_salary": job.fixed_salary if job.fixed_salary is not None else None,
-            "min_salary": job.min_salary if job.min_salary is not None else None,
-            "max_salary": job.max_salary if job.max_salary is not None else None
+        insert_response = await runQuery(supabase.table("jobs").insert(jobs_data))
+        await syncSkillIndex(insert_response.data)
+        return{
+            "Status": "Sucessfull",
+            "Message": "Job has been created",
+            "Details": f"{insert_response}",
+            "Suspected Duplicate": duplicate
         }
-        try:
-            insert_response = supabase.table("jobs").insert(jobs_data).execute()
-            return{
-                "Status": "Sucessfull",
-                "Message": "Job has been created",
-                "Details": f"{insert_response}"
-            }
-        except Exception as e:
-            return {
-                "Status": "Error",
-                "Message": "Job Creation Failed. Please try again.",
-                "Details": str(e)
-            }
-    else:
+    except Exception as e:
         return {
             "Status": "Error",
-            "Message": "Maybe the employer dosen't exist"
+            "Message": "Job Creation Failed. Please try again.",
+            "Details": str(e)
         }
 
 @app.get("/jobs/view-all-jobs")
@@ -1184,7 +1238,7 @@ async def viewAllJobs(request: Request):
             "Message": "Internal Server Error"
         }
     try: 
-        all_jobs = supabase.table("jobs").select("*").eq("user_id", auth_userID).execute()
+        all_jobs = await runQuery(supabase.table("jobs").select(getColumns("job_card")).eq("user_id", auth_userID))
         
         if all_jobs:
             return {"jobs": all_jobs.data}
@@ -1206,7 +1260,7 @@ async def viewSpecificJob(id: str):
         
         supabase = getSupabaseClient()
         
-        job = supabase.table("jobs").select("*").eq("id", id).execute()
+        job = await runQuery(supabase.table("jobs").select("*").eq("id", id))
         
         if job:
             return {
@@ -1225,23 +1279,60 @@ async def viewSpecificJob(id: str):
             "Details": f"{e}"
         }
 
-@app.post("/jobs/delete-job/{id}")
-async def deleteJob(request: Request, id: str):
+# "more like this" rail: pwd-friendly jobs whose skills and description overlap with the job's
+@app.get("/jobs/{id}/similar")
+async def viewSimilarJobs(id: str, limit: int = 10, cursor: str = None):
     try:
-        auth_userID = await getAuthUserIdFromRequest(request)
-        supabase = getSupabaseServiceClient()
+        limit = clampPageSize(limit)
+        if cursor:
+            try:
+                decodeCursor(cursor)
+            except ValueError:
+                return {
+                    "Status": "Error",
+                    "Message": "Invalid cursor"
+                }
 
-        # First check if the user is an employer and authorized to delete this job
-        search_id = supabase.table("employers").select("user_id").eq("user_id", auth_userID).single().execute()
-        
-        if not search_id.data or search_id.data["user_id"] != auth_userID:
+        supabase = getSupabaseClient()
+        job = await runQuery(supabase.table("jobs").select(SIGNATURE_COLUMNS).eq("id", id))
+        if not job.data:
             return {
                 "Status": "Error",
-                "Message": "Employer not found or not authorized."
+                "Message": "Job Not Found"
             }
 
+        # candidates come from the LSH buckets the job falls in, never from a scan of the jobs table
+        similar = await findSimilarJobs(supabase, job.data[0], SIMILAR_JOBS_MIN_SCORE, accept=lambda entry: entry["pwd_friendly"])
+        page, next_cursor = selectPage(similar, limit, cursor)
+        jobs_by_id = await loadJobRows(supabase, [job_id for job_id, _ in page], getColumns("job_card"))
+
+        jobs = []
+        for job_id, score in page:
+            row = jobs_by_id.get(job_id)
+            if row is not None:
+                row["similarity"] = round(score, 4)
+                jobs.append(row)
+
+        return {
+            "Status": "Successfull",
+            "Jobs": jobs,
+            "next_cursor": next_cursor
+        }
+    except Exception as e:
+        return {
+            "Status": "Error",
+            "Message": "Internal Server Error",
+            "Details": f"{e}"
+        }
+
+@app.post("/jobs/delete-job/{id}")
+async def deleteJob(request: Request, id: str, session: dict = Depends(requireRole("employer"))):
+    try:
+        auth_userID = session["auth_userID"]
+        supabase = getSupabaseServiceClient()
+
         # Check if the job exists before deletion
-        job_check = supabase.table("jobs").select("id").eq("id", id).single().execute()
+        job_check = await runQuery(supabase.table("jobs").select("id").eq("id", id).single())
         if not job_check.data:
             return {
                 "Status": "Error",
@@ -1250,7 +1341,7 @@ async def deleteJob(request: Request, id: str):
 
         # Delete employee history related to the job
         try:
-            deleting_employee_history = supabase.table("employee_history").delete().eq("job_id", id).execute()
+            deleting_employee_history = await runQuery(supabase.table("employee_history").delete().eq("job_id", id))
         except Exception as e:
             return {
                 "Status": "Error",
@@ -1260,7 +1351,8 @@ async def deleteJob(request: Request, id: str):
 
         # Delete job applications related to the job
         try:
-            deleting_job_applications = supabase.table("job_applications").delete().eq("job_id", id).execute()
+            deleting_job_applications = await runQuery(supabase.table("job_applications").delete().eq("job_id", id))
+            await dropJobApplicants(id)
         except Exception as e:
             return {
                 "Status": "Error",
@@ -1270,7 +1362,7 @@ async def deleteJob(request: Request, id: str):
 
         # Delete messages related to the job
         try:
-            deleting_messages_between_employer_and_applicant = supabase.table("messages").delete().eq("job_id", id).execute()
+            deleting_messages_between_employer_and_applicant = await runQuery(supabase.table("messages").delete().eq("job_id", id))
         except Exception as e:
             return {
                 "Status": "Error",
@@ -1278,10 +1370,10 @@ async def deleteJob(request: Request, id: str):
                 "Details": f"{e}"
             }
         # Delete declined jobs if they exist
-        search_declined_jobs = supabase.table("declined_jobs").select("job_id").eq("job_id", id).execute()
+        search_declined_jobs = await runQuery(supabase.table("declined_jobs").select("job_id").eq("job_id", id))
         if search_declined_jobs.data:
             try:
-                delete_declined_job = supabase.table("declined_jobs").delete().eq("job_id", id).execute()
+                delete_declined_job = await runQuery(supabase.table("declined_jobs").delete().eq("job_id", id))
             except Exception as e:
                 return {
                     "Status": "Error",
@@ -1291,9 +1383,10 @@ async def deleteJob(request: Request, id: str):
 
         # Finally delete the job itself (regardless of declined jobs)
         try:
-            delete_job = supabase.table("jobs").delete().eq("id", id).execute()
+            delete_job = await runQuery(supabase.table("jobs").delete().eq("id", id))
             
             if delete_job.data:  # check if any row was actually deleted
+                await syncSkillIndex(delete_job.data, deleted=True)
                 return {
                     "Status": "Success",
                     "Message": f"Job {id} and all related data deleted successfully"
@@ -1319,54 +1412,45 @@ async def deleteJob(request: Request, id: str):
         }
         
 @app.post("/jobs/update-job/{id}")
-async def updateSpecificJob(request: Request, id: str, job: updateJob):
+async def updateSpecificJob(request: Request, id: str, job: updateJob, session: dict = Depends(requireRole("employer"))):
     try:
-        auth_userID = await getAuthUserIdFromRequest(request)
+        auth_userID = session["auth_userID"]
         supabase = getSupabaseServiceClient()
 
-        # Check if the user is an employer
-        search_id = supabase.table("employers").select("user_id").eq("user_id", auth_userID).single().execute()
-
-        if search_id.data and search_id.data["user_id"] == auth_userID:
-             #build the structure of the update json 
-             new_data = {
-                "user_id": auth_userID,
-                "title": job.title,
-                "job_description": job.description,
-                "skill_1": job.skill_1,
-                "skill_2": job.skill_2,
-                "skill_3": job.skill_3,
-                "skill_4": job.skill_4,
-                "skill_5": job.skill_5,
-                "allowed_disabilities": job.allowed_disabilities,
-                "pwd_friendly": job.pwd_friendly,
-                "company_name": job.company_name,
-                "location": job.location,
-                "job_type": job.job_type,
-                "industry": job.industry,
-                "experience": job.experience,
-                "fixed_salary": job.fixed_salary if job.fixed_salary is not None else None,
-                "min_salary": job.min_salary if job.min_salary is not None else None,
-                "max_salary": job.max_salary if job.max_salary is not None else None
-             }
-             update_response = supabase.table("jobs").update(new_data).eq("id", id).execute()
+        #build the structure of the update json 
+        new_data = {
+            "user_id": auth_userID,
+            "title": job.title,
+            "job_description": job.description,
+            "skill_1": job.skill_1,
+            "skill_2": job.skill_2,
+            "skill_3": job.skill_3,
+            "skill_4": job.skill_4,
+            "skill_5": job.skill_5,
+            "allowed_disabilities": job.allowed_disabilities,
+            "pwd_friendly": job.pwd_friendly,
+            "company_name": job.company_name,
+            "location": job.location,
+            "job_type": job.job_type,
+            "industry": job.industry,
+            "experience": job.experience,
+            "fixed_salary": job.fixed_salary if job.fixed_salary is not None else None,
+            "min_salary": job.min_salary if job.min_salary is not None else None,
+            "max_salary": job.max_salary if job.max_salary is not None else None
+        }
+        update_response = await runQuery(supabase.table("jobs").update(new_data).eq("id", id))
             
-             if update_response.data:
-                 return{
-                     "Status": "Successfull",
-                     "Message": "Update successfull"
-                 }
-             else:
-                 return {
-                     "Status": "Error",
-                     "Message": "Updating not Succesfull",
-                     "Details": f"{update_response}" 
-                 }
-        else:
+        if update_response.data:
+            await syncSkillIndex(update_response.data)
             return{
+                "Status": "Successfull",
+                "Message": "Update successfull"
+            }
+        else:
+            return {
                 "Status": "Error",
-                "Message": "Cant find user",
-                "Details": f"{search_id}" 
+                "Message": "Updating not Succesfull",
+                "Details": f"{update_response}" 
             }
     except Exception as e:
         return {
@@ -1375,17 +1459,138 @@ async def updateSpecificJob(request: Request, id: str, job: updateJob):
             "Details":f"{e}"
         }
           
+# keep the /reco-jobs skill index, per-user caches and the similar-jobs index in step with job writes; a failure only marks them for rebuild
+async def syncSkillIndex(jobs, deleted: bool = False):
+    changes = []
+    for job in jobs or []:
+        previous_skills = set()
+        try:
+            previous_skills = await getIndexedSkills(str(job["id"]))
+            if deleted:
+                await removeJobFromIndex(job["id"])
+            else:
+                await indexJob(job)
+        except Exception as e:
+            print(f"⚠️ Skill index update failed, scheduling rebuild: {e}")
+            try:
+                await markSkillIndexStale()
+            except Exception:
+                pass
+        try:
+            await recordDescriptionChange([job["id"]])
+        except Exception as e:
+            print(f"⚠️ Description index change log failed: {e}")
+        try:
+            if deleted:
+                await removeJobSignature(job["id"])
+            else:
+                await indexJobSignature(job)
+        except Exception as e:
+            print(f"⚠️ Similar jobs index update failed, scheduling rebuild: {e}")
+            try:
+                await markMinHashIndexStale()
+            except Exception:
+                pass
+        changes.append((job, previous_skills, deleted))
+    # the cached users of the written jobs are rescored after the response has gone out
+    if changes:
+        runInBackground(patchRecommendations(changes))
+
+async def patchRecommendations(changes):
+    try:
+        await patchManyJobRecommendations(changes)
+    except Exception as e:
+        print(f"⚠️ Recommendation cache update failed, invalidating: {e}")
+        try:
+            await markRecoCacheStale()
+        except Exception:
+            pass
+
+# fire-and-forget work started by a request; references are held until it finishes, and shutdown waits for it
+_background_tasks = set()
+
+def runInBackground(coroutine):
+    task = asyncio.create_task(coroutine)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+# the employer's existing job a new post nearly repeats, as {"job_id", "similarity"}; the check never blocks a post on failure
+# and never waits on a MinHash index rebuild
+async def checkDuplicateJob(supabase, job: dict):
+    try:
+        match = await findDuplicateJob(supabase, job)
+    except Exception as e:
+        print(f"⚠️ Duplicate job check failed, skipping it: {e}")
+        return None
+    if match is None:
+        return None
+    job_id, similarity = match
+    return {"job_id": int(job_id) if job_id.isdigit() else job_id, "similarity": round(similarity, 4)}
+
+# canonical skill_names / skill_ids for the employee row being written, so readers never parse the raw skills
+async def normalizeEmployeeSkills(supabase, skills_raw) -> dict:
+    try:
+        return await normalizedSkillColumns(supabase, skills_raw)
+    except Exception as e:
+        print(f"⚠️ Skill normalization failed, readers fall back to the raw skills: {e}")
+        return {}
+
+# keeps /talent/search current for one employee; a failed update schedules a rebuild
+async def syncTalentIndex(supabase, user_id: str):
+    try:
+        await indexEmployee(supabase, user_id)
+    except Exception as e:
+        print(f"⚠️ Talent index update failed, scheduling rebuild: {e}")
+        try:
+            await markTalentIndexStale()
+        except Exception:
+            pass
+
+# applied / skipped jobs stay out of /reco-jobs; a reverted skip also drops the cached ranking it was left out of
+async def syncExcludedJob(user_id: str, job_id, excluded: bool = True):
+    try:
+        if excluded:
+            await excludeJob(user_id, job_id)
+        else:
+            await dropExcludedJobIds(user_id)
+            await invalidateUserRecommendations(user_id)
+    except Exception as e:
+        print(f"⚠️ Recommendation exclusion update failed: {e}")
+
+# a new application joins its job's ranked applicants set
+async def syncRankedApplicant(job_id, inserted_rows, score: float):
+    try:
+        for row in inserted_rows or []:
+            await addApplicant(job_id, row["id"], score)
+    except Exception as e:
+        print(f"⚠️ Ranked applicants update failed, dropping the job's set: {e}")
+        try:
+            await dropJobApplicants(job_id)
+        except Exception:
+            pass
+
 #MAIN ALGO WORKS (Content absed filtering + collaborative filtering)
 
 @app.get("/reco-jobs")
-async def reccomendJobs(request: Request):
+async def reccomendJobs(request: Request, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None):
     try:
+        limit = clampPageSize(limit)
+        if cursor:
+            try:
+                decodeCursor(cursor)
+            except ValueError:
+                return {
+                    "Status": "Error",
+                    "Message": "Invalid cursor"
+                }
+
         # Get the user details
         auth_userID = await getAuthUserIdFromRequest(request)
         supabase = getSupabaseClient()
 
         # Fetch the user details
-        search_user = supabase.table("employee").select("*").eq("user_id", auth_userID).single().execute()
+        search_user = await runQuery(supabase.table("employee").select(await employeeColumns(supabase, "reco_user")).eq("user_id", auth_userID).single())
 
         if not search_user or not search_user.data:
             return {
@@ -1396,45 +1601,49 @@ async def reccomendJobs(request: Request):
         # user_id = search_user.data.get("user_id")
         disability = search_user.data.get("disability")
 
-        # Parse the skills
-        skills_raw = search_user.data.get("skills", "[]")
-        user_skills_set = await parseSkills(skills_raw)
+        # skills normalized at write time (skill_names), legacy rows are parsed from the raw text
+        user_skills_set = await readEmployeeSkills(search_user.data)
         
         # Convert set to list for indexing
         user_skills_list = list(user_skills_set)
+        user_bio = search_user.data.get("short_bio") or ""
+        user_disabilities = parseDisabilities(disability)
 
-        # Fetch jobs
-        # First, get all PWD-friendly jobs
-        jobs_response = supabase.table("jobs").select("*").eq("pwd_friendly", True).execute()
-        jobs_data = jobs_response.data or []
+        # jobs the user already applied to or skipped never reach scoring
+        excluded = await getExcludedJobIds(supabase, auth_userID)
 
-        # Recommendations
+        # served from the per-user cache, recomputed only on a miss
+        ranked = await getCachedScores(auth_userID, user_skills_set, user_bio, user_disabilities)
+        jobs_by_id = None
 
-        recommendations = await calculateJobMatchScore(user_skills_set, jobs_data)
+        if ranked is not None:
+            ranked = [(job_id, score) for job_id, score in ranked if str(job_id) not in excluded]
+        else:
+            # Fetch jobs
+            # Only PWD-friendly jobs sharing at least one skill with the user and allowing their disability (skill index lookup)
+            jobs_data = await loadCandidateJobs(supabase, user_skills_set, getColumns("job_card"), exclude=excluded, disabilities=user_disabilities)
 
-        #remove jobs that are lower than 0.4 
-        recommendations = [job for job in recommendations if job["skill_match_score"] >= 0.4]
-                
-        # Sort and return top 5 recommendations
-        recommendations.sort(key=lambda x: x["skill_match_score"], reverse=True)
-        
-        for job in recommendations:
-            job_id = job["id"]
+            # Recommendations
 
-            # Check if this record already exists
-            existing_record = supabase.table("employee_history").select("id").eq("user_id", auth_userID).eq("job_id", job_id).execute()
+            # sparse matrix scoring, jobs that are lower than 0.4 are dropped
+            ranked = await rankJobMatches(user_skills_set, jobs_data, min_score=RECO_MIN_SCORE)
+            # collaborative filtering (offline factor model) and short_bio / job description similarity boosts
+            ranked = await rankScores(supabase, auth_userID, user_bio, ranked)
+            await storeRecommendations(auth_userID, user_skills_set, ranked, user_bio, user_disabilities)
+            jobs_by_id = {str(job["id"]): job for job in jobs_data}
 
-            if not existing_record.data:
-                # Insert the new history record
-                supabase.table("employee_history").insert({
-                    "user_id": auth_userID,
-                    "job_id": job_id
-                }).execute()
+        # top `limit` jobs after the cursor (score desc, then job id), only those rows are built
+        page, next_cursor = selectPage(ranked, limit, cursor)
+        if jobs_by_id is None:
+            jobs_by_id = await loadJobRows(supabase, [job_id for job_id, _ in page], getColumns("job_card"))
+        recommendations = buildRecommendations(page, jobs_by_id, user_skills_set)
 
-                #recursive optimization: 
+        # one bulk upsert for the history rows instead of a select (+ insert) per job
+        await recordRecommendedJobs(supabase, auth_userID, [job["id"] for job in recommendations])
 
         return {
-            "recommendations": recommendations
+            "recommendations": recommendations,
+            "next_cursor": next_cursor
         }
 
     except Exception as e:
@@ -1449,33 +1658,41 @@ async def applyingForJob(job_id: str, request: Request):
         auth_userID = await getAuthUserIdFromRequest(request)
         
         supabase = getSupabaseServiceClient()
+        loader = getRowLoader(request)
         
-        # check the user id in auth)userID is an employer
+        # check the user id in auth)userID is an employee (the job row is fetched in the same batch)
         
-        check_user = supabase.table("employee").select("user_id").eq("user_id", auth_userID).single().execute()
+        employee, job = await asyncio.gather(
+            loader.load("employee", "user_id", auth_userID, getColumns("applicant_snapshot")),
+            loader.load("jobs", "id", job_id, getColumns("job_card"))
+        )
         
-        if check_user.data and check_user.data["user_id"] == auth_userID:
-            apply_job = supabase.table("employee_history").update({"applied": True}).eq("job_id", job_id).eq("user_id", auth_userID).execute()
+        if employee and employee["user_id"] == auth_userID:
+            apply_job = await runQuery(supabase.table("employee_history").update({"applied": True}).eq("job_id", job_id).eq("user_id", auth_userID))
             
             if apply_job.data:
-                supabase_job_data_insertion = getSupabaseServiceClient()
                 #get the user details
-                user_details = supabase.table("employee").select("*").eq("user_id", auth_userID).single().execute()
                 job_data = {
                     "user_id": auth_userID,
                     "job_id": job_id,
                     "status": "under_review",
-                    "applicant_details": user_details.data
+                    "applicant_details": employee
                 }
 
-                # add arkha matching scoring here soon POGGGGGGGGG
-                
-                insert_job_appliead = supabase_job_data_insertion.table("job_applications").insert(job_data).execute()                #send notification to the employer
+                # skill match against the job, computed once here and used to rank applicants;
+                # only stored once the match_score migration has run
+                match_score = await scoreApplicant(employee, job)
+                if await hasMatchScoreColumn(supabase):
+                    job_data["match_score"] = match_score
+
+                insert_job_appliead = await runQuery(supabase.table("job_applications").insert(job_data))
+                await syncExcludedJob(auth_userID, job_id)
+                await syncRankedApplicant(job_id, insert_job_appliead.data, match_score)
+                #send notification to the employer
                 user_id = auth_userID
                 category = "new_applicant"
                 try:
-                    job_title = supabase.table("jobs").select("title").eq("id", job_id).single().execute()
-                    content = f"You have a new applicant for your job {job_title.data['title']}"
+                    content = f"You have a new applicant for your job {job['title']}"
                 except Exception as e:
                     return {
                         "Status": "Error",
@@ -1483,8 +1700,7 @@ async def applyingForJob(job_id: str, request: Request):
                         "Details": f"{e}"
                     }
                 try:
-                    receiver_id = supabase.table("jobs").select("user_id").eq("id", job_id).single().execute()
-                    await sendNotification(user_id, receiver_id.data["user_id"], content, category)
+                    await sendNotification(user_id, job["user_id"], content, category)
                 except Exception as e:
                     return {
                         "Status": "Error",
@@ -1493,23 +1709,22 @@ async def applyingForJob(job_id: str, request: Request):
                     }
 
                 try:
-                    #get the job data for insert in "job application analysis data"
-                    get_job_data = supabase.table("jobs").select("*").eq("id", job_id).single().execute()
+                    #the job row loaded above carries the data for "job application analysis data"
 
                     #get all job appliead skills
-                    skill_1 = get_job_data.data["skill_1"]
-                    skill_2 = get_job_data.data["skill_2"]
-                    skill_3 = get_job_data.data["skill_3"]
-                    skill_4 = get_job_data.data["skill_4"]
-                    skill_5 = get_job_data.data["skill_5"]
+                    skill_1 = job["skill_1"]
+                    skill_2 = job["skill_2"]
+                    skill_3 = job["skill_3"]
+                    skill_4 = job["skill_4"]
+                    skill_5 = job["skill_5"]
 
                     #get salary 
-                    min_salary = get_job_data.data["min_salary"]
-                    max_salary = get_job_data.data["max_salary"]
+                    min_salary = job["min_salary"]
+                    max_salary = job["max_salary"]
 
                     #get the job type
-                    job_type = get_job_data.data["job_type"]
-                    userid_of_employer = get_job_data.data["user_id"]
+                    job_type = job["job_type"]
+                    userid_of_employer = job["user_id"]
 
                     # months = ['January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October', 'November', 'December']
 
@@ -1553,7 +1768,7 @@ async def applyingForJob(job_id: str, request: Request):
                     # print("=== END DEBUG ===")
 
                     #insert the data in "job application analysis data"
-                    insert_job_application_analysis_data = supabase.table("job_application_analysis_data").insert(job_application_analysis_data).execute()
+                    insert_job_application_analysis_data = await runQuery(supabase.table("job_application_analysis_data").insert(job_application_analysis_data))
 
                     if insert_job_application_analysis_data.data:
                         return {
@@ -1593,14 +1808,13 @@ async def applyingForJob(job_id: str, request: Request):
 @app.get("/view-applicants/{job_id}")
 async def viewAllApplicantsInJobListing(request: Request, job_id: str):
     try:
-        auth_userID = await getAuthUserIdFromRequest(request)
+        auth_userID, role = await getAuthUserRoleFromRequest(request)
         
         supabase = getSupabaseClient()
         
-        check_user = supabase.table("employers").select("user_id").eq("user_id", auth_userID).single().execute()
         
-        if check_user.data and check_user.data["user_id"] == auth_userID:
-            get_all_applicants = supabase.table("job_applications").select("*").eq("job_id", job_id).execute()
+        if role == "employer":
+            get_all_applicants = await runQuery(supabase.table("job_applications").select("*").eq("job_id", job_id))
             
             if get_all_applicants.data:
                 return {
@@ -1635,7 +1849,7 @@ async def viewAllEmployerApplicants(user_id: str):
         
         # if check_user.data and check_user.data["user_id"] == auth_userID:
             # Join job_applications with jobs table to get applicants for this employer's jobs
-        get_all_applicants = supabase.table("job_applications").select("""
+        get_all_applicants = await runQuery(supabase.table("job_applications").select("""
             *,
             jobs!inner(
                 id,
@@ -1646,7 +1860,7 @@ async def viewAllEmployerApplicants(user_id: str):
                 skill_3,
                 user_id
             )
-        """).eq("jobs.user_id", user_id).execute()
+        """).eq("jobs.user_id", user_id))
             
         if get_all_applicants.data:
             return {
@@ -1665,6 +1879,123 @@ async def viewAllEmployerApplicants(user_id: str):
             "Details": f"{e}"
         }
 
+# applicants of one of the employer's jobs, best skill match first, paged like /reco-jobs
+@app.get("/ranked-applicants/{job_id}")
+async def viewRankedApplicants(request: Request, job_id: str, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None, session: dict = Depends(requireRole("employer"))):
+    try:
+        limit = clampPageSize(limit)
+        if cursor:
+            try:
+                decodeCursor(cursor)
+            except ValueError:
+                return {
+                    "Status": "Error",
+                    "Message": "Invalid cursor"
+                }
+
+        auth_userID = session["auth_userID"]
+
+        supabase = getSupabaseServiceClient()
+        job = await getRowLoader(request).load("jobs", "id", job_id, getColumns("job_card"))
+        if not job or job["user_id"] != auth_userID:
+            return {
+                "Status": "Error",
+                "Message": "Job not found"
+            }
+
+        # top `limit` application ids after the cursor (match_score desc, then id), only those rows are fetched
+        page, next_cursor = selectPage(await getApplicantScores(supabase, job), limit, cursor)
+        applications = {}
+        if page:
+            get_applicants = await runQuery(supabase.table("job_applications").select("*").in_("id", [application_id for application_id, _ in page]))
+            applications = {str(row["id"]): row for row in get_applicants.data or []}
+
+        applicants = []
+        for application_id, score in page:
+            application = applications.get(str(application_id))
+            if application is not None:
+                application["match_score"] = score
+                applicants.append(application)
+
+        return {
+            "Status": "Successfull",
+            "Applicants": applicants,
+            "next_cursor": next_cursor
+        }
+    except Exception as e:
+        return {
+            "Status": "Error",
+            "Message": "Internal Server Error",
+            "Details": f"{e}"
+        }
+
+# employers searching employees by skill, disability and verification, best skill match first
+@app.get("/talent/search")
+async def talentSearch(
+    request: Request,
+    skills: str = None,
+    disability: str = None,
+    verified: bool = False,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str = None,
+    session: dict = Depends(requireRole("employer"))
+):
+    try:
+        limit = clampPageSize(limit)
+        if cursor:
+            try:
+                decodeCursor(cursor)
+            except ValueError:
+                return {
+                    "Status": "Error",
+                    "Message": "Invalid cursor"
+                }
+
+        skill_names = await canonicalSkills(skills or "")
+        disabilities = parseDisabilities(disability)
+        if not skill_names and not disabilities:
+            return {
+                "Status": "Error",
+                "Message": "Provide skills or a disability to search for"
+            }
+
+        supabase = getSupabaseServiceClient()
+        if not await hasNormalizedSkills(supabase):
+            return {
+                "Status": "Error",
+                "Message": "Talent search is not available until the skill_vocabulary migration has run"
+            }
+        # skills nobody has yet are not in the vocabulary, they still count towards the score's denominator
+        skill_ids = list((await lookupSkillIds(supabase, skill_names)).values())
+        results = await searchTalent(supabase, skill_ids, len(skill_names), disabilities, verified)
+
+        # top `limit` employees after the cursor (score desc, then user id), only those rows are fetched
+        page, next_cursor = selectPage(results, limit, cursor)
+        employees = {}
+        if page:
+            get_employees = await runQuery(supabase.table("employee").select(getColumns("talent_card")).in_("user_id", [user_id for user_id, _ in page]))
+            employees = {row["user_id"]: row for row in get_employees.data or []}
+
+        talent = []
+        for user_id, score in page:
+            employee = employees.get(user_id)
+            if employee is not None:
+                employee["match_score"] = score
+                employee["matched_skills"] = sorted(await readEmployeeSkills(employee) & set(skill_names))
+                talent.append(employee)
+
+        return {
+            "Status": "Successfull",
+            "Talent": talent,
+            "next_cursor": next_cursor
+        }
+    except Exception as e:
+        return {
+            "Status": "Error",
+            "Message": "Internal Server Error",
+            "Details": f"{e}"
+        }
+
 
 #get updated employee info
 @app.get("/get-employee-info/{user_id}")
@@ -1672,7 +2003,7 @@ async def getEmployeeInfo(user_id: str):
     try:
         supabase = getSupabaseClient()
         
-        get_employee_info = supabase.table("employee").select("full_name, disability, skills, address, phone_number, short_bio, resume_url, profile_pic_url, pwd_id_front_url, pwd_id_back_url, is_verified").eq("user_id", user_id).single().execute()
+        get_employee_info = await runQuery(supabase.table("employee").select("full_name, disability, skills, address, phone_number, short_bio, resume_url, profile_pic_url, pwd_id_front_url, pwd_id_back_url, is_verified").eq("user_id", user_id).single())
             
         if get_employee_info.data:
                 return {
@@ -1764,7 +2095,7 @@ async def request_password_reset(reset_request: PasswordReset):
         
         # Initialize Supabase client with error handling
         try:
-            supabase = getSupabaseServiceClient()
+            supabase = getSupabaseAuthClient(service=True)
         except Exception as client_error:
             print(f"❌ Failed to initialize Supabase client: {str(client_error)}")
             return {
@@ -1877,7 +2208,7 @@ async def confirm_password_reset(reset_confirm: PasswordResetConfirm):
         
         # Initialize Supabase client with error handling
         try:
-            supabase = getSupabaseServiceClient()
+            supabase = getSupabaseAuthClient(service=True)
         except Exception as client_error:
             print(f"❌ Failed to initialize Supabase client: {str(client_error)}")
             return {
@@ -2004,13 +2335,12 @@ async def uploadResume(request: Request, file: UploadFile = File(...)):
                 "Message": "File size exceeds 5MB limit"
             }
 
-        auth_userID = await getAuthUserIdFromRequest(request)
+        auth_userID, role = await getAuthUserRoleFromRequest(request)
         supabase = getSupabaseClient()
 
         # Check if the user is an employee
-        check_user = supabase.table("employee").select("user_id").eq("user_id", auth_userID).single().execute()
 
-        if check_user.data and check_user.data["user_id"] == auth_userID:
+        if role == "employee":
             try:
                 # Upload the resume to the supabase storage with proper metadata
                 resume_path = f"resumes/{auth_userID}/{file.filename}"
@@ -2025,7 +2355,7 @@ async def uploadResume(request: Request, file: UploadFile = File(...)):
 
                 # Update the employee's profile with the resume URL
                 resume_url = supabase.storage.from_("resumes").get_public_url(resume_path)
-                supabase.table("employee").update({"resume_url": resume_url}).eq("user_id", auth_userID).execute()
+                await runQuery(supabase.table("employee").update({"resume_url": resume_url}).eq("user_id", auth_userID))
 
                 return {
                     "Status": "Success",
@@ -2083,7 +2413,7 @@ async def uploadSSS(request: Request, file: UploadFile = File(...)):
         else:
             content_type = "image/jpeg"  # default fallback
         
-        auth_userID = await getAuthUserIdFromRequest(request)
+        auth_userID, role = await getAuthUserRoleFromRequest(request)
         # print(f"🔍 Auth User ID: {auth_userID}")
         
         supabase = getSupabaseServiceClient()
@@ -2098,10 +2428,8 @@ async def uploadSSS(request: Request, file: UploadFile = File(...)):
         #     print(f"⚠️ Error checking buckets: {str(bucket_error)}")
         
         # Check if the user is an employee
-        check_user = supabase.table("employee").select("user_id").eq("user_id", auth_userID).single().execute()
-        # print(f"🔍 User check result: {check_user.data}")
         
-        if check_user.data and check_user.data["user_id"] == auth_userID:
+        if role == "employee":
             try:
                 # Upload the document to the supabase storage with proper metadata
                 document_path = f"documents/sss/{auth_userID}/{file.filename}"
@@ -2140,7 +2468,7 @@ async def uploadSSS(request: Request, file: UploadFile = File(...)):
                 document_url = supabase.storage.from_("documents").get_public_url(document_path)
                 # print(f"🔍 Generated URL: {document_url}")
                 
-                update_result = supabase.table("employee").update({"sss_url": document_url}).eq("user_id", auth_userID).execute()
+                update_result = await runQuery(supabase.table("employee").update({"sss_url": document_url}).eq("user_id", auth_userID))
                 # print(f"🔍 Database update result: {update_result}")
 
                 return {
@@ -2239,7 +2567,7 @@ async def uploadPhilhealth(request: Request, file: UploadFile = File(...)):
         else:
             content_type = "image/jpeg"  # default fallback
         
-        auth_userID = await getAuthUserIdFromRequest(request)
+        auth_userID, role = await getAuthUserRoleFromRequest(request)
         # print(f"🔍 Auth User ID: {auth_userID}")
         
         supabase = getSupabaseServiceClient()
@@ -2254,10 +2582,8 @@ async def uploadPhilhealth(request: Request, file: UploadFile = File(...)):
         #     print(f"⚠️ Error checking buckets: {str(bucket_error)}")
         
         # Check if the user is an employee
-        check_user = supabase.table("employee").select("user_id").eq("user_id", auth_userID).single().execute()
-        # print(f"🔍 User check result: {check_user.data}")
         
-        if check_user.data and check_user.data["user_id"] == auth_userID:
+        if role == "employee":
             try:
                 # Upload the document to the supabase storage with proper metadata
                 document_path = f"documents/philhealth/{auth_userID}/{file.filename}"
@@ -2296,7 +2622,7 @@ async def uploadPhilhealth(request: Request, file: UploadFile = File(...)):
                 document_url = supabase.storage.from_("documents").get_public_url(document_path)
                 # print(f"🔍 Generated URL: {document_url}")
                 
-                update_result = supabase.table("employee").update({"philhealth_url": document_url}).eq("user_id", auth_userID).execute()
+                update_result = await runQuery(supabase.table("employee").update({"philhealth_url": document_url}).eq("user_id", auth_userID))
                 # print(f"🔍 Database update result: {update_result}")
 
                 return {
@@ -2356,7 +2682,7 @@ async def uploadPagibig(request: Request, file: UploadFile = File(...)):
         else:
             content_type = "image/jpeg"  # default fallback
         
-        auth_userID = await getAuthUserIdFromRequest(request)
+        auth_userID, role = await getAuthUserRoleFromRequest(request)
         # print(f"🔍 Auth User ID: {auth_userID}")
         
         supabase = getSupabaseServiceClient()
@@ -2371,10 +2697,8 @@ async def uploadPagibig(request: Request, file: UploadFile = File(...)):
         #     print(f"⚠️ Error checking buckets: {str(bucket_error)}")
         
         # Check if the user is an employee
-        check_user = supabase.table("employee").select("user_id").eq("user_id", auth_userID).single().execute()
-        # print(f"🔍 User check result: {check_user.data}")
         
-        if check_user.data and check_user.data["user_id"] == auth_userID:
+        if role == "employee":
             try:
                 # Upload the document to the supabase storage with proper metadata
                 document_path = f"documents/pagibig/{auth_userID}/{file.filename}"
@@ -2413,7 +2737,7 @@ async def uploadPagibig(request: Request, file: UploadFile = File(...)):
                 document_url = supabase.storage.from_("documents").get_public_url(document_path)
                 # print(f"🔍 Generated URL: {document_url}")
                 
-                update_result = supabase.table("employee").update({"pagibig_url": document_url}).eq("user_id", auth_userID).execute()
+                update_result = await runQuery(supabase.table("employee").update({"pagibig_url": document_url}).eq("user_id", auth_userID))
                 # print(f"🔍 Database update result: {update_result}")
 
                 return {
@@ -2444,13 +2768,12 @@ async def uploadPagibig(request: Request, file: UploadFile = File(...)):
 @app.get("/get-documents")
 async def getDocuments(request: Request, user_id: str = None):
     try:
-        auth_userID = await getAuthUserIdFromRequest(request)
+        auth_userID, role = await getAuthUserRoleFromRequest(request)
         supabase = getSupabaseServiceClient()
         
         # If user_id is provided, check if requester is an employer
         if user_id:
-            check_employer = supabase.table("employers").select("user_id").eq("user_id", auth_userID).single().execute()
-            if check_employer.data and check_employer.data["user_id"] == auth_userID:
+            if role == "employer":
                 # Employer can view documents for specified user
                 target_user_id = user_id
             else:
@@ -2460,8 +2783,7 @@ async def getDocuments(request: Request, user_id: str = None):
                 }
         else:
             # No user_id provided, check if requester is an employee viewing their own documents
-            check_user = supabase.table("employee").select("user_id").eq("user_id", auth_userID).single().execute()
-            if check_user.data and check_user.data["user_id"] == auth_userID:
+            if role == "employee":
                 target_user_id = auth_userID
             else:
                 return {
@@ -2470,7 +2792,7 @@ async def getDocuments(request: Request, user_id: str = None):
                 }
         
         # Fetch documents for the target user
-        documents = supabase.table("employee").select("sss_url, philhealth_url, pagibig_url").eq("user_id", target_user_id).single().execute()
+        documents = await runQuery(supabase.table("employee").select("sss_url, philhealth_url, pagibig_url").eq("user_id", target_user_id).single())
         
         if documents.data:
             return {
@@ -2557,7 +2879,7 @@ async def updatePwdIdFront(request: Request, file: UploadFile = File(...)):
         file_url = supabase.storage.from_("pwdidfront").get_public_url(file_path)
         
         # Update the employee's profile with the document URL
-        update_pwd_id_front = supabase.table("employee").update({"pwd_id_front_url": file_url}).eq("user_id", auth_userID).execute()
+        update_pwd_id_front = await runQuery(supabase.table("employee").update({"pwd_id_front_url": file_url}).eq("user_id", auth_userID))
         
         if update_pwd_id_front.data:
             return {
@@ -2639,7 +2961,7 @@ async def updatePwdIdBack(request: Request, file: UploadFile = File(...)):
         file_url = supabase.storage.from_("pwdidback").get_public_url(file_path)
         
         # Update the employee's profile with the document URL
-        update_pwd_id_back = supabase.table("employee").update({"pwd_id_back_url": file_url}).eq("user_id", auth_userID).execute()
+        update_pwd_id_back = await runQuery(supabase.table("employee").update({"pwd_id_back_url": file_url}).eq("user_id", auth_userID))
         
         if update_pwd_id_back.data:
             return {
@@ -2674,19 +2996,19 @@ async def updatePwdIdBack(request: Request, file: UploadFile = File(...)):
 async def updateApplicationStatus(request : Request, application_id: str, new_status: str):
     # check first if the user authticated is an employer or not
     try:
-        auth_userID = await getAuthUserIdFromRequest(request)
+        auth_userID, role = await getAuthUserRoleFromRequest(request)
         
         supabase = getSupabaseServiceClient()
         
-        check_user = supabase.table("employers").select("user_id").eq("user_id", auth_userID).single().execute()
         
-        if check_user.data and check_user.data["user_id"] == auth_userID:
+        if role == "employer":
             # Get application details first to get user_id
             try:
-                receiver_id = supabase.table("job_applications").select("user_id").eq("id", application_id).single().execute()
-                job_id = supabase.table("job_applications").select("job_id").eq("id", application_id).single().execute()
-                job_title = supabase.table("jobs").select("title").eq("id", job_id.data["job_id"]).single().execute()
-                applicant_user_id = receiver_id.data["user_id"]
+                loader = getRowLoader(request)
+                application = await loader.load("job_applications", "id", application_id, getColumns("application_ref"))
+                job = await loader.load("jobs", "id", application["job_id"], getColumns("job_ref"))
+                applicant_user_id = application["user_id"]
+                job_title = job["title"]
             except Exception as e:
                 return {
                     "Status": "Error",
@@ -2695,14 +3017,15 @@ async def updateApplicationStatus(request : Request, application_id: str, new_st
                 }
             
             # Update the current application status
-            status_to_be_changed = supabase.table("job_applications").update({
+            status_to_be_changed = await runQuery(supabase.table("job_applications").update({
                 "status": new_status
-            }).eq("id", application_id).execute()
+            }).eq("id", application_id))
+            loader.clear("job_applications")
             
             # If status is being set to "accepted" (hired), reject all other applications from this user
             if new_status == "accepted":
                 try:
-                    reject_others = supabase.table("job_applications").update({"status": "rejected"}).eq("user_id", applicant_user_id).neq("id", application_id).execute()
+                    reject_others = await runQuery(supabase.table("job_applications").update({"status": "rejected"}).eq("user_id", applicant_user_id).neq("id", application_id))
                     print(f"✅ Rejected {len(reject_others.data) if reject_others.data else 0} other applications for user {applicant_user_id}")
                 except Exception as e:
                     # Log error but don't fail the operation
@@ -2713,39 +3036,38 @@ async def updateApplicationStatus(request : Request, application_id: str, new_st
             
             if new_status == "accepted":
                 category = "job_application_accepted"
-                content = f"Your application at {job_title.data['title']} has been accepted"
+                content = f"Your application at {job_title} has been accepted"
             elif new_status == "rejected":
                 category = "job_application_rejected"
-                content = f"Your application at {job_title.data['title']} has been rejected"
+                content = f"Your application at {job_title} has been rejected"
             elif new_status == "under_review":
                 category = "job_application_sent"
-                content = f"Your application at {job_title.data['title']} is under review"
+                content = f"Your application at {job_title} is under review"
             elif new_status == "pending_requirements":
                 category = "job_application_pending_requirements"
-                content = f"Your application at {job_title.data['title']} is pending requirements"
+                content = f"Your application at {job_title} is pending requirements"
             else:
                 category = "job_application_sent"
-                content = f"Your application at {job_title.data['title']} is sent"
+                content = f"Your application at {job_title} is sent"
             try:
                 # #
                 # print(f"DEBUG - About to send notification:")
                 # print(f"  user_id: {user_id}")
-                # print(f"  receiver_id: {receiver_id.data['user_id'] if receiver_id.data else 'None'}")
+                # print(f"  receiver_id: {applicant_user_id}")
                 # print(f"  content: {content}")
                 # print(f"  category: {category}")
                 # #
-                await sendNotification(user_id, receiver_id.data["user_id"], content, category)
+                await sendNotification(user_id, applicant_user_id, content, category)
                 
                 # Send push notification to the applicant (async, don't wait for it)
                 async def send_status_push_notification():
                     try:
                         # Get applicant's push token
-                        applicant_user_id = receiver_id.data["user_id"]
                         push_token = await getUserPushToken(applicant_user_id)
                         
                         if push_token:
                             # Get appropriate notification content based on status
-                            notification_content = getJobStatusNotificationContent(new_status, job_title.data['title'])
+                            notification_content = getJobStatusNotificationContent(new_status, job_title)
                             
                             # Send push notification
                             await sendPushNotification(
@@ -2755,7 +3077,7 @@ async def updateApplicationStatus(request : Request, application_id: str, new_st
                                 data={
                                     "type": "job_application_status",
                                     "status": new_status,
-                                    "job_title": job_title.data['title'],
+                                    "job_title": job_title,
                                     "application_id": application_id,
                                     "timestamp": datetime.now().isoformat()
                                 }
@@ -2806,21 +3128,19 @@ async def updateApplicationStatus(request : Request, application_id: str, new_st
 async def viewApplicationHistory(request: Request):
     # check first if the user authticated is an employer or not
     try:
-        auth_userID = await getAuthUserIdFromRequest(request)
+        auth_userID, role = await getAuthUserRoleFromRequest(request)
         
         supabase = getSupabaseServiceClient()
         
-        check_user = supabase.table("employee").select("user_id").eq("user_id", auth_userID).single().execute()
         
-        if check_user.data and check_user.data["user_id"] == auth_userID:
+        if role == "employee":
             # Get all applications for this user (newest first)
-            view_all_applciations = (
+            view_all_applciations = await runQuery(
                 supabase
                 .table("job_applications")
                 .select("*")
                 .eq("user_id", auth_userID)
                 .order("created_at", desc=True)
-                .execute()
             )
 
             if view_all_applciations.data:
@@ -2845,11 +3165,11 @@ async def viewApplicationHistory(request: Request):
                 # Build jobs map by id (as string)
                 job_details_map: dict[str, dict] = {}
                 if numeric_ids:
-                    jobs_resp = supabase.table("jobs").select("*").in_("id", numeric_ids).execute()
+                    jobs_resp = await runQuery(supabase.table("jobs").select(getColumns("job_card")).in_("id", numeric_ids))
                     for job in jobs_resp.data or []:
                         job_details_map[str(job["id"])] = job
                 if string_ids:
-                    jobs_resp2 = supabase.table("jobs").select("*").in_("id", string_ids).execute()
+                    jobs_resp2 = await runQuery(supabase.table("jobs").select(getColumns("job_card")).in_("id", string_ids))
                     for job in jobs_resp2.data or []:
                         job_details_map[str(job["id"])] = job
 
@@ -2864,9 +3184,9 @@ async def viewApplicationHistory(request: Request):
                     elif raw_job_id is not None:
                         try:
                             jid_numeric = int(str(raw_job_id))
-                            single_job = supabase.table("jobs").select("*").eq("id", jid_numeric).single().execute()
+                            single_job = await runQuery(supabase.table("jobs").select(getColumns("job_card")).eq("id", jid_numeric).single())
                         except Exception:
-                            single_job = supabase.table("jobs").select("*").eq("id", str(raw_job_id)).single().execute()
+                            single_job = await runQuery(supabase.table("jobs").select(getColumns("job_card")).eq("id", str(raw_job_id)).single())
                         if getattr(single_job, 'data', None):
                             app_copy["jobDetails"] = single_job.data
                     enriched.append(app_copy)
@@ -2896,19 +3216,19 @@ async def viewApplicationHistory(request: Request):
 @app.post("/decline-application/{application_id}")
 async def declineApplication(request: Request, application_id: str):
     try:
-        auth_userID = await getAuthUserIdFromRequest(request)
+        auth_userID, role = await getAuthUserRoleFromRequest(request)
         
         supabase = getSupabaseServiceClient()
         
-        check_user = supabase.table("employee").select("user_id").eq("user_id", auth_userID).single().execute()
 
-        if check_user.data and check_user.data["user_id"] == auth_userID:
-            decline_application = supabase.table("declined_jobs").insert({
+        if role == "employee":
+            decline_application = await runQuery(supabase.table("declined_jobs").insert({
                 "user_id": auth_userID,
                 "job_id": application_id
-            }).execute()
+            }))
             
             if decline_application.data:
+                await syncExcludedJob(auth_userID, application_id)
                 return {
                     "Status": "Successfull",
                     "Message": "Application declined successfully"
@@ -2937,7 +3257,7 @@ async def viewDeclinedApplications(request: Request):
         
         supabase = getSupabaseServiceClient()
         
-        get_all_declined_applications = supabase.table("declined_jobs").select("*").eq("user_id", auth_userID).execute()
+        get_all_declined_applications = await runQuery(supabase.table("declined_jobs").select("*").eq("user_id", auth_userID))
         
         if get_all_declined_applications.data:
             return {
@@ -2982,7 +3302,7 @@ async def get_chat_history(sender_id: str, receiver_id: str, job_id: str = None)
         if job_id:
             query = query.eq("job_id", job_id)
             
-        response = query.order("created_at").execute()
+        response = await runQuery(query.order("created_at"))
 
         if response.data:
             return {
@@ -3059,7 +3379,7 @@ async def get_inbox_message(user_id: str):
 @app.post("/message/send-message") # send message to a user
 async def send_message(payload: ChatMessage, request: Request):
     # check if the user is authenticated
-    auth_userID = await getAuthUserIdFromRequest(request)
+    auth_userID, role = await getAuthUserRoleFromRequest(request)
     if auth_userID != payload.sender_id:
         return {
             "Status": "Error",
@@ -3069,13 +3389,13 @@ async def send_message(payload: ChatMessage, request: Request):
     supabase = getSupabaseServiceClient()
     
     # Insert message into database
-    response = supabase.table("messages").insert({
+    response = await runQuery(supabase.table("messages").insert({
         "sender_id": payload.sender_id,
         "receiver_id": payload.receiver_id,
         "message": payload.message,
         "job_id": payload.job_id,
         "type": payload.type
-    }).execute()
+    }))
     
 
     #store notification
@@ -3085,18 +3405,19 @@ async def send_message(payload: ChatMessage, request: Request):
     sender_name_in_employee = None
     sender_name_in_employer = None
     
-    # Try to find sender in employee table first
-    try:
-        sender_name_in_employee = supabase.table("employee").select("full_name").eq("user_id", payload.sender_id).single().execute()
-    except Exception as e:
-        # If no rows found or other error, continue to check employer table
-        # print(f"DEBUG - Employee table check failed: {e}")
-        sender_name_in_employee = None
+    # Try to find sender in employee table first (the session role lets us skip the wrong table)
+    if role != "employer":
+        try:
+            sender_name_in_employee = await runQuery(supabase.table("employee").select("full_name").eq("user_id", payload.sender_id).single())
+        except Exception as e:
+            # If no rows found or other error, continue to check employer table
+            # print(f"DEBUG - Employee table check failed: {e}")
+            sender_name_in_employee = None
     
     # If not found in employee table, try employer table
-    if not sender_name_in_employee or not sender_name_in_employee.data:
+    if (not sender_name_in_employee or not sender_name_in_employee.data) and role != "employee":
         try:
-            sender_name_in_employer = supabase.table("employers").select("company_name").eq("user_id", payload.sender_id).single().execute()
+            sender_name_in_employer = await runQuery(supabase.table("employers").select("company_name").eq("user_id", payload.sender_id).single())
         except Exception as e:
             # If no rows found or other error in employer table too
             # print(f"DEBUG - Employer table check failed: {e}")
@@ -3255,19 +3576,19 @@ async def register_push_token(request: Request):
         # print(f"🔔 Token: {expo_token[:30]}...")
         
         # First, deactivate any existing tokens for this user
-        deactivate_result = supabase.table("push_tokens").update({
+        deactivate_result = await runQuery(supabase.table("push_tokens").update({
             "active": False
-        }).eq("user_id", user_id).execute()
+        }).eq("user_id", user_id))
         
         # print(f"🔔 Deactivated {len(deactivate_result.data) if deactivate_result.data else 0} existing tokens")
         
         # Insert or update the new token
-        result = supabase.table("push_tokens").upsert({
+        result = await runQuery(supabase.table("push_tokens").upsert({
             "user_id": user_id,
             "expo_token": expo_token,
             "active": True,
             "created_at": datetime.now().isoformat()
-        }, on_conflict="expo_token").execute()
+        }, on_conflict="expo_token"))
         
         if result.data:
             print(f"✅ Push token registered for user {user_id}: {expo_token[:20]}...")
@@ -3308,7 +3629,7 @@ async def mark_message_as_read(message_id: str, request: Request):
         }
     
     # Verify the message exists and belongs to the authenticated user
-    check_message = supabase.table("messages").select("*").eq("id", message_id).eq("receiver_id", auth_userID).execute()
+    check_message = await runQuery(supabase.table("messages").select("*").eq("id", message_id).eq("receiver_id", auth_userID))
 
     if not check_message.data:
         return {
@@ -3317,7 +3638,7 @@ async def mark_message_as_read(message_id: str, request: Request):
         }
     
     # Update the message to mark it as read
-    response = supabase.table("messages").update({"is_read": True}).eq("id", message_id).execute()
+    response = await runQuery(supabase.table("messages").update({"is_read": True}).eq("id", message_id))
 
     if response.data:
         return {
@@ -3344,7 +3665,7 @@ async def mark_all_messages_as_read(user_id: str, request: Request):
         }
     
     # Verify the user exists
-    check_user = supabase.table("users").select("*").eq("id", user_id).execute()
+    check_user = await runQuery(supabase.table("users").select("*").eq("id", user_id))
     
     if not check_user.data:
         return {
@@ -3353,7 +3674,7 @@ async def mark_all_messages_as_read(user_id: str, request: Request):
         }
     
     # Update all messages for the user to mark them as read
-    response = supabase.table("messages").update({"is_read": True}).eq("receiver_id", user_id).execute()
+    response = await runQuery(supabase.table("messages").update({"is_read": True}).eq("receiver_id", user_id))
     
     if response.data:
         return {
@@ -3380,7 +3701,7 @@ async def get_unread_messages(user_id: str, request: Request):
         }
     
     # Verify the user exists
-    check_user = supabase.table("users").select("*").eq("id", user_id).execute()
+    check_user = await runQuery(supabase.table("users").select("*").eq("id", user_id))
     
     if not check_user.data:
         return {
@@ -3389,7 +3710,7 @@ async def get_unread_messages(user_id: str, request: Request):
         }
     
     # Get all unread messages for the user
-    response = supabase.table("messages").select("*").eq("receiver_id", user_id).eq("is_read", False).execute()
+    response = await runQuery(supabase.table("messages").select("*").eq("receiver_id", user_id).eq("is_read", False))
     
     if response.data:
         return {
@@ -3417,7 +3738,7 @@ async def get_all_messages(user_id: str, request: Request):
         }
     
     # Verify the user exists
-    check_user = supabase.table("users").select("*").eq("id", user_id).execute()
+    check_user = await runQuery(supabase.table("users").select("*").eq("id", user_id))
     
     if not check_user.data:
         return {
@@ -3426,7 +3747,7 @@ async def get_all_messages(user_id: str, request: Request):
         }
     
     # Get all messages for the user
-    response = supabase.table("messages").select("*").eq("receiver_id", user_id).execute()
+    response = await runQuery(supabase.table("messages").select("*").eq("receiver_id", user_id))
     
     if response.data:
         return {
@@ -3457,7 +3778,7 @@ async def get_all_notifications(user_id: str, request: Request):
     
     try:
         # Get all notifications for the user
-        response = supabase.table("notifications").select("*").eq("receiver_id", user_id).execute()
+        response = await runQuery(supabase.table("notifications").select("*").eq("receiver_id", user_id))
     except Exception as e:
         return {
             "Status": "Error",
@@ -3492,7 +3813,7 @@ async def mark_notification_as_read(notification_id: str, request: Request):
     
     try:
         # Mark the notification as read
-        response = supabase.table("notifications").update({"is_read": True}).eq("id", notification_id).execute()
+        response = await runQuery(supabase.table("notifications").update({"is_read": True}).eq("id", notification_id))
     except Exception as e:
         return {
             "Status": "Error",
@@ -3525,7 +3846,7 @@ async def mark_all_notifications_as_read(user_id: str, request: Request):
     
     try:
         # Mark all notifications as read
-        response = supabase.table("notifications").update({"is_read": True}).eq("receiver_id", user_id).execute()
+        response = await runQuery(supabase.table("notifications").update({"is_read": True}).eq("receiver_id", user_id))
     except Exception as e:
         return {
             "Status": "Error",
@@ -3559,7 +3880,7 @@ async def get_unread_notifications(user_id: str, request: Request):
     
     try:
         # Get unread notifications
-        response = supabase.table("notifications").select("*").eq("receiver_id", user_id).eq("is_read", False).execute()
+        response = await runQuery(supabase.table("notifications").select("*").eq("receiver_id", user_id).eq("is_read", False))
     except Exception as e:
         return {
             "Status": "Error",
@@ -3593,7 +3914,7 @@ async def delete_notification(notification_id: str, request: Request):
     
     try:
         # Delete the notification
-        response = supabase.table("notifications").delete().eq("id", notification_id).execute()
+        response = await runQuery(supabase.table("notifications").delete().eq("id", notification_id))
     except Exception as e:
         return {
             "Status": "Error",
@@ -3625,7 +3946,7 @@ async def get_job_application_analysis(user_id: str, request: Request):
     
     try:
         # Get job application analysis data
-        response = supabase.table("job_application_analysis_data").select("*").eq("userid_of_employer", user_id).execute()
+        response = await runQuery(supabase.table("job_application_analysis_data").select("*").eq("userid_of_employer", user_id))
     except Exception as e:
         return {
             "Status": "Error",
@@ -3667,7 +3988,7 @@ async def verify_pwd_id(user_id: str):
     
     try:
         # Fetch user data
-        response = supabase.table("employee").select("*").eq("user_id", user_id).execute()
+        response = await runQuery(supabase.table("employee").select(getColumns("pwd_verification")).eq("user_id", user_id))
 
         if not response.data:
             return {
@@ -3686,33 +4007,34 @@ async def verify_pwd_id(user_id: str):
 
         try:
             # Initialize Groq client
-            client = Groq()
+            client = getGroqClient()
 
             # Call Groq API for image analysis - run in thread pool to avoid blocking
             loop = asyncio.get_event_loop()
-            groq_response = await loop.run_in_executor(
-                None, 
-                lambda: client.chat.completions.create(
-                    model="meta-llama/llama-4-scout-17b-16e-instruct",
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": "You are a PWD ID verification system. Analyze this PWD (Person with Disability) identification card image and extract ONLY the PWD ID number and the person's name.\n\nIMPORTANT: You must respond in EXACTLY this format with nothing else:\nPWD ID Number: [number], Name: [full name]\n\nIf you cannot find both the PWD ID number and name clearly in the image, respond with EXACTLY:\nNo number or name found in the image.\n\nDo not include any explanations, descriptions, or additional text. Only the required format."
-                                },
-                                {
-                                    "type": "image_url",
-                                    "image_url": {
-                                        "url": f"{pwde_id_front}"
+            async with trackAsyncCall("groq", "chat.completions", "create"):
+                groq_response = await loop.run_in_executor(
+                    None, 
+                    lambda: client.chat.completions.create(
+                        model="meta-llama/llama-4-scout-17b-16e-instruct",
+                        messages=[
+                            {
+                                "role": "user",
+                                "content": [
+                                    {
+                                        "type": "text",
+                                        "text": "You are a PWD ID verification system. Analyze this PWD (Person with Disability) identification card image and extract ONLY the PWD ID number and the person's name.\n\nIMPORTANT: You must respond in EXACTLY this format with nothing else:\nPWD ID Number: [number], Name: [full name]\n\nIf you cannot find both the PWD ID number and name clearly in the image, respond with EXACTLY:\nNo number or name found in the image.\n\nDo not include any explanations, descriptions, or additional text. Only the required format."
+                                    },
+                                    {
+                                        "type": "image_url",
+                                        "image_url": {
+                                            "url": f"{pwde_id_front}"
+                                        }
                                     }
-                                }
-                            ]
-                        }
-                    ]
+                                ]
+                            }
+                        ]
+                    )
                 )
-            )
         except Exception as e:
             return {
                 "Status": "Error",
@@ -3814,15 +4136,16 @@ async def verify_pwd_id(user_id: str):
 
         # Verify against pwd_people table
         try:
-            verification_response = supabase.table("pwd_people").select("*").eq("pwd_number", pwd_id_number).eq("id_owner_name", name).execute()
+            verification_response = await runQuery(supabase.table("pwd_people").select("*").eq("pwd_number", pwd_id_number).eq("id_owner_name", name))
 
             # verify if the name match as the user's full name
-            against_user = supabase.table("employee").select("*").eq("full_name", name).execute()
+            against_user = await runQuery(supabase.table("employee").select(getColumns("role_check")).eq("full_name", name))
             
             if verification_response.data and against_user.data:
 
                 #update the employee "is_verified" to true
-                supabase.table("employee").update({"is_verified": True}).eq("user_id", user_id).execute()
+                await runQuery(supabase.table("employee").update({"is_verified": True}).eq("user_id", user_id))
+                await syncTalentIndex(supabase, user_id)
 
                 return {
                     "Status": "Success",
@@ -3928,31 +4251,32 @@ async def verify_pwd_id_local(
     
     # Use Groq API to extract PWD ID number and name from front image using base64
     try:
-        client = Groq()
+        client = getGroqClient()
         loop = asyncio.get_event_loop()
-        groq_response = await loop.run_in_executor(
-            None, 
-            lambda: client.chat.completions.create(
-                model="meta-llama/llama-4-scout-17b-16e-instruct",
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": "You are a PWD ID verification system. Analyze this PWD (Person with Disability) identification card image and extract ONLY the PWD ID number and the person's name.\n\nIMPORTANT: You must respond in EXACTLY this format with nothing else:\nPWD ID Number: [number], Name: [full name]\n\nIf you cannot find both the PWD ID number and name clearly in the image, respond with EXACTLY:\nNo number or name found in the image.\n\nDo not include any explanations, descriptions, or additional text. Only the required format."
-                            },
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": front_image_data_url
+        async with trackAsyncCall("groq", "chat.completions", "create"):
+            groq_response = await loop.run_in_executor(
+                None, 
+                lambda: client.chat.completions.create(
+                    model="meta-llama/llama-4-scout-17b-16e-instruct",
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": [
+                                {
+                                    "type": "text",
+                                    "text": "You are a PWD ID verification system. Analyze this PWD (Person with Disability) identification card image and extract ONLY the PWD ID number and the person's name.\n\nIMPORTANT: You must respond in EXACTLY this format with nothing else:\nPWD ID Number: [number], Name: [full name]\n\nIf you cannot find both the PWD ID number and name clearly in the image, respond with EXACTLY:\nNo number or name found in the image.\n\nDo not include any explanations, descriptions, or additional text. Only the required format."
+                                },
+                                {
+                                    "type": "image_url",
+                                    "image_url": {
+                                        "url": front_image_data_url
+                                    }
                                 }
-                            }
-                        ]
-                    }
-                ]
+                            ]
+                        }
+                    ]
+                )
             )
-        )
     except Exception as e:
         return {
             "Status": "Error",
@@ -4053,7 +4377,7 @@ async def verify_pwd_id_local(
     
     # Verify against pwd_people table
     try:
-        verification_response = supabase.table("pwd_people").select("*").eq("pwd_number", pwd_id_number).eq("id_owner_name", extracted_name.upper()).execute()
+        verification_response = await runQuery(supabase.table("pwd_people").select("*").eq("pwd_number", pwd_id_number).eq("id_owner_name", extracted_name.upper()))
         
         # If full_name is provided, also check if it matches
         name_match = True
@@ -4111,7 +4435,7 @@ async def extract_id_number(user_id: str):
     
     try:
         # Get the user's PWD ID image
-        response = supabase.table("employee").select("pwd_id_front_url").eq("user_id", user_id).execute()
+        response = await runQuery(supabase.table("employee").select("pwd_id_front_url").eq("user_id", user_id))
     except Exception as e:
         return {
             "Status": "Error",
@@ -4121,30 +4445,31 @@ async def extract_id_number(user_id: str):
     
     # groq api to extract the id number from the image
     try:
-        client = Groq()
+        client = getGroqClient()
         loop = asyncio.get_event_loop()
-        groq_response = await loop.run_in_executor(
-            None, 
-            lambda: client.chat.completions.create(
-                model="meta-llama/llama-4-scout-17b-16e-instruct",
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": "Extract the ID number from the image. Only respond with the ID number and nothing else. For example: PWD ID Number: 1234567890"
-                            },
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"{response.data[0]['pwd_id_front_url']}"
+        async with trackAsyncCall("groq", "chat.completions", "create"):
+            groq_response = await loop.run_in_executor(
+                None, 
+                lambda: client.chat.completions.create(
+                    model="meta-llama/llama-4-scout-17b-16e-instruct",
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": [
+                                {
+                                    "type": "text",
+                                    "text": "Extract the ID number from the image. Only respond with the ID number and nothing else. For example: PWD ID Number: 1234567890"
+                                },
+                                {
+                                    "type": "image_url",
+                                    "image_url": {
+                                        "url": f"{response.data[0]['pwd_id_front_url']}"
+                                    }
                                 }
-                            }
-                        ]
-                    }
-                ])
-        )
+                            ]
+                        }
+                    ])
+            )
     except Exception as e:
         return {
             "Status": "Error",
@@ -4180,7 +4505,7 @@ async def getEmployerInfo(user_id: str):
         }
     
     try:
-        response = supabase.table("employers").select("*").eq("user_id", user_id).execute()
+        response = await runQuery(supabase.table("employers").select("*").eq("user_id", user_id))
     except Exception as e:
         return {
             "Status": "Error",
@@ -4202,13 +4527,11 @@ async def rejectingPreviousApplication(application_id: str, request: Request):
     This endpoint is used by employers when they hire a candidate.
     """
     try:
-        auth_userID = await getAuthUserIdFromRequest(request)
+        auth_userID, role = await getAuthUserRoleFromRequest(request)
         supabase = getSupabaseServiceClient()
         
         # Check if the user is an employer
-        check_user = supabase.table("employers").select("user_id").eq("user_id", auth_userID).single().execute()
-        
-        if not check_user.data or check_user.data["user_id"] != auth_userID:
+        if role != "employer":
             return {
                 "Status": "Error",
                 "Message": "Unauthorized: Only employers can perform this action"
@@ -4216,7 +4539,7 @@ async def rejectingPreviousApplication(application_id: str, request: Request):
         
         # Get the application details to find the user_id
         try:
-            application = supabase.table("job_applications").select("user_id, job_id").eq("id", application_id).single().execute()
+            application = await runQuery(supabase.table("job_applications").select("user_id, job_id").eq("id", application_id).single())
             if not application.data:
                 return {
                     "Status": "Error",
@@ -4233,7 +4556,7 @@ async def rejectingPreviousApplication(application_id: str, request: Request):
         
         # Mark the current application as 'accepted' (hired)
         try:
-            update_current = supabase.table("job_applications").update({"status": "accepted"}).eq("id", application_id).execute()
+            update_current = await runQuery(supabase.table("job_applications").update({"status": "accepted"}).eq("id", application_id))
             if not update_current.data:
                 return {
                     "Status": "Error",
@@ -4248,7 +4571,7 @@ async def rejectingPreviousApplication(application_id: str, request: Request):
         
         # Reject all other applications from this user (except the one we just accepted)
         try:
-            reject_others = supabase.table("job_applications").update({"status": "rejected"}).eq("user_id", user_id).neq("id", application_id).execute()
+            reject_others = await runQuery(supabase.table("job_applications").update({"status": "rejected"}).eq("user_id", user_id).neq("id", application_id))
         except Exception as e:
             return {
                 "Status": "Error",
@@ -4258,7 +4581,7 @@ async def rejectingPreviousApplication(application_id: str, request: Request):
         
         # Send notification to the applicant
         try:
-            job_title = supabase.table("jobs").select("title").eq("id", job_id).single().execute()
+            job_title = await runQuery(supabase.table("jobs").select("title").eq("id", job_id).single())
             category = "job_application_accepted"
             content = f"Your application at {job_title.data['title']} has been accepted"
             
@@ -4342,7 +4665,7 @@ async def uploadOtherDocuments(user_id: str, request: Request, file: UploadFile
         else:
             content_type = "application/octet-stream"  # default fallback
         
-        auth_userID = await getAuthUserIdFromRequest(request)
+        auth_userID, role = await getAuthUserRoleFromRequest(request)
         supabase = getSupabaseServiceClient()
         
         # Verify that the authenticated user matches the user_id in the path
@@ -4353,16 +4676,14 @@ async def uploadOtherDocuments(user_id: str, request: Request, file: UploadFile
             }
         
         # Check if the user is an employee
-        check_user = supabase.table("employee").select("user_id").eq("user_id", auth_userID).single().execute()
-        
-        if not check_user.data or check_user.data["user_id"] != auth_userID:
+        if role != "employee":
             return {
                 "Status": "Error",
                 "Message": "User not found or not authorized"
             }
         
         # Check how many other documents the user already has (max 5)
-        existing_docs = supabase.table("other_documents").select("user_id").eq("user_id", auth_userID).execute()
+        existing_docs = await runQuery(supabase.table("other_documents").select("user_id").eq("user_id", auth_userID))
         doc_count = len(existing_docs.data) if existing_docs.data else 0
         
         if doc_count >= 5:
@@ -4408,13 +4729,13 @@ async def uploadOtherDocuments(user_id: str, request: Request, file: UploadFile
             # Use document_name if provided, otherwise use filename without extension
             display_name = document_name if document_name else file.filename.rsplit('.', 1)[0]
             
-            insert_result = supabase.table("other_documents").insert({
+            insert_result = await runQuery(supabase.table("other_documents").insert({
                 "user_id": auth_userID,
                 "document_name": display_name,
                 "document_url": document_url,
                 "file_name": file.filename,
                 "created_at": datetime.now().isoformat()
-            }).execute()
+            }))
 
             # Verify the insert was successful
             if not insert_result.data:
@@ -4448,16 +4769,11 @@ async def uploadOtherDocuments(user_id: str, request: Request, file: UploadFile
 @app.get("/get-other-documents/{user_id}")
 async def getOtherDocuments(user_id: str, request: Request):
     try:
-        auth_userID = await getAuthUserIdFromRequest(request)
+        auth_userID, role = await getAuthUserRoleFromRequest(request)
         supabase = getSupabaseServiceClient()
         
         # Check if requester is an employer (can view any user's documents)
-        try:
-            check_employer = supabase.table("employers").select("user_id").eq("user_id", auth_userID).single().execute()
-            is_employer = check_employer.data and check_employer.data["user_id"] == auth_userID
-        except Exception:
-            # User is not an employer, continue with employee check
-            is_employer = False
+        is_employer = role == "employer"
         
         # If not an employer, check if requester is viewing their own documents
         if not is_employer:
@@ -4468,21 +4784,14 @@ async def getOtherDocuments(user_id: str, request: Request):
                 }
             
             # Verify the user is an employee
-            try:
-                check_user = supabase.table("employee").select("user_id").eq("user_id", auth_userID).single().execute()
-                if not check_user.data or check_user.data["user_id"] != auth_userID:
-                    return {
-                        "Status": "Error",
-                        "Message": "User not found or not authorized"
-                    }
-            except Exception:
+            if role != "employee":
                 return {
                     "Status": "Error",
                     "Message": "User not found or not authorized"
                 }
         
         # Fetch all other documents for the target user
-        documents = supabase.table("other_documents").select("*").eq("user_id", user_id).order("created_at", desc=True).execute()
+        documents = await runQuery(supabase.table("other_documents").select("*").eq("user_id", user_id).order("created_at", desc=True))
         
         # Always return Documents array, even if empty
         documents_list = documents.data if documents.data else []
@@ -4507,7 +4816,7 @@ async def deleteOtherDocument(document_id: str, request: Request):
         supabase = getSupabaseServiceClient()
         
         # First, get the document to verify ownership
-        document = supabase.table("other_documents").select("*").eq("id", document_id).single().execute()
+        document = await runQuery(supabase.table("other_documents").select("*").eq("id", document_id).single())
         
         if not document.data:
             return {
@@ -4541,7 +4850,7 @@ async def deleteOtherDocument(document_id: str, request: Request):
             print(f"Warning: Error removing file from storage: {storage_error}")
         
         # Delete from database
-        delete_result = supabase.table("other_documents").delete().eq("id", document_id).execute()
+        delete_result = await runQuery(supabase.table("other_documents").delete().eq("id", document_id))
         
         if delete_result.data:
             return {
@@ -4566,7 +4875,7 @@ async def deleteOtherDocument(document_id: str, request: Request):
 async def getSkippedJobs(user_id: str):
     supabase = getSupabaseServiceClient()
     try:
-        skipped_jobs = supabase.table("declined_jobs").select("*").eq("user_id", user_id).execute()
+        skipped_jobs = await runQuery(supabase.table("declined_jobs").select("*").eq("user_id", user_id))
     except Exception as e:
         return {
             "Status": "Error",
@@ -4592,7 +4901,7 @@ async def getSkippedJobs(user_id: str):
                 "SkippedJobs": []
             }
         
-        jobs_data = supabase.table("jobs").select("*").in_("id", job_ids).execute()
+        jobs_data = await runQuery(supabase.table("jobs").select(getColumns("job_card")).in_("id", job_ids))
         
         return {
             "Status": "Success",
@@ -4612,9 +4921,10 @@ async def revertBack(user_id: str, job_id: str):
     try:
         supabase = getSupabaseServiceClient()
         # Delete only the specific job for the user
-        delete_result = supabase.table("declined_jobs").delete().eq("user_id", user_id).eq("job_id", job_id).execute()
+        delete_result = await runQuery(supabase.table("declined_jobs").delete().eq("user_id", user_id).eq("job_id", job_id))
         
         if delete_result.data:
+            await syncExcludedJob(user_id, job_id, excluded=False)
             return {
                 "Status": "Success",
                 "Message": "Skipped job reverted back successfully"
@@ -4629,4 +4939,10 @@ async def revertBack(user_id: str, job_id: str):
             "Status": "Error",
             "Message": "Internal Server Error",
             "Details": f"{e}"
-        }
\ No newline at end of file
+        }
+
+
+# cold start report: how long this module took to import, SDKs loaded later are added on first use
+_import_seconds = time.perf_counter() - _import_started
+recordImportTime("index", _import_seconds)
+print(f"🚀 index.py imported in {_import_seconds * 1000:.0f} ms ({'eager' if isEagerStartup() else 'lazy'} startup)")
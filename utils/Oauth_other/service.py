@@ -1,8 +1,8 @@
 from datetime import datetime
 from datetime import date
 from utils.general.service import getSupabaseServiceClient
-
-supabase_check = getSupabaseServiceClient()
+from utils.database.service import runQuery
+from utils.projection.service import getColumns
 
 # Limit employer signups per day (default 5)
 async def limitNewUsers(daily_limit: int = 5):
@@ -11,13 +11,13 @@ async def limitNewUsers(daily_limit: int = 5):
     end_of_day = datetime.combine(date.today(), datetime.max.time())
 
     # Query count of employers created today
-    result = (
+    supabase_check = getSupabaseServiceClient()
+    result = await runQuery(
         supabase_check
             .table("employers")
-            .select("*", count="exact")
+            .select("id", count="exact")
             .gte("created_at", start_of_day.isoformat())
             .lt("created_at", end_of_day.isoformat())
-            .execute()
     )
 
     # Extract count safely (supports clients that may not expose .count)
@@ -38,14 +38,16 @@ async def limitNewUsers(daily_limit: int = 5):
 
 #check if user is already in the database
 async def checkIfEmployerExists(email):
-    user = supabase_check.table("employers").select("*").eq("email", email).execute()
+    supabase_check = getSupabaseServiceClient()
+    user = await runQuery(supabase_check.table("employers").select(getColumns("role_check")).eq("email", email))
     if user.data:
         return True
     return False
 
 #check if employee signup email already exists
 async def checkIfEmployeeExists(email):
-    user = supabase_check.table("employee").select("*").eq("email", email).execute()
+    supabase_check = getSupabaseServiceClient()
+    user = await runQuery(supabase_check.table("employee").select(getColumns("role_check")).eq("email", email))
     if user.data:
         return True
     return False
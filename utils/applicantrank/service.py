@@ -0,0 +1,88 @@
+# applicants of a job ranked by skill match, for employers
+# applyingForJob scores the applicant against the job once and stores it on
+# job_applications.match_score. Each job's applications are mirrored in a redis sorted
+# set (application id -> match_score), loaded from the table on first use and kept
+# current on apply, so /ranked-applicants pages through ids and scores and only
+# fetches the application rows it returns. Until the match_score migration has run,
+# nothing writes or selects the column and every application is scored from its snapshot.
+from utils.database.service import runQuery
+from utils.redis_server.redis_client import redis
+from utils.skillindex.service import getJobSkills
+from utils.skillvocab.service import UNDEFINED_COLUMN, readEmployeeSkills
+
+APPLICANTS_PREFIX = "applicant_rank:job:"  # sorted set per job: application id -> match_score
+LOADED_PREFIX = "applicant_rank:loaded:"  # present while the set mirrors the table
+APPLICANT_RANK_TTL = 86400
+FETCH_CHUNK_SIZE = 200
+
+_has_match_score_column = None  # probed once per process
+
+
+def applicantsKey(job_id) -> str:
+    return f"{APPLICANTS_PREFIX}{job_id}"
+
+def loadedKey(job_id) -> str:
+    return f"{LOADED_PREFIX}{job_id}"
+
+def applicantMatchScore(applicant_skills: set, job: dict) -> float:
+    # share of the job's skills the applicant has, the same ratio /reco-jobs uses
+    job_skills = getJobSkills(job)
+    return len(applicant_skills & job_skills) / len(job_skills) if job_skills else 0.0
+
+async def scoreApplicant(employee: dict, job: dict) -> float:
+    return applicantMatchScore(await readEmployeeSkills(employee), job)
+
+async def hasMatchScoreColumn(supabase) -> bool:
+    # whether job_applications has match_score yet; a failed probe other than a missing column
+    # is retried on the next call
+    global _has_match_score_column
+    if _has_match_score_column is None:
+        try:
+            await runQuery(supabase.table("job_applications").select("match_score").limit(1))
+            _has_match_score_column = True
+        except Exception as e:
+            if getattr(e, "code", None) != UNDEFINED_COLUMN:
+                raise
+            print("⚠️ job_applications.match_score is missing, scoring applicants from their snapshots until the migration runs")
+            _has_match_score_column = False
+    return _has_match_score_column
+
+async def loadApplicantScores(supabase, job: dict) -> list:
+    job_id = job["id"]
+    if await hasMatchScoreColumn(supabase):
+        result = await runQuery(supabase.table("job_applications").select("id, match_score").eq("job_id", job_id))
+        scores = {row["id"]: row["match_score"] for row in result.data or []}
+    else:
+        result = await runQuery(supabase.table("job_applications").select("id").eq("job_id", job_id))
+        scores = {row["id"]: None for row in result.data or []}
+
+    # applications made before match_score existed are scored from their applicant snapshot
+    unscored = [application_id for application_id, score in scores.items() if score is None]
+    for i in range(0, len(unscored), FETCH_CHUNK_SIZE):
+        result = await runQuery(
+            supabase.table("job_applications").select("id, applicant_details").in_("id", unscored[i:i + FETCH_CHUNK_SIZE])
+        )
+        for row in result.data or []:
+            scores[row["id"]] = await scoreApplicant(row.get("applicant_details") or {}, job)
+
+    await redis.delete(applicantsKey(job_id))
+    if scores:
+        await redis.zadd(applicantsKey(job_id), {str(application_id): score for application_id, score in scores.items()})
+        await redis.expire(applicantsKey(job_id), APPLICANT_RANK_TTL)
+    await redis.set(loadedKey(job_id), "1", ex=APPLICANT_RANK_TTL)
+    return [(str(application_id), float(score)) for application_id, score in scores.items()]
+
+async def getApplicantScores(supabase, job: dict) -> list:
+    # [(application id, match_score)] of every application to the job
+    if await redis.exists(loadedKey(job["id"])):
+        return await redis.zrange(applicantsKey(job["id"]), 0, -1, withscores=True)
+    return await loadApplicantScores(supabase, job)
+
+async def addApplicant(job_id, application_id, score: float):
+    # only worth recording while the set is loaded, otherwise the next load reads it from the table
+    if await redis.exists(loadedKey(job_id)):
+        await redis.zadd(applicantsKey(job_id), {str(application_id): score})
+        await redis.expire(applicantsKey(job_id), APPLICANT_RANK_TTL)
+
+async def dropJobApplicants(job_id):
+    await redis.delete(applicantsKey(job_id), loadedKey(job_id))
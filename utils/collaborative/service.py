@@ -0,0 +1,109 @@
+# collaborative filtering for /reco-jobs, serving side
+# `python -m utils.collaborative.train` factorizes the implicit feedback matrix offline
+# (views, applications, skips) and writes user/job factor arrays to CF_MODEL_DIR.
+# Here they are memory-mapped, and a recommendation's rank score becomes
+#   skill_match_score + CF_WEIGHT * clip(user . job / scale, 0, 1)
+# so the skill score still decides eligibility and CF only reorders. Jobs or users the
+# model has never seen get no boost. meta.json is checked every CF_RELOAD_SECONDS, and
+# a retrained model is picked up without a restart.
+import json
+import os
+import threading
+import time
+
+from utils.startup.service import lazyImport, loadEnvironment
+
+loadEnvironment()
+
+CF_MODEL_DIR = os.getenv("CF_MODEL_DIR", "cf_model")
+CF_WEIGHT = float(os.getenv("CF_WEIGHT", "0.3"))
+CF_RELOAD_SECONDS = 60
+META_FILE = "meta.json"
+
+_lock = threading.Lock()
+_model = None
+_meta_mtime = None
+_checked_at = 0.0
+
+
+class FactorModel:
+    def __init__(self, model_dir: str, meta: dict):
+        np = lazyImport("numpy")
+        self.version = meta["version"]
+        self.scale = float(meta["scale"]) or 1.0
+        self.user_factors = np.load(os.path.join(model_dir, meta["user_factors"]), mmap_mode="r")
+        self.job_factors = np.load(os.path.join(model_dir, meta["job_factors"]), mmap_mode="r")
+        with open(os.path.join(model_dir, meta["ids"]), encoding="utf-8") as f:
+            ids = json.load(f)
+        self.user_index = {user_id: row for row, user_id in enumerate(ids["users"])}
+        self.job_index = {str(job_id): row for row, job_id in enumerate(ids["jobs"])}
+
+    def scores(self, user_id: str, job_ids: list):
+        # cf score in [0, 1] for each job id, 0 for anything the model doesn't know
+        np = lazyImport("numpy")
+        result = np.zeros(len(job_ids))
+        user_row = self.user_index.get(str(user_id))
+        if user_row is None:
+            return result
+        positions, rows = [], []
+        for position, job_id in enumerate(job_ids):
+            row = self.job_index.get(str(job_id))
+            if row is not None:
+                positions.append(position)
+                rows.append(row)
+        if rows:
+            dots = np.asarray(self.job_factors[rows]) @ np.asarray(self.user_factors[user_row])
+            result[positions] = np.clip(dots / self.scale, 0.0, 1.0)
+        return result
+
+
+def readMeta(model_dir: str = CF_MODEL_DIR):
+    try:
+        with open(os.path.join(model_dir, META_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def getModel():
+    # the current factor model, or None when none has been trained
+    global _model, _meta_mtime, _checked_at
+    now = time.monotonic()
+    if now - _checked_at < CF_RELOAD_SECONDS:
+        return _model
+    with _lock:
+        if now - _checked_at < CF_RELOAD_SECONDS:
+            return _model
+        _checked_at = now
+        try:
+            mtime = os.stat(os.path.join(CF_MODEL_DIR, META_FILE)).st_mtime
+        except OSError:
+            _model, _meta_mtime = None, None
+            return None
+        if mtime != _meta_mtime:
+            meta = readMeta()
+            try:
+                _model = FactorModel(CF_MODEL_DIR, meta) if meta else None
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️ Could not load collaborative filtering model from {CF_MODEL_DIR}: {e}")
+                _model = None
+            _meta_mtime = mtime
+        return _model
+
+def getActiveModel():
+    # the model blendScores uses, None when CF is off or untrained
+    return getModel() if CF_WEIGHT > 0 else None
+
+def getModelVersion():
+    model = getActiveModel()
+    return model.version if model is not None else None
+
+def blendScores(user_id: str, ranked: list) -> list:
+    # [(job id, skill score)] -> [(job id, rank score)], unchanged when CF is off or untrained
+    return blendModelScores(getActiveModel(), user_id, ranked)
+
+def blendModelScores(model, user_id: str, ranked: list) -> list:
+    # same blend against a model the caller already holds (batched job-write patches)
+    if model is None or not ranked:
+        return ranked
+    cf = model.scores(user_id, [job_id for job_id, _ in ranked]).tolist()
+    return [(job_id, score + CF_WEIGHT * boost) for (job_id, score), boost in zip(ranked, cf)]
@@ -0,0 +1,145 @@
+# offline trainer for the /reco-jobs collaborative filtering model
+#
+#   python -m utils.collaborative.train --factors 32
+#
+# Builds an implicit feedback user x job matrix from employee_history (shown / applied),
+# job_applications and declined_jobs, factorizes it with a truncated SVD and writes
+# the factor arrays plus id maps to CF_MODEL_DIR. meta.json is replaced last so the
+# API never sees a half written model. Run it nightly, or after a burst of activity.
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+from utils.collaborative.service import CF_MODEL_DIR, META_FILE, readMeta
+from utils.general.service import getSupabaseServiceClient
+from utils.skillindex.service import jobIdSortKey
+from utils.startup.service import lazyImport
+
+PAGE_SIZE = 1000
+
+# feedback weights, the strongest signal for a (user, job) pair wins and a skip overrides everything
+SHOWN_WEIGHT = 0.1  # /reco-jobs writes a row for every job it serves, so this is exposure more than interest
+APPLIED_WEIGHT = 3.0
+ACCEPTED_WEIGHT = 5.0
+SKIPPED_WEIGHT = -1.0
+
+
+def fetchAll(supabase, table: str, columns: str, order=("id",)) -> list:
+    rows, start = [], 0
+    while True:
+        query = supabase.table(table).select(columns)
+        for column in order:
+            query = query.order(column)
+        page = query.range(start, start + PAGE_SIZE - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+        start += PAGE_SIZE
+
+def collectFeedback(supabase) -> dict:
+    # (user id, job id) -> weight
+    feedback = {}
+
+    def add(user_id, job_id, weight):
+        if user_id and job_id is not None:
+            key = (str(user_id), str(job_id))
+            feedback[key] = max(feedback.get(key, weight), weight)
+
+    for row in fetchAll(supabase, "employee_history", "id, user_id, job_id, applied"):
+        add(row["user_id"], row["job_id"], APPLIED_WEIGHT if row.get("applied") else SHOWN_WEIGHT)
+    for row in fetchAll(supabase, "job_applications", "id, user_id, job_id, status"):
+        add(row["user_id"], row["job_id"], ACCEPTED_WEIGHT if row.get("status") == "accepted" else APPLIED_WEIGHT)
+    for row in fetchAll(supabase, "declined_jobs", "user_id, job_id", order=("user_id", "job_id")):
+        if row.get("user_id") and row.get("job_id") is not None:
+            feedback[(str(row["user_id"]), str(row["job_id"]))] = SKIPPED_WEIGHT
+    return feedback
+
+def factorize(feedback: dict, factors: int) -> dict:
+    np = lazyImport("numpy")
+    sparse = lazyImport("scipy.sparse")
+    svds = lazyImport("scipy.sparse.linalg").svds
+
+    users = sorted({user_id for user_id, _ in feedback})
+    jobs = sorted({job_id for _, job_id in feedback}, key=jobIdSortKey)
+    user_rows = {user_id: i for i, user_id in enumerate(users)}
+    job_rows = {job_id: i for i, job_id in enumerate(jobs)}
+    weights = np.fromiter(feedback.values(), dtype=np.float64, count=len(feedback))
+    matrix = sparse.csr_matrix((
+        np.sign(weights) * np.log1p(np.abs(weights)),  # dampen heavy weights
+        ([user_rows[u] for u, _ in feedback], [job_rows[j] for _, j in feedback]),
+    ), shape=(len(users), len(jobs)))
+
+    k = min(factors, min(matrix.shape) - 1)
+    if k < 1:
+        raise ValueError(f"not enough feedback to train: {matrix.shape[0]} users x {matrix.shape[1]} jobs")
+    u, s, vt = svds(matrix, k=k)
+    root = np.sqrt(s)
+    user_factors = (u * root).astype(np.float32)
+    job_factors = (vt.T * root).astype(np.float32)
+
+    # scale so a strong positive pair lands near 1: 95th percentile of the reconstructed positives
+    coo = matrix.tocoo()
+    positive = coo.data > 0
+    reconstructed = np.einsum("ij,ij->i", user_factors[coo.row[positive]], job_factors[coo.col[positive]])
+    scale = float(np.percentile(reconstructed, 95)) if reconstructed.size else 1.0
+
+    return {
+        "users": users,
+        "jobs": jobs,
+        "user_factors": user_factors,
+        "job_factors": job_factors,
+        "scale": scale if scale > 0 else 1.0,
+        "factors": k,
+    }
+
+def saveModel(model: dict, model_dir: str, feedback_rows: int) -> dict:
+    np = lazyImport("numpy")
+    os.makedirs(model_dir, exist_ok=True)
+    version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    meta = {
+        "version": version,
+        "user_factors": f"user_factors-{version}.npy",
+        "job_factors": f"job_factors-{version}.npy",
+        "ids": f"ids-{version}.json",
+        "factors": model["factors"],
+        "scale": model["scale"],
+        "users": len(model["users"]),
+        "jobs": len(model["jobs"]),
+        "feedback_rows": feedback_rows,
+    }
+    np.save(os.path.join(model_dir, meta["user_factors"]), model["user_factors"])
+    np.save(os.path.join(model_dir, meta["job_factors"]), model["job_factors"])
+    with open(os.path.join(model_dir, meta["ids"]), "w", encoding="utf-8") as f:
+        json.dump({"users": model["users"], "jobs": model["jobs"]}, f)
+
+    previous = readMeta(model_dir)
+    tmp_path = os.path.join(model_dir, f"{META_FILE}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_path, os.path.join(model_dir, META_FILE))
+
+    # the previous files stay until the next run, the API may still have them mapped
+    keep = {META_FILE, meta["user_factors"], meta["job_factors"], meta["ids"]}
+    if previous:
+        keep.update(previous.get(name) for name in ("user_factors", "job_factors", "ids"))
+    for name in os.listdir(model_dir):
+        if name not in keep and name.split("-")[0] in ("user_factors", "job_factors", "ids"):
+            os.remove(os.path.join(model_dir, name))
+    return meta
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the /reco-jobs collaborative filtering model.")
+    parser.add_argument("--factors", type=int, default=32, help="latent factors (SVD rank)")
+    parser.add_argument("--output", default=CF_MODEL_DIR, help="model directory (default: CF_MODEL_DIR)")
+    args = parser.parse_args(argv)
+
+    feedback = collectFeedback(getSupabaseServiceClient())
+    print(f"📥 {len(feedback)} feedback pairs")
+    meta = saveModel(factorize(feedback, args.factors), args.output, len(feedback))
+    print(f"✅ model {meta['version']}: {meta['users']} users x {meta['jobs']} jobs, {meta['factors']} factors -> {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
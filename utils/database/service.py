@@ -0,0 +1,117 @@
+# async data access for postgrest
+# The supabase query builders are synchronous, so every .execute() is handed to a
+# bounded worker pool instead of running on the event loop.
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.general.service import POOL_MAX_CONNECTIONS, getSupabaseServiceClient
+from utils.metrics.service import describeQuery, getRequestStats, trackAsyncCall
+from utils.querybudget.service import isQueryBudgetEnabled, queryShape
+
+# one worker per pooled connection by default; more workers would only queue on the pool
+DB_MAX_WORKERS = int(os.getenv("DB_MAX_WORKERS", str(POOL_MAX_CONNECTIONS)))
+
+_executor = ThreadPoolExecutor(max_workers=DB_MAX_WORKERS, thread_name_prefix="postgrest")
+
+async def runQuery(query):
+    # run a postgrest request builder without blocking the event loop
+    table, operation = describeQuery(query)
+    stats = getRequestStats()
+    if stats is not None:
+        stats.db_queries += 1
+        if isQueryBudgetEnabled():
+            stats.recordQueryShape(queryShape(query))
+    loop = asyncio.get_running_loop()
+    async with trackAsyncCall("supabase", table, operation):
+        return await loop.run_in_executor(_executor, query.execute)
+
+async def runQueries(*queries):
+    # run independent queries concurrently, results come back in the same order
+    return await asyncio.gather(*(runQuery(query) for query in queries))
+
+def shutdownQueryExecutor():
+    _executor.shutdown(wait=False)
+
+
+class RowLoader:
+    """
+    Request-scoped batching loader for single-row lookups on unique columns.
+    Identical (table, column, value) lookups are served from the request cache, and
+    lookups issued in the same event-loop tick are merged into one in_() query per
+    (table, column). An optional column projection is part of the key.
+    """
+
+    def __init__(self, supabase):
+        self.supabase = supabase
+        self._cache = {}
+        self._pending = {}
+        self._dispatch_scheduled = False
+        self._dispatch_task = None
+
+    async def load(self, table: str, column: str, value, columns: str = "*"):
+        key = (table, column, str(value), columns)
+        future = self._cache.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._cache[key] = future
+            self._pending.setdefault((table, column, columns), {})[str(value)] = (value, future)
+            if not self._dispatch_scheduled:
+                self._dispatch_scheduled = True
+                loop.call_soon(self._startDispatch)
+        return await asyncio.shield(future)
+
+    async def loadMany(self, table: str, column: str, values, columns: str = "*"):
+        return await asyncio.gather(*(self.load(table, column, value, columns) for value in values))
+
+    def prime(self, table: str, column: str, value, row, columns: str = "*"):
+        # seed the cache with a row the handler already has
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(row)
+        self._cache[(table, column, str(value), columns)] = future
+
+    def clear(self, table: str, column: str = None, value=None):
+        # drop cached rows after a write so the next load sees fresh data
+        for key in list(self._cache):
+            if key[0] != table:
+                continue
+            if column is not None and key[1] != column:
+                continue
+            if value is not None and key[2] != str(value):
+                continue
+            del self._cache[key]
+
+    def _startDispatch(self):
+        self._dispatch_task = asyncio.ensure_future(self._dispatch())
+
+    async def _dispatch(self):
+        pending, self._pending = self._pending, {}
+        self._dispatch_scheduled = False
+        await asyncio.gather(*(self._loadBatch(table, column, columns, batch) for (table, column, columns), batch in pending.items()))
+
+    async def _loadBatch(self, table: str, column: str, columns: str, batch: dict):
+        try:
+            values = [value for value, _ in batch.values()]
+            result = await runQuery(self.supabase.table(table).select(columns).in_(column, values))
+        except Exception as e:
+            for key, (_, future) in batch.items():
+                self._cache.pop((table, column, key, columns), None)
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        rows = {}
+        for row in result.data or []:
+            rows.setdefault(str(row.get(column)), row)
+        for key, (_, future) in batch.items():
+            if not future.done():
+                future.set_result(rows.get(key))
+
+def getRowLoader(request):
+    # one loader per request, kept on request.state
+    loader = getattr(request.state, "row_loader", None)
+    if loader is None:
+        loader = RowLoader(getSupabaseServiceClient())
+        request.state.row_loader = loader
+    return loader
@@ -0,0 +1,47 @@
+# jobs an employee already applied to or skipped, kept out of /reco-jobs
+# One redis set of job ids per user, loaded from job_applications + declined_jobs on
+# first use and then kept current by applyingForJob and declineApplication; revertBack
+# drops it so the next request reloads it.
+# A user's history is a handful of ids, so a plain set is both exact and small enough.
+from utils.database.service import runQueries
+from utils.redis_server.redis_client import redis
+
+EXCLUDED_PREFIX = "reco_exclude:jobs:"
+LOADED_PREFIX = "reco_exclude:loaded:"  # present while the set mirrors the database
+EXCLUSION_TTL = 86400
+
+
+def excludedKey(user_id: str) -> str:
+    return f"{EXCLUDED_PREFIX}{user_id}"
+
+def loadedKey(user_id: str) -> str:
+    return f"{LOADED_PREFIX}{user_id}"
+
+async def loadExcludedJobIds(supabase, user_id: str) -> set:
+    applied, skipped = await runQueries(
+        supabase.table("job_applications").select("job_id").eq("user_id", user_id),
+        supabase.table("declined_jobs").select("job_id").eq("user_id", user_id),
+    )
+    job_ids = {str(row["job_id"]) for result in (applied, skipped) for row in (result.data or []) if row.get("job_id") is not None}
+    await redis.delete(excludedKey(user_id))
+    if job_ids:
+        await redis.sadd(excludedKey(user_id), *job_ids)
+        await redis.expire(excludedKey(user_id), EXCLUSION_TTL)
+    await redis.set(loadedKey(user_id), "1", ex=EXCLUSION_TTL)
+    return job_ids
+
+async def getExcludedJobIds(supabase, user_id: str) -> set:
+    if await redis.exists(loadedKey(user_id)):
+        return await redis.smembers(excludedKey(user_id))
+    return await loadExcludedJobIds(supabase, user_id)
+
+async def excludeJob(user_id: str, job_id):
+    # only worth recording while the set is loaded, otherwise the next load reads it from the database
+    if await redis.exists(loadedKey(user_id)):
+        await redis.sadd(excludedKey(user_id), str(job_id))
+        await redis.expire(excludedKey(user_id), EXCLUSION_TTL)
+
+async def dropExcludedJobIds(user_id: str):
+    # a job can leave the set only if neither an application nor a decline still covers it,
+    # so instead of removing it here the next request reloads the set from the database
+    await redis.delete(excludedKey(user_id), loadedKey(user_id))
@@ -1,15 +1,130 @@
 # supabase service
-from supabase import create_client, Client
+import threading
 import os
-from dotenv import load_dotenv
+from typing import TYPE_CHECKING
 
-load_dotenv()
+from utils.startup.service import lazyImport, loadEnvironment
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+loadEnvironment()
 url = os.getenv("SUPABASE_URL")
 key = os.getenv("SUPABASE_PRIVATE_KEY")
 service_key = os.getenv("SUPABASE_SERVICE_KEY")
+# "supabase" (default) or "memory" for the in-process stand-in in utils/memory_backend
+SUPABASE_BACKEND = os.getenv("SUPABASE_BACKEND", "supabase").lower()
+
+# connection pool settings (shared by every pooled client)
+POOL_MAX_CONNECTIONS = int(os.getenv("SUPABASE_POOL_MAX_CONNECTIONS", "20"))
+POOL_MAX_KEEPALIVE = int(os.getenv("SUPABASE_POOL_MAX_KEEPALIVE", "10"))
+POOL_KEEPALIVE_EXPIRY = float(os.getenv("SUPABASE_POOL_KEEPALIVE_EXPIRY", "60"))
+
+
+class SupabaseClientRegistry:
+    """
+    Process-wide registry of Supabase clients.
+    Every client built here sends its PostgREST traffic through one shared
+    keep-alive connection pool, so TLS handshakes are paid once per connection
+    instead of once per request.
+    """
+
+    def __init__(self, max_connections: int = POOL_MAX_CONNECTIONS, max_keepalive: int = POOL_MAX_KEEPALIVE, keepalive_expiry: float = POOL_KEEPALIVE_EXPIRY):
+        # the SDKs are imported here, on first use, to keep them out of the cold start
+        httpx = lazyImport("httpx")
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        if SUPABASE_BACKEND == "memory":
+            from utils.memory_backend.supabase_client import getMemoryTransport
+            self.transport = getMemoryTransport()
+        else:
+            self.transport = httpx.HTTPTransport(http2=True, limits=self.limits)
+        self._clients = {}
+        self._checkouts = {}
+        self._lock = threading.Lock()
+
+    def getClient(self, name: str, supabase_key: str) -> "Client":
+        client = self._clients.get(name)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(name)
+                if client is None:
+                    client = self._buildClient(supabase_key)
+                    self._clients[name] = client
+        self._checkouts[name] = self._checkouts.get(name, 0) + 1
+        return client
+
+    def _buildClient(self, supabase_key: str) -> "Client":
+        client = createClient(supabase_key)
+        postgrest = client.postgrest
+        # swap the per-client http session for one that uses the shared transport
+        postgrest.session = lazyImport("postgrest.utils").SyncClient(
+            base_url=postgrest.base_url,
+            headers=postgrest.headers,
+            timeout=postgrest.timeout,
+            follow_redirects=True,
+            transport=self.transport,
+        )
+        return client
+
+    def stats(self) -> dict:
+        pool = getattr(self.transport, "_pool", None)
+        connections = pool.connections if pool is not None else []
+        idle = sum(1 for conn in connections if conn.is_idle())
+        return {
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "keepalive_expiry": self.limits.keepalive_expiry,
+            "open_connections": len(connections),
+            "active_connections": len(connections) - idle,
+            "idle_connections": idle,
+            "backend": SUPABASE_BACKEND,
+            "clients": list(self._clients.keys()),
+            "checkouts": dict(self._checkouts),
+        }
+
+    def close(self):
+        with self._lock:
+            self._clients.clear()
+            self.transport.close()
+
+
+def createClient(supabase_key: str) -> "Client":
+    if SUPABASE_BACKEND == "memory":
+        from utils.memory_backend.supabase_client import createMemoryClient
+        return createMemoryClient(supabase_key) if supabase_key else createMemoryClient()
+    return lazyImport("supabase").create_client(url, supabase_key)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def initSupabaseRegistry() -> SupabaseClientRegistry: # called once at app startup
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = SupabaseClientRegistry()
+    return _registry
+
+def closeSupabaseRegistry():
+    global _registry
+    with _registry_lock:
+        if _registry is not None:
+            _registry.close()
+            _registry = None
+
+def getSupabasePoolStats() -> dict:
+    return initSupabaseRegistry().stats()
 
 def getSupabaseClient(): # for public routes
-    return create_client(url, key)
+    return initSupabaseRegistry().getClient("public", key)
 
 def getSupabaseServiceClient(): # for protected routes (Read,Write, View access)
-    return create_client(url, service_key)
\ No newline at end of file
+    return initSupabaseRegistry().getClient("service", service_key)
+
+def getSupabaseAuthClient(service: bool = False): # for sign up / sign in / password reset
+    # auth calls change the client's session headers, so these never come from the shared registry
+    return createClient(service_key if service else key)
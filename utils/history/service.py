@@ -0,0 +1,43 @@
+# employee_history writes for /reco-jobs
+# Every recommended job gets one (user_id, job_id) row. They are written with one bulk
+# upsert that ignores rows already there, so "applied" is never reset. That needs the
+# unique key from docs/API_UPDATES.md. Until it exists postgres rejects the upsert
+# (42P10), and we fall back to one select of the existing job ids plus one bulk insert.
+from utils.database.service import runQuery, runQueries
+
+HISTORY_CHUNK_SIZE = 500  # rows per request, keeps bodies and in_() urls small
+MISSING_CONSTRAINT_CODE = "42P10"
+
+_unique_key_missing = False
+
+
+async def insertMissingHistory(supabase, user_id: str, job_ids: list):
+    existing = await runQueries(*(
+        supabase.table("employee_history").select("job_id").eq("user_id", user_id).in_("job_id", job_ids[i:i + HISTORY_CHUNK_SIZE])
+        for i in range(0, len(job_ids), HISTORY_CHUNK_SIZE)
+    ))
+    seen = {str(row["job_id"]) for result in existing for row in (result.data or [])}
+    missing = [{"user_id": user_id, "job_id": job_id} for job_id in job_ids if str(job_id) not in seen]
+    for i in range(0, len(missing), HISTORY_CHUNK_SIZE):
+        await runQuery(supabase.table("employee_history").insert(missing[i:i + HISTORY_CHUNK_SIZE], returning="minimal"))
+
+async def recordRecommendedJobs(supabase, user_id: str, job_ids):
+    # make sure a history row exists for every job, without touching existing ones
+    global _unique_key_missing
+    job_ids = list(dict.fromkeys(job_ids))
+    if not job_ids:
+        return
+    if _unique_key_missing:
+        return await insertMissingHistory(supabase, user_id, job_ids)
+    try:
+        for i in range(0, len(job_ids), HISTORY_CHUNK_SIZE):
+            rows = [{"user_id": user_id, "job_id": job_id} for job_id in job_ids[i:i + HISTORY_CHUNK_SIZE]]
+            await runQuery(supabase.table("employee_history").upsert(
+                rows, on_conflict="user_id,job_id", ignore_duplicates=True, returning="minimal"
+            ))
+    except Exception as e:
+        if getattr(e, "code", None) != MISSING_CONSTRAINT_CODE:
+            raise
+        print("⚠️ employee_history has no (user_id, job_id) unique key, falling back to select + insert")
+        _unique_key_missing = True
+        await insertMissingHistory(supabase, user_id, job_ids)
@@ -0,0 +1,12 @@
+# groq client, created on first use so the SDK is not imported on cold start
+from utils.startup.service import lazyImport, loadEnvironment
+
+_client = None
+
+def getGroqClient():
+    # one client per process; it keeps its own connection pool
+    global _client
+    if _client is None:
+        loadEnvironment()
+        _client = lazyImport("groq").Groq()
+    return _client
@@ -0,0 +1,279 @@
+# in-memory async Redis stand-in (REDIS_BACKEND=memory)
+# Covers the commands the app uses, with the same return shapes as
+# redis.asyncio with decode_responses=True. Single process only.
+import fnmatch
+import time
+
+
+class MemoryRedis:
+    def __init__(self):
+        self._data = {}
+        self._expires = {}
+
+    # ---- keyspace ----
+    def _alive(self, key):
+        deadline = self._expires.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return key in self._data
+
+    def _get(self, key, kind):
+        if not self._alive(key):
+            return None
+        value = self._data[key]
+        if not isinstance(value, kind):
+            raise TypeError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    def _setExpiry(self, key, ex=None, px=None):
+        if ex is not None:
+            self._expires[key] = time.monotonic() + float(ex)
+        elif px is not None:
+            self._expires[key] = time.monotonic() + float(px) / 1000
+        else:
+            self._expires.pop(key, None)
+
+    async def ping(self):
+        return True
+
+    async def exists(self, *keys):
+        return sum(1 for key in keys if self._alive(key))
+
+    async def delete(self, *keys):
+        removed = 0
+        for key in keys:
+            if self._alive(key):
+                del self._data[key]
+                self._expires.pop(key, None)
+                removed += 1
+        return removed
+
+    async def expire(self, key, seconds):
+        if not self._alive(key):
+            return False
+        self._setExpiry(key, ex=seconds)
+        return True
+
+    async def ttl(self, key):
+        if not self._alive(key):
+            return -2
+        deadline = self._expires.get(key)
+        return -1 if deadline is None else max(0, int(deadline - time.monotonic()))
+
+    async def keys(self, pattern="*"):
+        return [key for key in list(self._data) if self._alive(key) and fnmatch.fnmatchcase(key, pattern)]
+
+    async def flushdb(self):
+        self._data.clear()
+        self._expires.clear()
+        return True
+
+    # ---- strings ----
+    async def get(self, key):
+        return self._get(key, str)
+
+    async def set(self, key, value, ex=None, px=None, nx=False, xx=False, keepttl=False):
+        exists = self._alive(key)
+        if (nx and exists) or (xx and not exists):
+            return None
+        self._data[key] = str(value)
+        if not keepttl:
+            self._setExpiry(key, ex, px)
+        return True
+
+    async def setex(self, key, seconds, value):
+        return await self.set(key, value, ex=seconds)
+
+    async def mget(self, keys, *args):
+        keys = list(keys) + list(args) if isinstance(keys, (list, tuple)) else [keys, *args]
+        return [self._get(key, str) for key in keys]
+
+    async def incrby(self, key, amount=1):
+        value = int(self._get(key, str) or 0) + amount
+        self._data[key] = str(value)
+        return value
+
+    async def incr(self, key, amount=1):
+        return await self.incrby(key, amount)
+
+    # ---- hashes ----
+    async def hset(self, name, key=None, value=None, mapping=None):
+        items = dict(mapping or {})
+        if key is not None:
+            items[key] = value
+        hash_ = self._get(name, dict)
+        if hash_ is None:
+            hash_ = self._data[name] = {}
+        added = sum(1 for field in items if field not in hash_)
+        hash_.update({field: str(v) for field, v in items.items()})
+        return added
+
+    async def hget(self, name, key):
+        return (self._get(name, dict) or {}).get(key)
+
+    async def hmget(self, name, keys, *args):
+        keys = list(keys) + list(args) if isinstance(keys, (list, tuple)) else [keys, *args]
+        hash_ = self._get(name, dict) or {}
+        return [hash_.get(key) for key in keys]
+
+    async def hgetall(self, name):
+        return dict(self._get(name, dict) or {})
+
+    async def hkeys(self, name):
+        return list(self._get(name, dict) or {})
+
+    async def hdel(self, name, *keys):
+        hash_ = self._get(name, dict) or {}
+        return sum(1 for key in keys if hash_.pop(key, None) is not None)
+
+    # ---- sets ----
+    async def sadd(self, name, *values):
+        set_ = self._get(name, set)
+        if set_ is None:
+            set_ = self._data[name] = set()
+        before = len(set_)
+        set_.update(str(value) for value in values)
+        return len(set_) - before
+
+    async def srem(self, name, *values):
+        set_ = self._get(name, set)
+        if set_ is None:
+            return 0
+        before = len(set_)
+        set_.difference_update(str(value) for value in values)
+        if not set_:
+            await self.delete(name)
+        return before - len(set_)
+
+    async def smembers(self, name):
+        return set(self._get(name, set) or ())
+
+    async def sismember(self, name, value):
+        return str(value) in (self._get(name, set) or ())
+
+    async def smismember(self, name, values, *args):
+        members = self._get(name, set) or ()
+        values = list(values) + list(args) if isinstance(values, (list, tuple)) else [values, *args]
+        return [str(value) in members for value in values]
+
+    async def sunion(self, keys, *args):
+        keys = list(keys) + list(args) if isinstance(keys, (list, tuple)) else [keys, *args]
+        return set().union(*(self._get(key, set) or () for key in keys))
+
+    async def sinter(self, keys, *args):
+        keys = list(keys) + list(args) if isinstance(keys, (list, tuple)) else [keys, *args]
+        sets = [self._get(key, set) or set() for key in keys]
+        return set.intersection(*sets) if sets else set()
+
+    async def scard(self, name):
+        return len(self._get(name, set) or ())
+
+    # ---- sorted sets ----
+    async def zadd(self, name, mapping, nx=False, xx=False):
+        zset = self._get(name, ZSet)
+        if zset is None:
+            zset = self._data[name] = ZSet()
+        added = 0
+        for member, score in mapping.items():
+            member = str(member)
+            exists = member in zset.scores
+            if (nx and exists) or (xx and not exists):
+                continue
+            added += 0 if exists else 1
+            zset.scores[member] = float(score)
+        return added
+
+    async def zrem(self, name, *members):
+        zset = self._get(name, ZSet)
+        if zset is None:
+            return 0
+        removed = sum(1 for member in members if zset.scores.pop(str(member), None) is not None)
+        if not zset.scores:
+            await self.delete(name)
+        return removed
+
+    async def zscore(self, name, member):
+        zset = self._get(name, ZSet)
+        return None if zset is None else zset.scores.get(str(member))
+
+    async def zcard(self, name):
+        zset = self._get(name, ZSet)
+        return 0 if zset is None else len(zset.scores)
+
+    async def zrange(self, name, start, end, desc=False, withscores=False):
+        zset = self._get(name, ZSet)
+        if zset is None:
+            return []
+        items = zset.ordered(desc)
+        end = len(items) + end if end < 0 else end
+        items = items[start:end + 1]
+        return [(member, score) for member, score in items] if withscores else [member for member, _ in items]
+
+    async def zrangebyscore(self, name, min, max, withscores=False):
+        zset = self._get(name, ZSet)
+        if zset is None:
+            return []
+        low, high = float(min), float(max)
+        items = [(member, score) for member, score in zset.ordered() if low <= score <= high]
+        return items if withscores else [member for member, _ in items]
+
+    async def zremrangebyscore(self, name, min, max):
+        zset = self._get(name, ZSet)
+        if zset is None:
+            return 0
+        low, high = float(min), float(max)
+        doomed = [member for member, score in zset.scores.items() if low <= score <= high]
+        for member in doomed:
+            del zset.scores[member]
+        if not zset.scores:
+            await self.delete(name)
+        return len(doomed)
+
+    async def zrevrange(self, name, start, end, withscores=False):
+        return await self.zrange(name, start, end, desc=True, withscores=withscores)
+
+    # ---- pipelines ----
+    def pipeline(self, transaction=True):
+        return MemoryPipeline(self)
+
+    # ---- connection ----
+    async def aclose(self):
+        return None
+
+    async def close(self):
+        return None
+
+
+class MemoryPipeline:
+    # queues commands and runs them in order on execute(), like redis.asyncio's Pipeline
+    def __init__(self, client):
+        self._client = client
+        self._commands = []
+
+    def __getattr__(self, name):
+        method = getattr(self._client, name)
+
+        def queue(*args, **kwargs):
+            self._commands.append((method, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        commands, self._commands = self._commands, []
+        return [await method(*args, **kwargs) for method, args, kwargs in commands]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self._commands = []
+
+
+class ZSet:
+    def __init__(self):
+        self.scores = {}
+
+    def ordered(self, desc=False):
+        # redis orders by score, then member, both reversed for desc
+        return sorted(self.scores.items(), key=lambda item: (item[1], item[0]), reverse=desc)
@@ -0,0 +1,592 @@
+# in-memory Supabase stand-in (SUPABASE_BACKEND=memory)
+# The real supabase-py clients are kept; only their HTTP transport is replaced by
+# MemorySupabaseTransport, which answers PostgREST, GoTrue and Storage requests from
+# process memory. Query builders, serialization and response parsing stay on the
+# real code path, so benchmarks measure the app and not a mock.
+import base64
+import json
+import os
+import secrets
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from urllib.parse import unquote
+
+import httpx
+from gotrue import SyncMemoryStorage
+from gotrue.http_clients import SyncClient as GoTrueHttpClient
+from postgrest import SyncPostgrestClient
+from postgrest.utils import SyncClient as PostgrestHttpClient
+from storage3 import SyncStorageClient
+from storage3.utils import SyncClient as StorageHttpClient
+from supabase import ClientOptions
+from supabase._sync.client import SyncClient as SupabaseSyncClient
+from supabase._sync.auth_client import SyncSupabaseAuthClient
+
+MEMORY_SUPABASE_URL = "http://supabase.memory"
+MEMORY_SUPABASE_KEY = "memory.supabase.key"
+# optional JSON file with initial rows: {"jobs": [...], "employee": [...], "_auth_users": [{"email", "password"}]}
+MEMORY_BACKEND_SEED = os.getenv("MEMORY_BACKEND_SEED")
+
+# column defaults the real schema fills in on insert
+COLUMN_DEFAULTS = {
+    "messages": {"is_read": False},
+    "notifications": {"is_read": False},
+    "employee_history": {"applied": False},
+}
+
+SINGLE_OBJECT_ACCEPT = "application/vnd.pgrst.object+json"
+ACCESS_TOKEN_TTL = 3600
+
+
+def nowIso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+def normalizeValue(value) -> str:
+    # filter values arrive as strings, so rows are compared in their PostgREST text form
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+def compareValues(row_value, filter_value: str):
+    # -1 / 0 / 1, numbers compare as numbers, everything else (ISO timestamps included) as text
+    try:
+        left, right = float(row_value), float(filter_value)
+    except (TypeError, ValueError):
+        left, right = normalizeValue(row_value), filter_value
+    return (left > right) - (left < right)
+
+def parseList(raw: str) -> list:
+    # ("a","b,c",3) -> ["a", "b,c", "3"]
+    raw = raw.strip()
+    if raw.startswith("(") and raw.endswith(")"):
+        raw = raw[1:-1]
+    values, current, quoted = [], "", False
+    for char in raw:
+        if char == '"':
+            quoted = not quoted
+        elif char == "," and not quoted:
+            values.append(current)
+            current = ""
+        else:
+            current += char
+    if current or values:
+        values.append(current)
+    return values
+
+
+class Filter:
+    def __init__(self, column: str, expression: str):
+        self.column = column
+        self.negate = expression.startswith("not.")
+        if self.negate:
+            expression = expression[len("not."):]
+        self.operator, _, self.value = expression.partition(".")
+        self.values = set(parseList(self.value)) if self.operator == "in" else None
+
+    def matches(self, row: dict) -> bool:
+        value = row.get(self.column)
+        op = self.operator
+        # postgres reads booleans case-insensitively (eq.True is eq.true)
+        expected = self.value.lower() if isinstance(value, bool) or op == "is" else self.value
+        if op == "eq":
+            result = value is not None and normalizeValue(value) == expected
+        elif op == "neq":
+            result = value is not None and normalizeValue(value) != expected
+        elif op == "in":
+            result = value is not None and (normalizeValue(value) in self.values or normalizeValue(value) in {v.lower() for v in self.values})
+        elif op == "is":
+            result = normalizeValue(value) == expected
+        elif op in ("gt", "gte", "lt", "lte"):
+            if value is None:
+                result = False
+            else:
+                cmp = compareValues(value, self.value)
+                result = {"gt": cmp > 0, "gte": cmp >= 0, "lt": cmp < 0, "lte": cmp <= 0}[op]
+        elif op in ("like", "ilike"):
+            pattern = self.value.replace("*", "%")
+            text = normalizeValue(value)
+            if op == "ilike":
+                pattern, text = pattern.lower(), text.lower()
+            result = value is not None and likeMatch(text, pattern)
+        else:
+            raise MemoryBackendError(400, "PGRST100", f"operator {op} is not supported by the memory backend")
+        return not result if self.negate else result
+
+def likeMatch(text: str, pattern: str) -> bool:
+    parts = pattern.split("%")
+    if len(parts) == 1:
+        return text == pattern
+    if not text.startswith(parts[0]) or not text.endswith(parts[-1]):
+        return False
+    position = len(parts[0])
+    for part in parts[1:-1]:
+        found = text.find(part, position)
+        if found < 0:
+            return False
+        position = found + len(part)
+    return position <= len(text) - len(parts[-1])
+
+
+class MemoryBackendError(Exception):
+    def __init__(self, status: int, code: str, message: str, details: str = None):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+        self.details = details
+
+
+class MemoryTable:
+    """
+    Rows of one table keyed by id, with equality indexes built on first use
+    and kept current on every write.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.rows = {}
+        self._next_id = 1
+        self._indexes = {}
+
+    def insert(self, values: dict) -> dict:
+        row = {**COLUMN_DEFAULTS.get(self.name, {}), **values}
+        if row.get("id") is None:
+            row["id"] = self._next_id
+        if isinstance(row["id"], int):
+            self._next_id = max(self._next_id, row["id"] + 1)
+        row.setdefault("created_at", nowIso())
+        self.rows[row["id"]] = row
+        for column, index in self._indexes.items():
+            index.setdefault(normalizeValue(row.get(column)), set()).add(row["id"])
+        return row
+
+    def update(self, row: dict, values: dict) -> dict:
+        for column, index in self._indexes.items():
+            if column in values:
+                index.get(normalizeValue(row.get(column)), set()).discard(row["id"])
+                index.setdefault(normalizeValue(values[column]), set()).add(row["id"])
+        row.update(values)
+        return row
+
+    def delete(self, row: dict):
+        for column, index in self._indexes.items():
+            index.get(normalizeValue(row.get(column)), set()).discard(row["id"])
+        self.rows.pop(row["id"], None)
+
+    def index(self, column: str) -> dict:
+        index = self._indexes.get(column)
+        if index is None:
+            index = {}
+            for row_id, row in self.rows.items():
+                index.setdefault(normalizeValue(row.get(column)), set()).add(row_id)
+            self._indexes[column] = index
+        return index
+
+    def find(self, filters: list) -> list:
+        # narrow with the first eq / in filter through an index, then check the rest row by row
+        candidates = None
+        for f in filters:
+            if f.negate or f.operator not in ("eq", "in"):
+                continue
+            index = self.index(f.column)
+            keys = [f.value] if f.operator == "eq" else list(f.values)
+            keys += [key.lower() for key in keys if key.lower() in ("true", "false")]
+            candidates = sorted(set().union(*(index.get(key, ()) for key in keys)), key=self._sortKey)
+            break
+        rows = self.rows.values() if candidates is None else (self.rows[row_id] for row_id in candidates)
+        return [row for row in rows if all(f.matches(row) for f in filters)]
+
+    @staticmethod
+    def _sortKey(row_id):
+        return (0, row_id, "") if isinstance(row_id, int) else (1, 0, str(row_id))
+
+
+class MemoryStore:
+    """
+    Process-wide in-memory state for the Supabase stand-in: tables, auth users
+    and storage objects. Safe to share between the postgrest worker threads.
+    """
+
+    def __init__(self):
+        self.tables = {}
+        self.users = {}
+        self.users_by_email = {}
+        self.access_tokens = {}
+        self.refresh_tokens = {}
+        self.recovery_codes = {}
+        self.buckets = {}
+        self.objects = {}
+        self.lock = threading.RLock()
+
+    def table(self, name: str) -> MemoryTable:
+        table = self.tables.get(name)
+        if table is None:
+            table = self.tables.setdefault(name, MemoryTable(name))
+        return table
+
+    def seed(self, data: dict):
+        # bulk load rows (and auth users under "_auth_users"), ids are kept when given
+        with self.lock:
+            for user in data.get("_auth_users", []):
+                self.createUser(user["email"], user["password"], user.get("id"))
+            for name, rows in data.items():
+                if name.startswith("_"):
+                    continue
+                table = self.table(name)
+                for row in rows:
+                    table.insert(row)
+
+    def reset(self):
+        with self.lock:
+            self.__init__()
+
+    def createUser(self, email: str, password: str, user_id: str = None, metadata: dict = None) -> dict:
+        with self.lock:
+            email = email.strip().lower()
+            if email in self.users_by_email:
+                raise MemoryBackendError(422, "user_already_exists", "User already registered")
+            created_at = nowIso()
+            user = {
+                "id": user_id or str(uuid.uuid4()),
+                "aud": "authenticated",
+                "role": "authenticated",
+                "email": email,
+                "app_metadata": {"provider": "email", "providers": ["email"]},
+                "user_metadata": metadata or {},
+                "created_at": created_at,
+                "updated_at": created_at,
+                "email_confirmed_at": created_at,
+                "confirmed_at": created_at,
+            }
+            self.users[user["id"]] = {"user": user, "password": password}
+            self.users_by_email[email] = user["id"]
+            # public.users mirrors auth.users, as the trigger does in the real project
+            self.table("users").insert({"id": user["id"], "email": email, "created_at": created_at})
+            return user
+
+    def issueSession(self, user_id: str) -> dict:
+        user = self.users[user_id]["user"]
+        expires_at = int(time.time()) + ACCESS_TOKEN_TTL
+        access_token = makeAccessToken(user_id, expires_at)
+        refresh_token = secrets.token_urlsafe(24)
+        self.access_tokens[access_token] = user_id
+        self.refresh_tokens[refresh_token] = user_id
+        user["last_sign_in_at"] = nowIso()
+        return {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "token_type": "bearer",
+            "expires_in": ACCESS_TOKEN_TTL,
+            "expires_at": expires_at,
+            "user": user,
+        }
+
+def makeAccessToken(user_id: str, expires_at: int) -> str:
+    # JWT-shaped but unsigned; only ever checked against MemoryStore.access_tokens
+    def encode(part: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(part).encode()).decode().rstrip("=")
+    header = encode({"alg": "HS256", "typ": "JWT"})
+    payload = encode({"sub": user_id, "exp": expires_at, "role": "authenticated", "jti": secrets.token_hex(8)})
+    return f"{header}.{payload}.{secrets.token_urlsafe(16)}"
+
+
+# stored procedures, called as fn(store, **params)
+def getInboxMessages(store: MemoryStore, uid: str) -> list:
+    # latest message of every conversation (job + counterpart) the user takes part in
+    latest = {}
+    for row in store.table("messages").rows.values():
+        if uid not in (row.get("sender_id"), row.get("receiver_id")):
+            continue
+        other = row.get("receiver_id") if row.get("sender_id") == uid else row.get("sender_id")
+        key = (normalizeValue(row.get("job_id")), other)
+        if key not in latest or normalizeValue(row.get("created_at")) >= normalizeValue(latest[key].get("created_at")):
+            latest[key] = row
+    return sorted(latest.values(), key=lambda row: normalizeValue(row.get("created_at")), reverse=True)
+
+RPC_FUNCTIONS = {
+    "get_inbox_messages": getInboxMessages,
+}
+
+
+class MemorySupabaseTransport(httpx.BaseTransport):
+    """Answers /rest/v1, /auth/v1 and /storage/v1 requests from a MemoryStore."""
+
+    def __init__(self, store: MemoryStore):
+        self.store = store
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        path = unquote(request.url.path)
+        request.read()
+        try:
+            with self.store.lock:
+                if path.startswith("/rest/v1/"):
+                    return self._rest(request, path[len("/rest/v1/"):])
+                if path.startswith("/auth/v1/"):
+                    return self._auth(request, path[len("/auth/v1/"):])
+                if path.startswith("/storage/v1/"):
+                    return self._storage(request, path[len("/storage/v1/"):])
+            raise MemoryBackendError(404, "not_found", f"{path} is not served by the memory backend")
+        except MemoryBackendError as e:
+            return self._error(request, e)
+
+    # ---- PostgREST ----
+    def _rest(self, request: httpx.Request, resource: str) -> httpx.Response:
+        params = request.url.params
+        prefer = request.headers.get("Prefer", "")
+        body = json.loads(request.content) if request.content else None
+        if resource.startswith("rpc/"):
+            fn = RPC_FUNCTIONS.get(resource[len("rpc/"):])
+            if fn is None:
+                raise MemoryBackendError(404, "PGRST202", f"Could not find the function public.{resource[4:]}")
+            rows = fn(self.store, **(body or {}))
+            return self._rows(request, rows, params, prefer)
+
+        table = self.store.table(resource)
+        filters = [
+            Filter(name, value) for name, value in params.multi_items()
+            if name not in ("select", "order", "limit", "offset", "on_conflict", "columns")
+        ]
+        method = request.method
+        if method in ("GET", "HEAD"):
+            rows = table.find(filters)
+        elif method == "POST":
+            rows = self._insert(table, body, params, prefer)
+        elif method == "PATCH":
+            rows = [table.update(row, body or {}) for row in table.find(filters)]
+        elif method == "DELETE":
+            rows = table.find(filters)
+            for row in rows:
+                table.delete(row)
+        else:
+            raise MemoryBackendError(405, "PGRST000", f"{method} is not supported")
+
+        status = 201 if method == "POST" else 200
+        if "return=minimal" in prefer:
+            return httpx.Response(status, content=b"", request=request)
+        return self._rows(request, rows, params, prefer, status)
+
+    def _insert(self, table: MemoryTable, body, params, prefer: str) -> list:
+        records = body if isinstance(body, list) else [body or {}]
+        upsert = "resolution=merge-duplicates" in prefer
+        ignore = "resolution=ignore-duplicates" in prefer
+        conflict_columns = [c.strip() for c in params.get("on_conflict", "id").split(",") if c.strip()]
+        rows = []
+        for record in records:
+            existing = None
+            if (upsert or ignore) and all(record.get(c) is not None for c in conflict_columns):
+                matches = table.find([Filter(c, f"eq.{normalizeValue(record[c])}") for c in conflict_columns])
+                existing = matches[0] if matches else None
+            if existing is not None:
+                if upsert:
+                    rows.append(table.update(existing, record))
+                continue
+            rows.append(table.insert(record))
+        return rows
+
+    def _rows(self, request: httpx.Request, rows: list, params, prefer: str, status: int = 200) -> httpx.Response:
+        order = params.get("order")
+        if order:
+            rows = orderRows(rows, order)
+        total = len(rows)
+        offset = int(params.get("offset", 0))
+        limit = params.get("limit")
+        rows = rows[offset:offset + int(limit)] if limit is not None else rows[offset:]
+        rows = [projectRow(row, params.get("select", "*")) for row in rows]
+
+        headers = {"Content-Type": "application/json"}
+        if "count=" in prefer:
+            headers["Content-Range"] = f"{offset}-{offset + len(rows) - 1}/{total}" if rows else f"*/{total}"
+        if request.method == "HEAD":
+            return httpx.Response(status, headers=headers, request=request)
+        if request.headers.get("Accept") == SINGLE_OBJECT_ACCEPT:
+            if len(rows) != 1:
+                raise MemoryBackendError(
+                    406, "PGRST116", "JSON object requested, multiple (or no) rows returned",
+                    f"The result contains {len(rows)} rows"
+                )
+            return httpx.Response(status, content=json.dumps(rows[0]).encode(), headers=headers, request=request)
+        return httpx.Response(status, content=json.dumps(rows).encode(), headers=headers, request=request)
+
+    # ---- GoTrue ----
+    def _auth(self, request: httpx.Request, resource: str) -> httpx.Response:
+        body = json.loads(request.content) if request.content else {}
+        store = self.store
+        if resource == "signup" and request.method == "POST":
+            user = store.createUser(body.get("email", ""), body.get("password", ""), metadata=body.get("data"))
+            return self._json(request, store.issueSession(user["id"]))
+        if resource == "token":
+            grant_type = request.url.params.get("grant_type")
+            if grant_type == "password":
+                user_id = store.users_by_email.get((body.get("email") or "").strip().lower())
+                if user_id is None or store.users[user_id]["password"] != body.get("password"):
+                    raise MemoryBackendError(400, "invalid_credentials", "Invalid login credentials")
+                return self._json(request, store.issueSession(user_id))
+            if grant_type == "refresh_token":
+                user_id = store.refresh_tokens.pop(body.get("refresh_token"), None)
+                if user_id is None:
+                    raise MemoryBackendError(400, "refresh_token_not_found", "Invalid Refresh Token")
+                return self._json(request, store.issueSession(user_id))
+        if resource == "recover":
+            email = (body.get("email") or "").strip().lower()
+            if email in store.users_by_email:
+                store.recovery_codes[email] = f"{secrets.randbelow(10 ** 6):06d}"
+            return self._json(request, {})
+        if resource == "verify":
+            email = (body.get("email") or "").strip().lower()
+            if store.recovery_codes.get(email) != body.get("token"):
+                raise MemoryBackendError(403, "otp_expired", "Token has expired or is invalid")
+            del store.recovery_codes[email]
+            return self._json(request, store.issueSession(store.users_by_email[email]))
+        if resource == "user":
+            user_id = store.access_tokens.get(bearerToken(request))
+            if user_id is None:
+                raise MemoryBackendError(401, "bad_jwt", "invalid JWT")
+            entry = store.users[user_id]
+            if request.method == "PUT":
+                if body.get("password"):
+                    entry["password"] = body["password"]
+                if body.get("data"):
+                    entry["user"]["user_metadata"].update(body["data"])
+                entry["user"]["updated_at"] = nowIso()
+            return self._json(request, entry["user"])
+        if resource == "logout":
+            store.access_tokens.pop(bearerToken(request), None)
+            return httpx.Response(204, request=request)
+        raise MemoryBackendError(404, "not_found", f"auth/{resource} is not served by the memory backend")
+
+    # ---- Storage ----
+    def _storage(self, request: httpx.Request, resource: str) -> httpx.Response:
+        store = self.store
+        if resource == "bucket":
+            if request.method == "POST":
+                body = json.loads(request.content)
+                created_at = nowIso()
+                store.buckets[body["id"]] = {
+                    "id": body["id"], "name": body.get("name") or body["id"], "owner": "",
+                    "public": bool(body.get("public")), "created_at": created_at, "updated_at": created_at,
+                    "file_size_limit": body.get("file_size_limit"), "allowed_mime_types": body.get("allowed_mime_types"),
+                }
+                return self._json(request, {"name": body["id"]})
+            return self._json(request, list(store.buckets.values()))
+        if resource.startswith("object/list/"):
+            bucket = resource[len("object/list/"):]
+            prefix = (json.loads(request.content) or {}).get("prefix", "")
+            return self._json(request, [
+                {"name": key[len(prefix):].lstrip("/"), "id": meta["id"], "metadata": {"size": meta["size"]}}
+                for (bucket_id, key), meta in store.objects.items()
+                if bucket_id == bucket and key.startswith(prefix)
+            ])
+        if resource.startswith("object/"):
+            bucket, _, key = resource[len("object/"):].partition("/")
+            if request.method == "DELETE":
+                removed = []
+                for prefix in (json.loads(request.content) or {}).get("prefixes", []):
+                    meta = store.objects.pop((bucket, prefix), None)
+                    if meta is not None:
+                        removed.append({"name": prefix, "bucket_id": bucket, "id": meta["id"]})
+                return self._json(request, removed)
+            if request.method in ("POST", "PUT"):
+                exists = (bucket, key) in store.objects
+                if request.method == "POST" and exists and request.headers.get("x-upsert") != "true":
+                    raise MemoryBackendError(400, "Duplicate", "The resource already exists")
+                store.objects[(bucket, key)] = {"id": str(uuid.uuid4()), "size": len(request.content), "updated_at": nowIso()}
+                return self._json(request, {"Key": f"{bucket}/{key}", "Id": store.objects[(bucket, key)]["id"]})
+        raise MemoryBackendError(404, "not_found", f"storage/{resource} is not served by the memory backend")
+
+    # ---- helpers ----
+    @staticmethod
+    def _json(request: httpx.Request, payload, status: int = 200) -> httpx.Response:
+        return httpx.Response(status, content=json.dumps(payload).encode(), headers={"Content-Type": "application/json"}, request=request)
+
+    def _error(self, request: httpx.Request, e: MemoryBackendError) -> httpx.Response:
+        path = request.url.path
+        if "/auth/v1/" in path:
+            payload = {"code": e.status, "error_code": e.code, "msg": e.message}
+        elif "/storage/v1/" in path:
+            payload = {"statusCode": str(e.status), "error": e.code, "message": e.message}
+        else:
+            payload = {"code": e.code, "message": e.message, "details": e.details, "hint": None}
+        return self._json(request, payload, e.status)
+
+def bearerToken(request: httpx.Request) -> str:
+    return request.headers.get("Authorization", "").replace("Bearer ", "", 1)
+
+def projectRow(row: dict, select: str) -> dict:
+    columns = [column.strip() for column in select.split(",") if column.strip()]
+    if not columns or "*" in columns:
+        return dict(row)
+    return {column: row.get(column) for column in columns}
+
+def orderRows(rows: list, order: str) -> list:
+    # postgres defaults: nulls last when ascending, nulls first when descending
+    for term in reversed(order.split(",")):
+        parts = term.split(".")
+        column = parts[0]
+        desc = "desc" in parts[1:]
+        nulls_first = "nullsfirst" in parts[1:] or (desc and "nullslast" not in parts[1:])
+        present = [row for row in rows if row.get(column) is not None]
+        missing = [row for row in rows if row.get(column) is None]
+        present.sort(key=lambda row: sortValue(row.get(column)), reverse=desc)
+        rows = missing + present if nulls_first else present + missing
+    return rows
+
+def sortValue(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value, "")
+    return (1, 0, normalizeValue(value))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+def getMemoryStore() -> MemoryStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = MemoryStore()
+            if MEMORY_BACKEND_SEED:
+                with open(MEMORY_BACKEND_SEED, encoding="utf-8") as f:
+                    _store.seed(json.load(f))
+    return _store
+
+def getMemoryTransport() -> MemorySupabaseTransport:
+    return MemorySupabaseTransport(getMemoryStore())
+
+
+class MemoryPostgrestClient(SyncPostgrestClient):
+    def create_session(self, base_url, headers, timeout, verify=True, proxy=None):
+        return PostgrestHttpClient(base_url=base_url, headers=headers, timeout=timeout, follow_redirects=True, transport=getMemoryTransport())
+
+class MemoryStorageClient(SyncStorageClient):
+    def _create_session(self, base_url, headers, timeout, verify=True, proxy=None):
+        return StorageHttpClient(base_url=base_url, headers=headers, timeout=timeout, follow_redirects=True, transport=getMemoryTransport())
+
+class MemorySupabaseClient(SupabaseSyncClient):
+    # supabase client whose postgrest, auth and storage sub-clients all talk to the memory store
+
+    @staticmethod
+    def _init_postgrest_client(rest_url, headers, schema, timeout, verify=True, proxy=None):
+        return MemoryPostgrestClient(rest_url, headers=headers, schema=schema, timeout=timeout)
+
+    @staticmethod
+    def _init_storage_client(storage_url, headers, storage_client_timeout=20, verify=True, proxy=None):
+        return MemoryStorageClient(storage_url, headers, storage_client_timeout)
+
+    @staticmethod
+    def _init_supabase_auth_client(auth_url, client_options, verify=True, proxy=None):
+        return SyncSupabaseAuthClient(
+            url=auth_url,
+            auto_refresh_token=False,
+            persist_session=client_options.persist_session,
+            storage=client_options.storage,
+            headers=client_options.headers,
+            flow_type=client_options.flow_type,
+            http_client=GoTrueHttpClient(follow_redirects=True, transport=getMemoryTransport()),
+        )
+
+def createMemoryClient(supabase_key: str = MEMORY_SUPABASE_KEY) -> MemorySupabaseClient:
+    return MemorySupabaseClient.create(MEMORY_SUPABASE_URL, supabase_key, ClientOptions(storage=SyncMemoryStorage()))
@@ -2,11 +2,13 @@ from datetime import datetime
 from datetime import date
 from unittest import skip
 from utils.general.service import getSupabaseServiceClient
+from utils.database.service import runQuery
+from utils.projection.service import getColumns
 
 
-supabase = getSupabaseServiceClient()
 async def getInboxMessages(user_id):
-    result = supabase.rpc("get_inbox_messages", {"uid": user_id}).execute()
+    supabase = getSupabaseServiceClient()
+    result = await runQuery(supabase.rpc("get_inbox_messages", {"uid": user_id}))
 
     return result.data
 
@@ -19,19 +21,25 @@ async def getJobDetails(raw_messages):
         return []
 
     # Query the jobs table for matching job_ids
-    result = (
+    supabase = getSupabaseServiceClient()
+    result = await runQuery(
         supabase.table("jobs")
-        .select("*")
+        .select(getColumns("job_ref"))
         .in_("id", job_ids)
-        .execute()
     )
 
     return result.data
 
 async def getApplicationStatus(job_details, user_id):
-    statuses = []
-    for job_detail in job_details:
-        job_id = job_detail["id"]
-        status = supabase.table("job_applications").select("status").eq("job_id", job_id).eq("user_id", user_id).execute()
-        statuses.append(status.data)
-    return statuses
\ No newline at end of file
+    # one in_() query for every job instead of one per job, returned in job_details order
+    job_ids = [job_detail["id"] for job_detail in job_details]
+    if not job_ids:
+        return []
+    supabase = getSupabaseServiceClient()
+    result = await runQuery(
+        supabase.table("job_applications").select("job_id, status").eq("user_id", user_id).in_("job_id", job_ids)
+    )
+    by_job = {}
+    for row in result.data or []:
+        by_job.setdefault(str(row["job_id"]), []).append({"status": row["status"]})
+    return [by_job.get(str(job_id), []) for job_id in job_ids]
\ No newline at end of file
@@ -0,0 +1,177 @@
+# in-process metrics, exposed in Prometheus text format on /metrics
+import threading
+import time
+from contextlib import contextmanager, asynccontextmanager
+from contextvars import ContextVar
+
+# seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+POSTGREST_OPERATIONS = {
+    "GET": "select",
+    "HEAD": "count",
+    "POST": "insert",
+    "PATCH": "update",
+    "DELETE": "delete",
+}
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, label_names: tuple):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.values = {}
+
+    def inc(self, labels: tuple, amount: float = 1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{formatLabels(self.label_names, labels)} {formatValue(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, label_names: tuple, buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self.values = {}
+
+    def observe(self, labels: tuple, value: float):
+        series = self.values.get(labels)
+        if series is None:
+            series = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            self.values[labels] = series
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series["buckets"][i] += 1
+        series["sum"] += value
+        series["count"] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self.values.items()):
+            for bound, count in zip(self.buckets, series["buckets"]):
+                lines.append(f"{self.name}_bucket{formatLabels(self.label_names + ('le',), labels + (formatValue(bound),))} {count}")
+            lines.append(f"{self.name}_bucket{formatLabels(self.label_names + ('le',), labels + ('+Inf',))} {series['count']}")
+            lines.append(f"{self.name}_sum{formatLabels(self.label_names, labels)} {formatValue(series['sum'])}")
+            lines.append(f"{self.name}_count{formatLabels(self.label_names, labels)} {series['count']}")
+        return lines
+
+
+def formatLabels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+def formatValue(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+_lock = threading.Lock()
+
+http_requests_total = Counter(
+    "http_requests_total", "HTTP requests handled, by route, method and status.", ("route", "method", "status")
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route.", ("route", "method")
+)
+http_request_db_queries = Histogram(
+    "http_request_db_queries", "Supabase queries issued per HTTP request, by route.", ("route", "method"), QUERY_COUNT_BUCKETS
+)
+external_calls_total = Counter(
+    "external_calls_total", "Calls to backing services, by service, target and operation.", ("service", "target", "operation", "outcome")
+)
+external_call_duration = Histogram(
+    "external_call_duration_seconds", "Latency of calls to backing services.", ("service", "target", "operation")
+)
+
+ALL_METRICS = (http_requests_total, http_request_duration, http_request_db_queries, external_calls_total, external_call_duration)
+
+
+class RequestStats:
+    # per-request counters, shared with the handler through a context variable
+    def __init__(self):
+        self.db_queries = 0
+        self.query_shapes = {}
+
+    def recordQueryShape(self, shape: tuple):
+        self.query_shapes[shape] = self.query_shapes.get(shape, 0) + 1
+
+_request_stats: ContextVar = ContextVar("request_stats", default=None)
+
+def startRequestStats() -> RequestStats:
+    stats = RequestStats()
+    _request_stats.set(stats)
+    return stats
+
+def getRequestStats():
+    return _request_stats.get()
+
+
+def observeRequest(route: str, method: str, status: int, duration: float, stats: RequestStats = None):
+    with _lock:
+        http_requests_total.inc((route, method, str(status)))
+        http_request_duration.observe((route, method), duration)
+        if stats is not None:
+            http_request_db_queries.observe((route, method), stats.db_queries)
+
+def observeCall(service: str, target: str, operation: str, duration: float, ok: bool = True):
+    with _lock:
+        external_calls_total.inc((service, target, operation, "ok" if ok else "error"))
+        external_call_duration.observe((service, target, operation), duration)
+
+def describeQuery(query):
+    # (table, operation) for a postgrest request builder, e.g. ("jobs", "select") or ("get_inbox_messages", "rpc")
+    path = getattr(query, "path", "") or ""
+    if path.startswith("/rpc/"):
+        return path[len("/rpc/"):], "rpc"
+    method = getattr(query, "http_method", "") or ""
+    return path.lstrip("/") or "unknown", POSTGREST_OPERATIONS.get(method.upper(), method.lower() or "unknown")
+
+@contextmanager
+def trackCall(service: str, target: str, operation: str):
+    # time a blocking call to a backing service
+    start = time.perf_counter()
+    ok = False
+    try:
+        yield
+        ok = True
+    finally:
+        observeCall(service, target, operation, time.perf_counter() - start, ok)
+
+@asynccontextmanager
+async def trackAsyncCall(service: str, target: str, operation: str):
+    # same as trackCall, for code that awaits inside the block
+    start = time.perf_counter()
+    ok = False
+    try:
+        yield
+        ok = True
+    finally:
+        observeCall(service, target, operation, time.perf_counter() - start, ok)
+
+def getQueryTotals() -> tuple:
+    # (requests, db queries) observed so far across every route
+    with _lock:
+        requests = sum(series["count"] for series in http_request_db_queries.values.values())
+        queries = sum(series["sum"] for series in http_request_db_queries.values.values())
+    return requests, queries
+
+def renderMetrics() -> str:
+    with _lock:
+        lines = []
+        for metric in ALL_METRICS:
+            lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,24 @@
+# offline build of the /jobs/{id}/similar MinHash index
+#
+#   python -m utils.minhash.build
+#
+# Workers never rebuild inside a request: a missing or expired index starts a
+# background rebuild, so running this after a deploy or a bulk import means the
+# first lookups already have every job to compare against.
+import asyncio
+import sys
+
+from utils.general.service import getSupabaseServiceClient
+from utils.minhash.service import lockedRebuild
+
+
+def main():
+    indexed = asyncio.run(lockedRebuild(getSupabaseServiceClient()))
+    if indexed is None:
+        print("⚠️ Another instance is rebuilding the MinHash index, try again when it finishes")
+        return 1
+    print(f"✅ {indexed} jobs indexed for similar-job lookups")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
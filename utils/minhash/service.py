@@ -0,0 +1,279 @@
+# MinHash / LSH index of job postings for /jobs/{id}/similar
+# Each job gets a MinHash signature in two halves: one over its skills and one over
+# word shingles of its title and description. Two jobs' similarity is the mean of the
+# two Jaccard estimates. Both halves are cut into LSH bands, and each band value is a
+# redis set of the job ids that share it, so a lookup reads SKILL_BANDS + TEXT_BANDS
+# sets and only compares the jobs found there instead of every job. The text bands
+# are also kept per employer, so createJob can check a new post against just that
+# employer's jobs. Job writes keep it current. When the index is missing or older than
+# MINHASH_INDEX_TTL a rebuild starts in the background, never inside a request, and
+# lookups answer from whatever is indexed meanwhile (python -m utils.minhash.build
+# builds it offline).
+import asyncio
+import base64
+import json
+import os
+import re
+import uuid
+import zlib
+
+from utils.database.service import runQuery
+from utils.redis_server.redis_client import redis, runPipeline
+from utils.skillindex.service import getJobSkills, jobIdSortKey, syncIndex
+from utils.startup.service import lazyImport
+
+BAND_PREFIX = "job_minhash:band:"  # set of job ids per band value
+EMPLOYER_BAND_PREFIX = "job_minhash:employer:"  # set of job ids per employer and text band value
+JOB_BANDS_KEY = "job_minhash:bands"  # hash: job id -> json list of its band keys
+SIGNATURES_KEY = "job_minhash:jobs"  # hash: job id -> json {"user_id", "pwd_friendly", "signature"}
+READY_KEY = "job_minhash:ready:2"  # versioned, so a layout change forces a rebuild
+REBUILD_LOCK_KEY = "job_minhash:rebuilding"  # held by the one instance rebuilding, SET NX
+WRITTEN_KEY = "job_minhash:written"  # job ids written since the running rebuild started
+MINHASH_INDEX_TTL = int(os.getenv("MINHASH_INDEX_TTL", "86400"))
+REBUILD_LOCK_TTL = int(os.getenv("MINHASH_REBUILD_LOCK_TTL", "900"))
+SIMILAR_JOBS_MIN_SCORE = float(os.getenv("SIMILAR_JOBS_MIN_SCORE", "0.2"))
+DUPLICATE_JOB_THRESHOLD = float(os.getenv("DUPLICATE_JOB_THRESHOLD", "0.8"))
+
+# 2 rows per skill band: jobs sharing about a quarter of their skills meet in a band,
+# 4 rows per text band: descriptions need about 60% of their shingles in common
+SKILL_PERMUTATIONS, SKILL_BANDS = 32, 16
+TEXT_PERMUTATIONS, TEXT_BANDS = 32, 8
+SHINGLE_SIZE = 2
+PRIME = 4294967291  # largest prime below 2**32, so hash values fit in uint32
+EMPTY = PRIME  # never a hash value, fills the half of a job without skills or text
+
+REBUILD_PAGE_SIZE = 1000
+INDEX_COLUMNS = "id, user_id, title, job_description, skill_1, skill_2, skill_3, skill_4, skill_5, pwd_friendly"
+
+_permutations = None
+_rebuild_task = None
+
+
+def getPermutations():
+    # (multipliers, offsets) of every hash function, drawn on first use so importing stays cheap;
+    # fixed seed: every instance and every rebuild has to hash the same way
+    global _permutations
+    if _permutations is None:
+        np = lazyImport("numpy")
+        random = np.random.RandomState(20240605)
+        multipliers = random.randint(1, PRIME, size=SKILL_PERMUTATIONS + TEXT_PERMUTATIONS).astype(np.uint64)
+        offsets = random.randint(0, PRIME, size=SKILL_PERMUTATIONS + TEXT_PERMUTATIONS).astype(np.uint64)
+        _permutations = (multipliers, offsets)
+    return _permutations
+
+def textShingles(job: dict) -> set:
+    words = re.findall(r"[a-z0-9]+", f"{job.get('title') or ''} {job.get('job_description') or ''}".lower())
+    if len(words) < SHINGLE_SIZE:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+def minHash(tokens: set, multipliers, offsets):
+    np = lazyImport("numpy")
+    if not tokens:
+        return np.full(len(multipliers), EMPTY, dtype=np.uint32)
+    values = np.fromiter((zlib.crc32(token.encode()) for token in tokens), dtype=np.uint64, count=len(tokens))
+    # (a * x + b) mod p for every token and permutation, a and x below 2**32 so nothing overflows
+    hashes = (np.outer(values, multipliers) % PRIME + offsets) % PRIME
+    return hashes.min(axis=0).astype(np.uint32)
+
+def jobSignature(job: dict):
+    np = lazyImport("numpy")
+    multipliers, offsets = getPermutations()
+    return np.concatenate((
+        minHash(getJobSkills(job), multipliers[:SKILL_PERMUTATIONS], offsets[:SKILL_PERMUTATIONS]),
+        minHash(textShingles(job), multipliers[SKILL_PERMUTATIONS:], offsets[SKILL_PERMUTATIONS:]),
+    ))
+
+def encodeSignature(signature) -> str:
+    return base64.b64encode(signature.astype("<u4").tobytes()).decode()
+
+def decodeSignature(encoded: str):
+    np = lazyImport("numpy")
+    return np.frombuffer(base64.b64decode(encoded), dtype="<u4").astype(np.uint32)
+
+def bandKeys(signature) -> set:
+    np = lazyImport("numpy")
+    keys = set()
+    halves = (("s", signature[:SKILL_PERMUTATIONS], SKILL_BANDS), ("t", signature[SKILL_PERMUTATIONS:], TEXT_BANDS))
+    for name, half, bands in halves:
+        if half[0] == EMPTY:
+            continue
+        for band, rows in enumerate(np.split(half, bands)):
+            keys.add(f"{BAND_PREFIX}{name}{band}:{rows.tobytes().hex()}")
+    return keys
+
+def employerBandKeys(signature, user_id) -> set:
+    np = lazyImport("numpy")
+    text = signature[SKILL_PERMUTATIONS:]
+    if not user_id or text[0] == EMPTY:
+        return set()
+    return {f"{EMPLOYER_BAND_PREFIX}{user_id}:t{band}:{rows.tobytes().hex()}" for band, rows in enumerate(np.split(text, TEXT_BANDS))}
+
+def jobBandKeys(job: dict, signature) -> set:
+    return bandKeys(signature) | employerBandKeys(signature, job.get("user_id"))
+
+def estimateSimilarities(signature, others):
+    # mean of the skill and text Jaccard estimates against each row of others,
+    # a half missing on both jobs is left out instead of counting as a match
+    np = lazyImport("numpy")
+    estimates, weights = np.zeros(len(others)), np.zeros(len(others))
+    for part in (slice(0, SKILL_PERMUTATIONS), slice(SKILL_PERMUTATIONS, None)):
+        present = (others[:, part][:, 0] != EMPTY) | (signature[part][0] != EMPTY)
+        estimates += np.where(present, (others[:, part] == signature[part]).mean(axis=1), 0.0)
+        weights += present
+    return np.divide(estimates, weights, out=np.zeros(len(others)), where=weights > 0)
+
+def signatureEntry(job: dict, signature) -> str:
+    return json.dumps({
+        "user_id": job.get("user_id"),
+        "pwd_friendly": bool(job.get("pwd_friendly")),
+        "signature": encodeSignature(signature),
+    })
+
+async def getIndexedBands(job_id: str) -> set:
+    previous = await redis.hget(JOB_BANDS_KEY, job_id)
+    return set(json.loads(previous)) if previous else set()
+
+async def indexJobSignature(job: dict):
+    # (re)index one job row, a job with neither skills nor text is dropped from the index
+    job_id = str(job["id"])
+    signature = jobSignature(job)
+    keys = jobBandKeys(job, signature)
+    previous = await getIndexedBands(job_id)
+    # every band change in one round trip
+    pipe = redis.pipeline(transaction=False)
+    for key in previous - keys:
+        pipe.srem(key, job_id)
+    for key in keys - previous:
+        pipe.sadd(key, job_id)
+    if keys:
+        pipe.hset(JOB_BANDS_KEY, job_id, json.dumps(sorted(keys)))
+        pipe.hset(SIGNATURES_KEY, job_id, signatureEntry(job, signature))
+    else:
+        pipe.hdel(JOB_BANDS_KEY, job_id)
+        pipe.hdel(SIGNATURES_KEY, job_id)
+    markWritten(pipe, job_id)
+    await runPipeline(pipe)
+
+async def removeJobSignature(job_id):
+    job_id = str(job_id)
+    pipe = redis.pipeline(transaction=False)
+    for key in await getIndexedBands(job_id):
+        pipe.srem(key, job_id)
+    pipe.hdel(JOB_BANDS_KEY, job_id)
+    pipe.hdel(SIGNATURES_KEY, job_id)
+    markWritten(pipe, job_id)
+    await runPipeline(pipe)
+
+def markWritten(pipe, job_id: str):
+    # a running rebuild leaves these ids alone, its pages may predate the write;
+    # every rebuild clears the set when it starts, the expiry bounds it if rebuilds stop
+    pipe.sadd(WRITTEN_KEY, job_id)
+    pipe.expire(WRITTEN_KEY, 2 * MINHASH_INDEX_TTL)
+
+async def markMinHashIndexStale():
+    await redis.delete(READY_KEY)
+
+def signPage(jobs: list) -> list:
+    return [(job, jobSignature(job)) for job in jobs]
+
+async def rebuildMinHashIndex(supabase) -> int:
+    # reindex every job, touching only the band entries that changed, returns the number of indexed jobs;
+    # callers hold REBUILD_LOCK_KEY (see lockedRebuild), so only one instance scans the jobs table
+    await redis.delete(WRITTEN_KEY)
+    fresh, entries, last_id = {}, {}, 0
+    while True:
+        # keyset paging: jobs inserted or deleted mid-scan can't shift a page boundary
+        page = (await runQuery(
+            supabase.table("jobs").select(INDEX_COLUMNS).gt("id", last_id).order("id").limit(REBUILD_PAGE_SIZE)
+        )).data or []
+        if not page:
+            break
+        # hashing a page is a few ms of numpy, kept off the event loop
+        for job, signature in await asyncio.to_thread(signPage, page):
+            keys = jobBandKeys(job, signature)
+            if keys:
+                fresh[str(job["id"])] = keys
+                entries[str(job["id"])] = signatureEntry(job, signature)
+        last_id = page[-1]["id"]
+
+    # jobs written during the scan are already current, the pages read may be older than them
+    written = await redis.smembers(WRITTEN_KEY)
+    await syncIndex(JOB_BANDS_KEY, fresh, lambda keys: keys, keep=written)
+    stale = [job_id for job_id in await redis.hkeys(SIGNATURES_KEY) if job_id not in entries and job_id not in written]
+    if stale:
+        await redis.hdel(SIGNATURES_KEY, *stale)
+    items = [(job_id, entry) for job_id, entry in entries.items() if job_id not in written]
+    for i in range(0, len(items), REBUILD_PAGE_SIZE):
+        await redis.hset(SIGNATURES_KEY, mapping=dict(items[i:i + REBUILD_PAGE_SIZE]))
+    await redis.set(READY_KEY, "1", ex=MINHASH_INDEX_TTL)
+    return len(fresh)
+
+async def lockedRebuild(supabase):
+    # rebuild unless another instance already is, returns the number of indexed jobs or None when skipped
+    token = uuid.uuid4().hex
+    if not await redis.set(REBUILD_LOCK_KEY, token, nx=True, ex=REBUILD_LOCK_TTL):
+        return None
+    try:
+        return await rebuildMinHashIndex(supabase)
+    finally:
+        if await redis.get(REBUILD_LOCK_KEY) == token:
+            await redis.delete(REBUILD_LOCK_KEY)
+
+async def rebuildInBackground(supabase):
+    try:
+        await lockedRebuild(supabase)
+    except Exception as e:
+        print(f"⚠️ MinHash index rebuild failed: {e}")
+
+async def minHashIndexReady(supabase) -> bool:
+    # whether the index is built and fresh; if not, starts a background rebuild unless one is running
+    global _rebuild_task
+    if await redis.exists(READY_KEY):
+        return True
+    if _rebuild_task is None or _rebuild_task.done():
+        _rebuild_task = asyncio.create_task(rebuildInBackground(supabase))
+    return False
+
+async def scoreCandidates(signature, keys: set, own_id, min_similarity: float, accept=None) -> list:
+    # [(job id, estimated similarity)] of the jobs in the given band sets scoring at least min_similarity
+    if not keys:
+        return []
+    candidates = sorted((job_id for job_id in await redis.sunion(*sorted(keys)) if job_id != own_id), key=jobIdSortKey)
+    if not candidates:
+        return []
+
+    job_ids, signatures = [], []
+    for job_id, entry in zip(candidates, await redis.hmget(SIGNATURES_KEY, candidates)):
+        if entry is None:
+            continue
+        entry = json.loads(entry)
+        if accept is None or accept(entry):
+            job_ids.append(job_id)
+            signatures.append(decodeSignature(entry["signature"]))
+    if not job_ids:
+        return []
+    scores = estimateSimilarities(signature, lazyImport("numpy").stack(signatures))
+    return [(job_id, float(score)) for job_id, score in zip(job_ids, scores) if score >= min_similarity]
+
+async def findSimilarJobs(supabase, job: dict, min_similarity: float, accept=None) -> list:
+    # jobs sharing an LSH band with the job, the job itself left out; accept(entry) narrows the candidates.
+    # While a rebuild runs this answers from the bands already indexed, empty on a fresh deployment
+    await minHashIndexReady(supabase)
+    signature = jobSignature(job)
+    own_id = str(job["id"]) if job.get("id") is not None else None
+    return await scoreCandidates(signature, bandKeys(signature), own_id, min_similarity, accept)
+
+async def findDuplicateJob(supabase, job: dict, threshold: float = DUPLICATE_JOB_THRESHOLD):
+    # (job id, similarity) of the posting employer's closest job at or above threshold, or None;
+    # only that employer's text bands are read, so the candidates are a handful of their own posts.
+    # Like findSimilarJobs this answers from the bands already indexed while a rebuild runs,
+    # so it only finds nothing before the first build
+    await minHashIndexReady(supabase)
+    signature = jobSignature(job)
+    own_id = str(job["id"]) if job.get("id") is not None else None
+    matches = await scoreCandidates(
+        signature, employerBandKeys(signature, job.get("user_id")), own_id, threshold,
+        accept=lambda entry: entry["user_id"] == job.get("user_id"),
+    )
+    return min(matches, key=lambda match: (-match[1], jobIdSortKey(match[0])), default=None)
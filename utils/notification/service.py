@@ -1,5 +1,7 @@
 from utils.general.service import getSupabaseServiceClient
-import httpx
+from utils.database.service import runQuery
+from utils.metrics.service import trackAsyncCall
+from utils.startup.service import lazyImport
 
 #Send basic notification
 async def sendNotification(user_id: str, receiver_id: str, content: str, category: str):
@@ -48,7 +50,7 @@ async def sendNotification(user_id: str, receiver_id: str, content: str, categor
         # print(f"  category: {category}")
         # #
         
-        result = supabase.table("notifications").insert(notification_data).execute()
+        result = await runQuery(supabase.table("notifications").insert(notification_data))
         
         print(f"DEBUG - insert result: {result}")
         
@@ -65,7 +67,7 @@ async def getUserPushToken(user_id: str) -> str:
     """Get the active push token for a user from the database"""
     try:
         supabase = getSupabaseServiceClient()
-        response = supabase.table("push_tokens").select("expo_token").eq("user_id", user_id).eq("active", True).execute()
+        response = await runQuery(supabase.table("push_tokens").select("expo_token").eq("user_id", user_id).eq("active", True))
         
         if response.data and len(response.data) > 0:
             return response.data[0]["expo_token"]
@@ -88,15 +90,16 @@ async def sendPushNotification(expo_token: str, title: str, body: str, data: dic
         if data:
             notification_payload["data"] = data
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://exp.host/--/api/v2/push/send",
-                json=notification_payload,
-                headers={
-                    "Content-Type": "application/json",
-                    "Accept": "application/json"
-                }
-            )
+        async with lazyImport("httpx").AsyncClient() as client:
+            async with trackAsyncCall("expo", "push", "send"):
+                response = await client.post(
+                    "https://exp.host/--/api/v2/push/send",
+                    json=notification_payload,
+                    headers={
+                        "Content-Type": "application/json",
+                        "Accept": "application/json"
+                    }
+                )
             
             if response.status_code == 200:
                 result = response.json()
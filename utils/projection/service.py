@@ -0,0 +1,61 @@
+# column projections for hot queries
+# Each use case lists the columns its handlers actually read, so queries stop
+# pulling whole rows with select("*"). Projections behind client responses keep every
+# field the app renders, so trimming a query never changes a response shape.
+
+PROJECTIONS = {
+    # existence / ownership checks
+    "role_check": ["id", "user_id"],
+
+    # what the app needs to render a job in a list or recommendation card
+    "job_card": [
+        "id", "user_id", "title", "job_description", "company_name", "location", "job_type", "industry", "experience",
+        "skill_1", "skill_2", "skill_3", "skill_4", "skill_5",
+        "allowed_disabilities", "pwd_friendly", "fixed_salary", "min_salary", "max_salary", "created_at",
+    ],
+
+    # job title lookups for notifications and inbox rows
+    "job_ref": ["id", "user_id", "title"],
+
+    # candidate job fields used by the recommender
+    "reco_scoring": [
+        "id", "skill_1", "skill_2", "skill_3", "skill_4", "skill_5", "allowed_disabilities", "pwd_friendly",
+    ],
+
+    # employee card returned by /talent/search
+    "talent_card": [
+        "id", "user_id", "full_name", "disability", "skills", "skill_names", "address", "short_bio",
+        "resume_url", "profile_pic_url", "is_verified",
+    ],
+
+    # employee fields used by the recommender
+    "reco_user": ["id", "user_id", "skills", "skill_names", "disability", "short_bio"],
+
+    # employee copy stored on job_applications.applicant_details
+    "applicant_snapshot": [
+        "id", "user_id", "full_name", "email", "role", "disability", "skills", "address", "phone_number",
+        "short_bio", "resume_url", "profile_pic_url", "pwd_id_front_url", "pwd_id_back_url",
+        "sss_url", "philhealth_url", "pagibig_url", "is_verified", "created_at",
+    ],
+
+    # application fields needed to route a status change
+    "application_ref": ["id", "user_id", "job_id", "status"],
+
+    # employee fields needed for PWD ID verification
+    "pwd_verification": ["id", "user_id", "full_name", "pwd_id_front_url"],
+
+    # profile rows returned by /preload
+    "employee_profile": [
+        "id", "user_id", "full_name", "email", "role", "disability", "skills", "address", "phone_number",
+        "short_bio", "resume_url", "profile_pic_url", "pwd_id_front_url", "pwd_id_back_url",
+        "sss_url", "philhealth_url", "pagibig_url", "is_verified", "created_at",
+    ],
+    "employer_profile": [
+        "id", "user_id", "email", "role", "company_name", "company_level", "website_url", "company_type",
+        "industry", "admin_name", "logo_url", "description", "location", "tags", "created_at",
+    ],
+}
+
+def getColumns(use_case: str) -> str:
+    # select() string for a use case, raises KeyError for unknown use cases
+    return ", ".join(PROJECTIONS[use_case])
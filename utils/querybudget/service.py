@@ -0,0 +1,62 @@
+# per-request query budget and N+1 detection (development / staging)
+# QUERY_BUDGET_MODE:
+#   off   - nothing is recorded (production default)
+#   warn  - print a warning when a request goes over budget or repeats a query shape
+#   raise - raise QueryBudgetExceeded instead, so tests fail on new N+1 regressions
+import json
+import os
+
+QUERY_BUDGET_MODE = os.getenv("QUERY_BUDGET_MODE", "off").lower()
+QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", "10"))
+# same query shape this many times in one request is reported as a likely N+1
+QUERY_REPEAT_THRESHOLD = int(os.getenv("QUERY_REPEAT_THRESHOLD", "3"))
+# per-route overrides, e.g. {"/reco-jobs": 4, "/apply-job/{job_id}": 8}
+QUERY_BUDGET_ROUTES = json.loads(os.getenv("QUERY_BUDGET_ROUTES", "{}"))
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def isQueryBudgetEnabled() -> bool:
+    return QUERY_BUDGET_MODE in ("warn", "raise")
+
+def queryShape(query) -> tuple:
+    # table + operation + filter columns/operators, with the filter values stripped
+    path = getattr(query, "path", "") or ""
+    method = getattr(query, "http_method", "") or ""
+    method = str(getattr(method, "value", method)).upper()
+    params = getattr(query, "params", None)
+    filters = []
+    if params is not None:
+        for name, value in params.multi_items():
+            if name in ("select", "order", "limit", "offset", "on_conflict", "columns"):
+                filters.append(f"{name}={value}")
+            else:
+                filters.append(f"{name}={str(value).split('.', 1)[0]}")
+    return (method, path, tuple(sorted(filters)))
+
+def getRouteBudget(route: str) -> int:
+    return int(QUERY_BUDGET_ROUTES.get(route, QUERY_BUDGET))
+
+def checkQueryBudget(route: str, method: str, stats) -> list:
+    # list of problems found for one finished request
+    problems = []
+    budget = getRouteBudget(route)
+    if stats.db_queries > budget:
+        problems.append(f"{method} {route} ran {stats.db_queries} queries (budget {budget})")
+    for (query_method, path, filters), count in stats.query_shapes.items():
+        if count >= QUERY_REPEAT_THRESHOLD:
+            problems.append(f"{method} {route} repeated {query_method} {path} [{', '.join(filters)}] {count} times (possible N+1)")
+    return problems
+
+def enforceQueryBudget(route: str, method: str, stats):
+    if not isQueryBudgetEnabled() or stats is None:
+        return
+    problems = checkQueryBudget(route, method, stats)
+    if not problems:
+        return
+    if QUERY_BUDGET_MODE == "raise":
+        raise QueryBudgetExceeded("; ".join(problems))
+    for problem in problems:
+        print(f"⚠️ Query budget: {problem}")
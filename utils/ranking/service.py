@@ -0,0 +1,41 @@
+# top-k selection and cursor pagination for ranked (job id, score) lists
+# Order is score descending, then job id ascending, so ties always come out the same way.
+# The cursor is the rank key of the last item served, which keeps pages consistent when
+# jobs are added or removed between requests (nothing is skipped or repeated).
+import base64
+import heapq
+import json
+
+from utils.skillindex.service import jobIdSortKey
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def rankKey(job_id, score: float) -> tuple:
+    return (-score, jobIdSortKey(job_id))
+
+def encodeCursor(job_id, score: float) -> str:
+    payload = json.dumps({"id": str(job_id), "score": score}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decodeCursor(cursor: str) -> tuple:
+    # (job id, score) of the last item on the previous page, ValueError if malformed
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return str(payload["id"]), float(payload["score"])
+    except Exception as e:
+        raise ValueError("invalid cursor") from e
+
+def clampPageSize(limit) -> int:
+    return max(1, min(int(limit or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE))
+
+def selectPage(ranked, limit: int, cursor: str = None) -> tuple:
+    # ([(job id, score)] for the page, cursor of the next page or None), a heap keeps it O(n log k)
+    after = rankKey(*decodeCursor(cursor)) if cursor else None
+    candidates = ranked if after is None else (item for item in ranked if rankKey(*item) > after)
+    page = heapq.nsmallest(limit + 1, candidates, key=lambda item: rankKey(*item))
+    if len(page) <= limit:
+        return page, None
+    page = page[:limit]
+    return page, encodeCursor(*page[-1])
@@ -0,0 +1,230 @@
+# nightly batch precompute of the /reco-jobs cache
+#
+#   python -m utils.recocache.precompute --workers 8 --shards 64
+#   python -m utils.recocache.precompute --resume
+#
+# Loads every pwd-friendly job and every employee once, splits the employees into
+# shards by a hash of their user id, and scores each shard in a process pool with the
+# same pipeline as a /reco-jobs miss: sparse skill scoring with the 0.4 cut-off, minus
+# applied/skipped and disability-incompatible jobs, plus the collaborative filtering
+# and description boosts. Each finished shard is written to the reco cache in one
+# redis pipeline and marked done, so --resume after an interruption only scores the
+# shards that are left. Job writes that land while the run is going are replayed
+# from the job change log at the end.
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+from utils.collaborative.service import blendScores, getModelVersion
+from utils.database.service import runQuery
+from utils.general.service import getSupabaseServiceClient
+from utils.recocache.service import RECO_MIN_SCORE, getGeneration, patchManyJobRecommendations, storeManyRecommendations
+from utils.redis_server.redis_client import redis
+from utils.scoring.service import SKILL_COLUMNS, JobSkillMatrix
+from utils.skillindex.service import getJobDisabilities, getJobSkills, isCompatible, loadJobsByIds, parseDisabilities
+from utils.skillvocab.service import hasNormalizedSkills, readEmployeeSkills
+from utils.startup.service import loadEnvironment
+from utils.textindex.service import (
+    CHANGED_KEY, DESCRIPTION_WEIGHT, DescriptionIndex, blendSimilarity, getDescriptionIndex, getSequence, getTrimmedSequence,
+)
+
+loadEnvironment()
+
+# precomputed entries have to last until the morning peak, unlike the 1 h on-demand ones
+RECO_PRECOMPUTE_TTL = int(os.getenv("RECO_PRECOMPUTE_TTL", "43200"))
+RUN_KEY = "reco_precompute:run"  # json {"started_at", "shards", "generation", "model", "finished"}
+DONE_KEY = "reco_precompute:done"  # set of finished shard numbers of that run
+
+PAGE_SIZE = 1000
+
+_matrix = None
+_job_disabilities = None
+_descriptions = None
+
+
+def shardOf(user_id: str, shards: int) -> int:
+    return zlib.crc32(str(user_id).encode()) % shards
+
+async def fetchAll(supabase, table: str, columns: str, order=("id",), pwd_friendly=False) -> list:
+    rows, start = [], 0
+    while True:
+        query = supabase.table(table).select(columns)
+        if pwd_friendly:
+            query = query.eq("pwd_friendly", True)
+        for column in order:
+            query = query.order(column)
+        page = (await runQuery(query.range(start, start + PAGE_SIZE - 1))).data or []
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+        start += PAGE_SIZE
+
+async def loadExclusions(supabase) -> dict:
+    # user id -> job ids applied to or skipped, same sources as utils/exclusion
+    excluded = {}
+    for table, order in (("job_applications", ("id",)), ("declined_jobs", ("user_id", "job_id"))):
+        for row in await fetchAll(supabase, table, "user_id, job_id", order=order):
+            if row.get("user_id") and row.get("job_id") is not None:
+                excluded.setdefault(str(row["user_id"]), set()).add(str(row["job_id"]))
+    return excluded
+
+
+# ---- worker processes ----
+def initWorker(jobs: list, description_state):
+    # runs once per process: the job matrix and description index are shared by all its shards
+    global _matrix, _job_disabilities, _descriptions
+    _matrix = JobSkillMatrix(jobs)
+    _job_disabilities = {job["id"]: getJobDisabilities(job) for job in jobs}
+    _descriptions = DescriptionIndex(**description_state) if description_state else None
+
+def scoreShard(users: list) -> dict:
+    # users: [(user id, skills, bio, disabilities, excluded job ids)]
+    #   -> [(user id, skills, [(job id, rank score)], bio, disabilities)]
+    started = time.perf_counter()
+    ranked_sets = _matrix.rankMany([user[1] for user in users], RECO_MIN_SCORE)
+    results = []
+    for (user_id, skills, bio, disabilities, excluded), ranked in zip(users, ranked_sets):
+        ranked = [
+            (job_id, score) for job_id, score in ranked
+            if str(job_id) not in excluded and isCompatible(_job_disabilities[job_id], disabilities)
+        ]
+        ranked = blendScores(user_id, ranked)
+        if _descriptions is not None:
+            ranked = blendSimilarity(_descriptions, bio, ranked)
+        results.append((user_id, skills, ranked, bio, disabilities))
+    return {"results": results, "model": getModelVersion(), "seconds": time.perf_counter() - started}
+
+
+# ---- run state ----
+async def loadRun():
+    run = await redis.get(RUN_KEY)
+    return json.loads(run) if run else None
+
+async def startRun(shards: int, generation: str, model) -> dict:
+    run = {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "shards": shards,
+        "generation": generation,
+        "model": model,
+        "finished": False,
+    }
+    await redis.delete(DONE_KEY)
+    await redis.set(RUN_KEY, json.dumps(run))
+    return run
+
+async def replayJobChanges(supabase, since_seq: int, jobs: list) -> int:
+    # jobs written after the snapshot was loaded: patch every cache from the snapshot version to the current one
+    if since_seq < await getTrimmedSequence():
+        print("⚠️ The job change log was trimmed during the run, some job changes may be missing until the next run")
+    changed = await redis.zrangebyscore(CHANGED_KEY, since_seq + 1, "+inf")
+    if not changed:
+        return 0
+    snapshot = {str(job["id"]): job for job in jobs}
+    columns = "id, " + ", ".join(SKILL_COLUMNS) + ", allowed_disabilities, pwd_friendly"
+    current = {str(job["id"]): job for job in await loadJobsByIds(supabase, changed, columns)}
+    # every changed job in one pass: each cached user is read and rewritten once, in pipelined chunks
+    await patchManyJobRecommendations([
+        (current.get(job_id, {"id": job_id}), getJobSkills(snapshot[job_id]) if job_id in snapshot else set(), job_id not in current)
+        for job_id in changed
+    ])
+    return len(changed)
+
+async def precompute(supabase, workers: int, shards: int, ttl: int = RECO_PRECOMPUTE_TTL, resume: bool = False) -> dict:
+    run_started = time.perf_counter()
+    generation = await getGeneration()
+    model = getModelVersion()
+
+    run = await loadRun() if resume else None
+    if run and (run["finished"] or run["generation"] != generation or run["model"] != model):
+        # a finished run, or caches the previous run wrote that are no longer valid
+        print("⚠️ Nothing to resume, starting a new run")
+        run = None
+    if run is None:
+        run = await startRun(shards, generation, model)
+    shards = run["shards"]
+    done = {int(shard) for shard in await redis.smembers(DONE_KEY)}
+    pending = [shard for shard in range(shards) if shard not in done]
+    if done:
+        print(f"🔁 Resuming the run started {run['started_at']}: {len(done)}/{shards} shards already done")
+
+    # snapshot: everything below is scored against the jobs as of this sequence number
+    start_seq = await getSequence()
+    jobs = await fetchAll(supabase, "jobs", "id, " + ", ".join(SKILL_COLUMNS) + ", allowed_disabilities", pwd_friendly=True)
+    employee_columns = "id, user_id, skills, short_bio, disability" + (", skill_names" if await hasNormalizedSkills(supabase) else "")
+    employees = await fetchAll(supabase, "employee", employee_columns)
+    excluded = await loadExclusions(supabase)
+    description_state = None
+    if DESCRIPTION_WEIGHT > 0:
+        index = await getDescriptionIndex(supabase, fit_inline=True)
+        description_state = index.state() if index.vectorizer is not None else None
+    print(f"📥 {len(jobs)} jobs, {len(employees)} employees, {len(pending)} shards to score on {workers} workers")
+
+    shard_users = {shard: [] for shard in pending}
+    for employee in employees:
+        user_id = employee.get("user_id")
+        shard = shardOf(user_id, shards) if user_id else None
+        if shard in shard_users:
+            skills = sorted(await readEmployeeSkills(employee))
+            shard_users[shard].append((
+                user_id, skills, employee.get("short_bio") or "", parseDisabilities(employee.get("disability")),
+                excluded.get(str(user_id), set()),
+            ))
+
+    stats = {"users": 0, "recommendations": 0, "score_seconds": 0.0, "write_seconds": 0.0, "shards": []}
+    loop = asyncio.get_running_loop()
+    # spawn rather than fork: the parent already runs the supabase thread pool
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=initWorker, initargs=(jobs, description_state)) as pool:
+
+        async def runShard(shard: int):
+            scored = await loop.run_in_executor(pool, scoreShard, shard_users[shard])
+            if scored["model"] != model:
+                raise RuntimeError("the collaborative filtering model changed during the run, rerun with --resume")
+            write_started = time.perf_counter()
+            await storeManyRecommendations([
+                (user_id, set(skills), ranked, bio, disabilities) for user_id, skills, ranked, bio, disabilities in scored["results"]
+            ], ttl, generation)
+            await redis.sadd(DONE_KEY, str(shard))
+            write_seconds = time.perf_counter() - write_started
+            users = len(scored["results"])
+            recommendations = sum(len(result[2]) for result in scored["results"])
+            print(f"📦 shard {shard + 1}/{shards}: {users} users, {recommendations} recommendations, score {scored['seconds']:.2f} s, write {write_seconds:.2f} s")
+            stats["users"] += users
+            stats["recommendations"] += recommendations
+            stats["score_seconds"] += scored["seconds"]
+            stats["write_seconds"] += write_seconds
+            stats["shards"].append({"shard": shard, "users": users, "recommendations": recommendations, "score_seconds": scored["seconds"], "write_seconds": write_seconds})
+
+        await asyncio.gather(*(runShard(shard) for shard in pending))
+
+    stats["replayed_jobs"] = await replayJobChanges(supabase, start_seq, jobs)
+    run["finished"] = True
+    await redis.set(RUN_KEY, json.dumps(run))
+    stats["seconds"] = time.perf_counter() - run_started
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute /reco-jobs recommendations for every employee.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes (default: cpu count)")
+    parser.add_argument("--shards", type=int, default=64, help="employee shards, the unit of work and of resuming")
+    parser.add_argument("--ttl", type=int, default=RECO_PRECOMPUTE_TTL, help="cache lifetime in seconds (default: RECO_PRECOMPUTE_TTL)")
+    parser.add_argument("--resume", action="store_true", help="continue the last unfinished run")
+    args = parser.parse_args(argv)
+
+    stats = asyncio.run(precompute(getSupabaseServiceClient(), max(args.workers, 1), max(args.shards, 1), args.ttl, args.resume))
+    print(
+        f"✅ {stats['users']} users, {stats['recommendations']} recommendations in {stats['seconds']:.1f} s "
+        f"(score {stats['score_seconds']:.1f} s across workers, write {stats['write_seconds']:.1f} s, "
+        f"{stats['replayed_jobs']} job changes replayed)"
+    )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
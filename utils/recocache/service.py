@@ -0,0 +1,186 @@
+# per-user /reco-jobs cache
+# Each employee's recommendations live in a redis sorted set (job id -> rank score)
+# next to the skills they were computed from. /reco-jobs pages through it and only
+# recomputes on a miss. Job writes patch the sets of the users sharing a skill with the
+# job, in pipelined chunks after the response has gone out; a profile update drops that
+# user's cache, and a failed patch bumps a generation
+# number that turns every cache into a miss. RECO_CACHE_TTL bounds how long writes made
+# outside the API (or racing a recompute) can go unnoticed.
+import json
+import os
+
+from utils.collaborative.service import blendModelScores, blendScores, getActiveModel, getModelVersion
+from utils.general.service import getSupabaseServiceClient
+from utils.redis_server.redis_client import redis, runPipeline
+from utils.skillindex.service import getJobDisabilities, getJobSkills, isCompatible, loadJobsByIds
+from utils.textindex.service import DESCRIPTION_WEIGHT, blendDescriptionScores, blendSimilarity, getDescriptionIndex
+
+RECO_MIN_SCORE = 0.4
+RECO_CACHE_TTL = int(os.getenv("RECO_CACHE_TTL", "3600"))
+
+JOBS_PREFIX = "reco_cache:jobs:"  # sorted set per user: job id -> rank score
+USER_PREFIX = "reco_cache:user:"  # json {"skills", "bio", "disabilities", "generation", "model"}, present while the cache is valid
+SKILL_USERS_PREFIX = "reco_cache:skill_users:"  # set of cached users per skill, used to find who a job write affects
+GENERATION_KEY = "reco_cache:generation"
+
+PATCH_CHUNK_SIZE = 500  # cached users read and rewritten per pipeline by a job write
+
+
+def jobsKey(user_id: str) -> str:
+    return f"{JOBS_PREFIX}{user_id}"
+
+def userKey(user_id: str) -> str:
+    return f"{USER_PREFIX}{user_id}"
+
+def skillUsersKey(skill: str) -> str:
+    return f"{SKILL_USERS_PREFIX}{skill}"
+
+def matchScore(user_skills: set, job: dict) -> float:
+    # same formula as the scoring engine: matched skills / distinct job skills
+    job_skills = getJobSkills(job)
+    if not job_skills or not job.get("pwd_friendly"):
+        return 0
+    return len(user_skills & job_skills) / len(job_skills)
+
+def parseCacheEntry(entry, generation, model):
+    # the stored entry, or None when it is missing or written for another generation / model
+    if not entry:
+        return None
+    entry = json.loads(entry)
+    if entry.get("generation") != (generation or "0") or entry.get("model") != model:
+        return None
+    return entry
+
+async def getCacheEntry(user_id: str):
+    entry, generation = await redis.mget(userKey(user_id), GENERATION_KEY)
+    return parseCacheEntry(entry, generation, getModelVersion())
+
+async def rankScores(supabase, user_id: str, bio: str, ranked: list) -> list:
+    # [(job id, skill score)] -> [(job id, rank score)]: collaborative filtering, then description similarity
+    return await blendDescriptionScores(supabase, bio, blendScores(user_id, ranked))
+
+async def getCachedScores(user_id: str, user_skills: set, bio: str = "", disabilities=frozenset()):
+    # [(job id, rank score)] of the cached recommendations, or None on a miss
+    entry = await getCacheEntry(user_id)
+    if (
+        entry is None or set(entry["skills"]) != user_skills or entry.get("bio", "") != (bio or "")
+        or set(entry.get("disabilities", [])) != set(disabilities)
+    ):
+        return None
+    return await redis.zrange(jobsKey(user_id), 0, -1, withscores=True)
+
+async def storeRecommendations(user_id: str, user_skills: set, scores: list, bio: str = "", disabilities=frozenset()):
+    await storeManyRecommendations([(user_id, user_skills, scores, bio, disabilities)])
+
+async def getGeneration() -> str:
+    return await redis.get(GENERATION_KEY) or "0"
+
+async def storeManyRecommendations(results: list, ttl: int = RECO_CACHE_TTL, generation: str = None):
+    # [(user id, skills, [(job id, rank score)], bio, disabilities)] written in one pipeline; pass the generation
+    # read before the scores were computed so a markRecoCacheStale in between still turns them into misses
+    if generation is None:
+        generation = await getGeneration()
+    model = getModelVersion()
+    pipe = redis.pipeline(transaction=False)
+    for user_id, user_skills, scores, bio, disabilities in results:
+        pipe.delete(jobsKey(user_id))
+        if scores:
+            pipe.zadd(jobsKey(user_id), {str(job_id): score for job_id, score in scores})
+            pipe.expire(jobsKey(user_id), ttl)
+        for skill in user_skills:
+            pipe.sadd(skillUsersKey(skill), user_id)
+        entry = {
+            "skills": sorted(user_skills), "bio": bio or "", "disabilities": sorted(disabilities),
+            "generation": generation, "model": model,
+        }
+        pipe.set(userKey(user_id), json.dumps(entry), ex=ttl)
+    await runPipeline(pipe)
+
+def buildRecommendations(page: list, jobs_by_id: dict, user_skills: set) -> list:
+    # job rows for a page of (job id, rank score), shaped like the scoring engine's output
+    # plus match_score, the skill score blended with the collaborative filtering and description boosts
+    recommendations = []
+    for job_id, score in page:
+        job = jobs_by_id.get(str(job_id))
+        if job is None:
+            continue
+        job_copy = job.copy()
+        job_copy["skill_match_score"] = matchScore(user_skills, job)
+        job_copy["match_score"] = score
+        job_copy["matched_skills"] = sorted(getJobSkills(job) & user_skills)
+        recommendations.append(job_copy)
+    return recommendations
+
+async def loadJobRows(supabase, job_ids, columns: str) -> dict:
+    return {str(job["id"]): job for job in await loadJobsByIds(supabase, job_ids, columns)}
+
+async def invalidateUserRecommendations(user_id: str):
+    await redis.delete(userKey(user_id), jobsKey(user_id))
+
+async def patchJobRecommendations(job: dict, previous_skills: set = frozenset(), deleted: bool = False):
+    await patchManyJobRecommendations([(job, previous_skills, deleted)])
+
+async def patchManyJobRecommendations(changes: list):
+    # [(job row, skills it had before the write, deleted)]: rescore the written jobs for every cached user
+    # sharing a skill with their old or new version, one read and one write pipeline per chunk of users
+    written = []
+    for job, previous_skills, deleted in changes:
+        skills = set() if deleted else getJobSkills(job)
+        keys = sorted(skillUsersKey(skill) for skill in skills | set(previous_skills))
+        if keys:
+            written.append((str(job["id"]), job, deleted, set() if deleted else getJobDisabilities(job), keys))
+    if not written:
+        return
+    pipe = redis.pipeline(transaction=False)
+    for *_, keys in written:
+        pipe.sunion(*keys)
+    pipe.get(GENERATION_KEY)
+    *affected, generation = await runPipeline(pipe)
+    user_ids = sorted(set().union(*affected))
+    # the models rankScores would blend with, fetched once for the whole patch
+    cf_model = getActiveModel()
+    model = cf_model.version if cf_model is not None else None
+    descriptions = await getDescriptionIndex(getSupabaseServiceClient()) if DESCRIPTION_WEIGHT > 0 else None
+
+    for i in range(0, len(user_ids), PATCH_CHUNK_SIZE):
+        chunk = user_ids[i:i + PATCH_CHUNK_SIZE]
+        pipe = redis.pipeline(transaction=False)
+        for user_id in chunk:
+            pipe.get(userKey(user_id))
+            pipe.ttl(userKey(user_id))
+        replies = await runPipeline(pipe)
+
+        pipe = redis.pipeline(transaction=False)
+        stale = []
+        for user_id, entry, ttl in zip(chunk, replies[0::2], replies[1::2]):
+            entry = parseCacheEntry(entry, generation, model)
+            if entry is None:
+                # expired or stale cache, stop tracking the user until the next recompute
+                stale.append(user_id)
+                continue
+            user_skills = set(entry["skills"])
+            user_disabilities = set(entry.get("disabilities", []))
+            ranked = []
+            for (job_id, job, deleted, job_disabilities, _), users in zip(written, affected):
+                if user_id not in users:
+                    continue
+                score = matchScore(user_skills, job) if not deleted and isCompatible(job_disabilities, user_disabilities) else 0
+                if score >= RECO_MIN_SCORE:
+                    ranked.append((job_id, score))
+                else:
+                    pipe.zrem(jobsKey(user_id), job_id)
+            if ranked:
+                ranked = blendModelScores(cf_model, user_id, ranked)
+                if descriptions is not None:
+                    ranked = blendSimilarity(descriptions, entry.get("bio", ""), ranked)
+                pipe.zadd(jobsKey(user_id), dict(ranked))
+                if ttl > 0:
+                    pipe.expire(jobsKey(user_id), ttl)
+        if stale:
+            for key in sorted({key for *_, keys in written for key in keys}):
+                pipe.srem(key, *stale)
+        await runPipeline(pipe)
+
+async def markRecoCacheStale():
+    # every cached user misses on their next /reco-jobs call
+    await redis.incr(GENERATION_KEY)
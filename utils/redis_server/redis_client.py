@@ -1,12 +1,55 @@
-import redis.asyncio as aioredis
 import os
-from dotenv import load_dotenv
 
-load_dotenv()  # Load environment variables FIRST
+from utils.metrics.service import trackAsyncCall
+from utils.startup.service import lazyImport, loadEnvironment
+
+loadEnvironment()  # Load environment variables FIRST
 
 redis_host = os.getenv("REDIS_HOST")
 redis_password = os.getenv("REDIS_PASSWORD")
+# "upstash" (default) or "memory" for the in-process stand-in in utils/memory_backend
+REDIS_BACKEND = os.getenv("REDIS_BACKEND", "upstash").lower()
 
 REDIS_URL = f"rediss://:{redis_password}@{redis_host}:6379"
 
-redis = aioredis.from_url(REDIS_URL, decode_responses=True)
\ No newline at end of file
+
+class InstrumentedRedis:
+    # forwards every command to the real client and records its latency per command
+    # the client (and redis.asyncio itself) is only created on the first command
+    def __init__(self, factory):
+        self._factory = factory
+        self._client = None
+
+    def getClient(self):
+        if self._client is None:
+            self._client = self._factory()
+        return self._client
+
+    def __getattr__(self, name):
+        attr = getattr(self.getClient(), name)
+        if not callable(attr) or name.startswith("_") or name in ("pipeline", "pubsub", "lock"):
+            return attr
+
+        async def command(*args, **kwargs):
+            async with trackAsyncCall("redis", "redis", name):
+                return await attr(*args, **kwargs)
+        return command
+
+
+def createRedisClient():
+    if REDIS_BACKEND == "memory":
+        from utils.memory_backend.redis_client import MemoryRedis
+        return MemoryRedis()
+    aioredis = lazyImport("redis.asyncio")
+    return aioredis.from_url(REDIS_URL, decode_responses=True)
+
+
+redis = InstrumentedRedis(createRedisClient)
+
+def getRedisClient():
+    return redis.getClient()
+
+async def runPipeline(pipe):
+    # one round trip for every queued command, recorded as a single redis call
+    async with trackAsyncCall("redis", "redis", "pipeline"):
+        return await pipe.execute()
@@ -0,0 +1,148 @@
+# vectorized skill-match scoring
+# Skills are interned to integer ids and jobs are held as a sparse job x skill 0/1
+# matrix, so scoring one user (or a batch of users) is a single sparse product
+# divided by each job's skill count. The output matches calculateJobMatchScore in
+# utils/recomendation: same jobs, same skill_match_score, same matched_skills.
+from utils.startup.service import lazyImport
+
+SKILL_COLUMNS = tuple(f"skill_{i}" for i in range(1, 6))
+
+
+def normalizeSkill(skill) -> str:
+    return skill.strip().lower() if isinstance(skill, str) else ""
+
+
+class SkillVocabulary:
+    # skill name <-> integer id, shared by the job and user matrices
+    def __init__(self):
+        self.ids = {}
+        self.names = []
+
+    def __len__(self):
+        return len(self.names)
+
+    def intern(self, skill: str) -> int:
+        skill_id = self.ids.get(skill)
+        if skill_id is None:
+            skill_id = self.ids[skill] = len(self.names)
+            self.names.append(skill)
+        return skill_id
+
+    def internMany(self, skills) -> list:
+        # ids for already normalized skills, -1 for blanks
+        ids, intern = self.ids, self.intern
+        return [ids[skill] if skill in ids else (intern(skill) if skill else -1) for skill in skills]
+
+    def lookup(self, skills) -> list:
+        # ids of the known skills, unknown skills can't match any job so they are dropped
+        return sorted({self.ids[skill] for skill in map(normalizeSkill, skills) if skill in self.ids})
+
+
+class JobSkillMatrix:
+    def __init__(self, jobs, vocabulary: SkillVocabulary = None):
+        np = lazyImport("numpy")
+        sparse = lazyImport("scipy.sparse")
+
+        self.jobs = list(jobs)
+        self.vocabulary = vocabulary or SkillVocabulary()
+        # (jobs x 5) skill ids, -1 for blanks; sorting each row lines duplicates up next to each other
+        skills = [
+            skill.strip().lower() if isinstance(skill, str) else ""
+            for job in self.jobs for skill in map(job.get, SKILL_COLUMNS)
+        ]
+        codes = np.asarray(self.vocabulary.internMany(skills), dtype=np.int32).reshape(len(self.jobs), len(SKILL_COLUMNS))
+        codes.sort(axis=1)
+        keep = codes >= 0
+        keep[:, 1:] &= codes[:, 1:] != codes[:, :-1]
+        indptr = np.concatenate(([0], np.cumsum(keep.sum(axis=1)))).astype(np.int64)
+        indices = codes[keep]
+
+        self.matrix = sparse.csr_matrix(
+            (np.ones(len(indices)), indices, indptr),
+            shape=(len(self.jobs), max(len(self.vocabulary), 1)),
+        )
+        self.skill_counts = np.diff(self.matrix.indptr).astype(np.float64)
+
+    def userMatrix(self, skill_sets):
+        np = lazyImport("numpy")
+        sparse = lazyImport("scipy.sparse")
+
+        indptr, indices = [0], []
+        for skills in skill_sets:
+            indices.extend(self.vocabulary.lookup(skills))
+            indptr.append(len(indices))
+        return sparse.csr_matrix(
+            (np.ones(len(indices)), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(skill_sets), self.matrix.shape[1]),
+        )
+
+    def scoreUsers(self, skill_sets):
+        # users x jobs csr matrix of skill_match_score, zero scores are not stored
+        scores = (self.userMatrix(skill_sets) @ self.matrix.T).tocsr()
+        scores.data /= self.skill_counts[scores.indices]
+        scores.sort_indices()
+        return scores
+
+    def recommendMany(self, skill_sets, min_score: float = 0.0) -> list:
+        # one recommendation list per user, each shaped like calculateJobMatchScore's output;
+        # jobs scoring below min_score are dropped before any job dict is copied
+        np = lazyImport("numpy")
+
+        skill_sets = list(skill_sets)
+        users = self.userMatrix(skill_sets)
+        scores = self.scoreUsers(skill_sets)
+        names = np.asarray(self.vocabulary.names, dtype=object)
+        results = []
+        for row in range(len(skill_sets)):
+            start, end = scores.indptr[row], scores.indptr[row + 1]
+            job_indexes, job_scores = scores.indices[start:end], scores.data[start:end]
+            if min_score > 0:
+                keep = job_scores >= min_score
+                job_indexes, job_scores = job_indexes[keep], job_scores[keep]
+            # matched skills of every kept job at once: job rows masked by the user's skills
+            matched = self.matrix[job_indexes].multiply(users[row]).tocsr()
+            matched.sort_indices()
+            matched_names = names[matched.indices].tolist()
+            bounds = matched.indptr.tolist()
+            recommendations = []
+            for n, (job_index, score) in enumerate(zip(job_indexes.tolist(), job_scores.tolist())):
+                job_copy = self.jobs[job_index].copy()
+                job_copy["skill_match_score"] = score
+                job_copy["matched_skills"] = matched_names[bounds[n]:bounds[n + 1]]
+                recommendations.append(job_copy)
+            results.append(recommendations)
+        return results
+
+    def rankMany(self, skill_sets, min_score: float = 0.0) -> list:
+        # one [(job id, score)] list per user, without copying any job dict
+        skill_sets = list(skill_sets)
+        scores = self.scoreUsers(skill_sets)
+        job_ids = [job["id"] for job in self.jobs]
+        results = []
+        for row in range(len(skill_sets)):
+            start, end = scores.indptr[row], scores.indptr[row + 1]
+            job_indexes, job_scores = scores.indices[start:end], scores.data[start:end]
+            if min_score > 0:
+                keep = job_scores >= min_score
+                job_indexes, job_scores = job_indexes[keep], job_scores[keep]
+            results.append([(job_ids[i], score) for i, score in zip(job_indexes.tolist(), job_scores.tolist())])
+        return results
+
+    def rankJobs(self, user_skills_set, min_score: float = 0.0) -> list:
+        return self.rankMany([user_skills_set], min_score)[0]
+
+    def recommend(self, user_skills_set, min_score: float = 0.0) -> list:
+        return self.recommendMany([user_skills_set], min_score)[0]
+
+
+async def scoreJobMatches(user_skills_set, jobs_data, min_score: float = 0.0) -> list:
+    # drop-in for calculateJobMatchScore (plus the optional score cut-off)
+    if not jobs_data or not user_skills_set:
+        return []
+    return JobSkillMatrix(jobs_data).recommend(user_skills_set, min_score)
+
+async def rankJobMatches(user_skills_set, jobs_data, min_score: float = 0.0) -> list:
+    # (job id, skill_match_score) pairs, for callers that only materialize a page of jobs
+    if not jobs_data or not user_skills_set:
+        return []
+    return JobSkillMatrix(jobs_data).rankJobs(user_skills_set, min_score)
@@ -1,30 +1,135 @@
 import json
 from fastapi import Request, HTTPException
 
-from utils.redis_server.redis_client import redis
+from utils.redis_server.redis_client import redis, runPipeline
+from utils.general.service import getSupabaseServiceClient
+from utils.database.service import runQueries
 
-async def getAuthUserIdByToken(access_token):
+ROLE_TABLES = {
+    "employee": "employee",
+    "employer": "employers",
+}
+
+def userSessionsKey(auth_userID):
+    # set of access tokens currently issued to a user
+    return f"user_sessions:{auth_userID}"
+
+async def getSessionByToken(access_token):
     value = await redis.get(access_token)
     if value:
-        session_data = json.loads(value)
+        return json.loads(value)
+    return None
+
+async def getAuthUserIdByToken(access_token):
+    session_data = await getSessionByToken(access_token)
+    if session_data:
         return session_data.get("auth_userID")
     return None
 
-async def getAuthUserIdFromRequest(request: Request):
+def getAccessTokenFromRequest(request: Request):
     token = request.headers.get("Authorization")
     if not token or not token.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Missing or invalid token")
-    
-    access_token = token.split("Bearer ")[1]
-    
+
+    return token.split("Bearer ")[1]
+
+async def getAuthUserIdFromRequest(request: Request):
+    access_token = getAccessTokenFromRequest(request)
+
     auth_userID = await getAuthUserIdByToken(access_token)
     if not auth_userID:
         raise HTTPException(status_code=401, detail="Session not found in Redis")
-    
+
     return auth_userID
 
+async def resolveUserRole(auth_userID):
+    # look the user up in both profile tables, returns (role, profile_id); employer wins, as viewProfile always checked it first
+    supabase = getSupabaseServiceClient()
+    employer_check, employee_check = await runQueries(
+        supabase.table("employers").select("id").eq("user_id", auth_userID),
+        supabase.table("employee").select("id").eq("user_id", auth_userID)
+    )
+    if employer_check.data:
+        return "employer", employer_check.data[0].get("id")
+    if employee_check.data:
+        return "employee", employee_check.data[0].get("id")
+    return None, None
+
+async def getAuthSessionFromRequest(request: Request):
+    # session data (auth_userID, role, profile_id) for the caller, usable as a FastAPI dependency
+    cached = getattr(request.state, "auth_session", None)
+    if cached is not None:
+        return cached
+
+    access_token = getAccessTokenFromRequest(request)
+    session_data = await getSessionByToken(access_token)
+    if not session_data or not session_data.get("auth_userID"):
+        raise HTTPException(status_code=401, detail="Session not found in Redis")
+
+    # sessions written before roles were stored (or after an invalidation) are resolved once and written back
+    if not session_data.get("role"):
+        role, profile_id = await resolveUserRole(session_data["auth_userID"])
+        if role:
+            session_data["role"] = role
+            session_data["profile_id"] = profile_id
+            await rewriteSession(access_token, session_data)
+
+    request.state.auth_session = session_data
+    return session_data
+
+async def getAuthUserRoleFromRequest(request: Request):
+    session_data = await getAuthSessionFromRequest(request)
+    return session_data["auth_userID"], session_data.get("role")
+
+def requireRole(*roles):
+    # dependency factory: Depends(requireRole("employer")) rejects callers with any other role
+    async def dependency(request: Request):
+        session_data = await getAuthSessionFromRequest(request)
+        if session_data.get("role") not in roles:
+            raise HTTPException(status_code=403, detail=f"Only {' or '.join(roles)} accounts can access this resource")
+        return session_data
+    return dependency
+
 async def settingAuthUserToRedis(session_data, access_token):
-    return await redis.set(access_token, json.dumps(session_data), ex=None)
+    result = await redis.set(access_token, json.dumps(session_data), ex=None)
+    await redis.sadd(userSessionsKey(session_data["auth_userID"]), access_token)
+    await pruneUserSessions(session_data["auth_userID"])
+    return result
+
+async def rewriteSession(access_token, session_data):
+    # only rewrites a session that still exists (XX) and keeps its expiry (KEEPTTL),
+    # so a token logged out in the meantime is not brought back
+    return await redis.set(access_token, json.dumps(session_data), xx=True, keepttl=True)
+
+async def pruneUserSessions(auth_userID) -> dict:
+    # drops the tokens that expired or were deleted from the user's session set, returns the live ones' sessions
+    key = userSessionsKey(auth_userID)
+    access_tokens = list(await redis.smembers(key))
+    if not access_tokens:
+        return {}
+    pipe = redis.pipeline(transaction=False)
+    for access_token in access_tokens:
+        pipe.get(access_token)
+    values = await runPipeline(pipe)
+    dead = [access_token for access_token, value in zip(access_tokens, values) if not value]
+    if dead:
+        await redis.srem(key, *dead)
+    return {access_token: json.loads(value) for access_token, value in zip(access_tokens, values) if value}
+
+async def invalidateSessionRole(auth_userID):
+    # drop the cached role from every live session of the user, the next request resolves it again
+    sessions = await pruneUserSessions(auth_userID)
+    if not sessions:
+        return
+    pipe = redis.pipeline(transaction=False)
+    for access_token, session_data in sessions.items():
+        session_data.pop("role", None)
+        session_data.pop("profile_id", None)
+        pipe.set(access_token, json.dumps(session_data), xx=True, keepttl=True)
+    await runPipeline(pipe)
 
 async def deleteSessionRedis(access_token):
-    return await redis.delete(access_token)
\ No newline at end of file
+    session_data = await getSessionByToken(access_token)
+    if session_data and session_data.get("auth_userID"):
+        await redis.srem(userSessionsKey(session_data["auth_userID"]), access_token)
+    return await redis.delete(access_token)
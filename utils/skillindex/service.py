@@ -0,0 +1,224 @@
+# skill -> job id inverted index for /reco-jobs
+# Lives in redis so every instance shares it. Only pwd-friendly jobs are indexed,
+# which is the pool /reco-jobs recommends from. createJob / updateSpecificJob /
+# deleteJob keep it current; a full rebuild runs when the index is missing or older
+# than SKILL_INDEX_TTL, which also repairs drift from writes made outside the API.
+# Next to it, disability -> job id sets built from allowed_disabilities drop the
+# candidates an employee's disability doesn't fit before any row is fetched.
+import asyncio
+import json
+import os
+
+from utils.redis_server.redis_client import redis, runPipeline
+from utils.database.service import runQuery, runQueries
+
+SKILL_JOBS_PREFIX = "skill_index:skill:"  # set of job ids per normalized skill
+JOB_SKILLS_KEY = "skill_index:jobs"  # hash: job id -> json list of the skills it is indexed under
+DISABILITY_JOBS_PREFIX = "skill_index:disability:"  # set of job ids per normalized allowed disability
+OPEN_JOBS_KEY = "skill_index:open"  # indexed jobs without an allowed_disabilities list, open to everyone
+JOB_DISABILITIES_KEY = "skill_index:job_disabilities"  # hash: job id -> json list of its allowed disabilities
+READY_KEY = "skill_index:ready:2"  # versioned, so a layout change forces a rebuild
+SKILL_INDEX_TTL = int(os.getenv("SKILL_INDEX_TTL", "86400"))
+
+REBUILD_PAGE_SIZE = 1000  # postgrest's default max rows per request
+FETCH_CHUNK_SIZE = 200  # ids per in_() query, keeps the url short
+INDEX_COLUMNS = "id, skill_1, skill_2, skill_3, skill_4, skill_5, allowed_disabilities, pwd_friendly"
+
+_rebuild_lock = asyncio.Lock()
+
+
+def normalizeSkill(skill) -> str:
+    return skill.strip().lower() if isinstance(skill, str) else ""
+
+def getJobSkills(job: dict) -> set:
+    skills = {normalizeSkill(job.get(f"skill_{i}")) for i in range(1, 6)}
+    skills.discard("")
+    return skills
+
+def normalizeDisability(disability) -> str:
+    return disability.strip().lower() if isinstance(disability, str) else ""
+
+def parseDisabilities(value) -> set:
+    # an employee's disability or a job's allowed_disabilities: a list, a json list or comma separated text
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            value = value.split(",")
+        if isinstance(value, str):
+            value = [value]
+    if not isinstance(value, (list, tuple, set)):
+        return set()
+    disabilities = {normalizeDisability(disability) for disability in value}
+    disabilities -= {"", "none"}
+    return disabilities
+
+def getJobDisabilities(job: dict) -> set:
+    return parseDisabilities(job.get("allowed_disabilities"))
+
+def isCompatible(job_disabilities: set, user_disabilities: set) -> bool:
+    # a job without an allowed list takes anyone, and a user without a disability fits every job;
+    # otherwise the job has to allow each of the user's disabilities
+    return not job_disabilities or not user_disabilities or user_disabilities <= job_disabilities
+
+def skillKey(skill: str) -> str:
+    return f"{SKILL_JOBS_PREFIX}{skill}"
+
+def disabilityKey(disability: str) -> str:
+    return f"{DISABILITY_JOBS_PREFIX}{disability}"
+
+def disabilityKeys(disabilities: set) -> set:
+    return {disabilityKey(disability) for disability in disabilities} if disabilities else {OPEN_JOBS_KEY}
+
+def jobIdSortKey(job_id):
+    text = str(job_id)
+    return (0, int(text), "") if text.isdigit() else (1, 0, text)
+
+async def getIndexedSkills(job_id: str) -> set:
+    previous = await redis.hget(JOB_SKILLS_KEY, job_id)
+    return set(json.loads(previous)) if previous else set()
+
+async def getIndexedDisabilityKeys(job_id: str) -> set:
+    previous = await redis.hget(JOB_DISABILITIES_KEY, job_id)
+    return disabilityKeys(set(json.loads(previous))) if previous is not None else set()
+
+async def indexJob(job: dict):
+    # (re)index one job row, jobs that are not pwd-friendly are dropped from the index
+    job_id = str(job["id"])
+    skills = getJobSkills(job) if job.get("pwd_friendly") else set()
+    previous = await getIndexedSkills(job_id)
+    for skill in previous - skills:
+        await redis.srem(skillKey(skill), job_id)
+    for skill in skills - previous:
+        await redis.sadd(skillKey(skill), job_id)
+    if skills:
+        await redis.hset(JOB_SKILLS_KEY, job_id, json.dumps(sorted(skills)))
+    elif previous:
+        await redis.hdel(JOB_SKILLS_KEY, job_id)
+
+    # only jobs in the skill index can be candidates, so only they need disability entries
+    disabilities = getJobDisabilities(job)
+    keys = disabilityKeys(disabilities) if skills else set()
+    previous_keys = await getIndexedDisabilityKeys(job_id)
+    for key in previous_keys - keys:
+        await redis.srem(key, job_id)
+    for key in keys - previous_keys:
+        await redis.sadd(key, job_id)
+    if keys:
+        await redis.hset(JOB_DISABILITIES_KEY, job_id, json.dumps(sorted(disabilities)))
+    elif previous_keys:
+        await redis.hdel(JOB_DISABILITIES_KEY, job_id)
+
+async def removeJobFromIndex(job_id):
+    job_id = str(job_id)
+    for skill in await getIndexedSkills(job_id):
+        await redis.srem(skillKey(skill), job_id)
+    for key in await getIndexedDisabilityKeys(job_id):
+        await redis.srem(key, job_id)
+    await redis.hdel(JOB_SKILLS_KEY, job_id)
+    await redis.hdel(JOB_DISABILITIES_KEY, job_id)
+
+async def markSkillIndexStale():
+    # a failed incremental update forces a rebuild on the next lookup
+    await redis.delete(READY_KEY)
+
+async def syncIndex(hash_key: str, fresh: dict, keysOf, keep=()):
+    # bring an id -> json list hash, and the id sets keysOf(list) points at, in line with fresh (also used by
+    # utils/talentindex and utils/minhash); ids in keep were written after fresh was read and are left as they are
+    keep = set(keep)
+    fresh = {job_id: values for job_id, values in fresh.items() if job_id not in keep}
+    current = {job_id: set(json.loads(values)) for job_id, values in (await redis.hgetall(hash_key)).items() if job_id not in keep}
+    additions, removals = {}, {}
+    for job_id, values in fresh.items():
+        for key in keysOf(values) - (keysOf(current[job_id]) if job_id in current else set()):
+            additions.setdefault(key, []).append(job_id)
+    for job_id, values in current.items():
+        for key in keysOf(values) - (keysOf(fresh[job_id]) if job_id in fresh else set()):
+            removals.setdefault(key, []).append(job_id)
+
+    # queued REBUILD_PAGE_SIZE commands per pipeline instead of one round trip per set
+    commands = [("srem", key, job_ids) for key, job_ids in removals.items()]
+    commands += [("sadd", key, job_ids) for key, job_ids in additions.items()]
+    for i in range(0, len(commands), REBUILD_PAGE_SIZE):
+        pipe = redis.pipeline(transaction=False)
+        for command, key, job_ids in commands[i:i + REBUILD_PAGE_SIZE]:
+            getattr(pipe, command)(key, *job_ids)
+        await runPipeline(pipe)
+    stale_jobs = [job_id for job_id in current if job_id not in fresh]
+    if stale_jobs:
+        await redis.hdel(hash_key, *stale_jobs)
+    changed = {job_id: json.dumps(sorted(values)) for job_id, values in fresh.items() if current.get(job_id) != values}
+    items = list(changed.items())
+    for i in range(0, len(items), REBUILD_PAGE_SIZE):
+        await redis.hset(hash_key, mapping=dict(items[i:i + REBUILD_PAGE_SIZE]))
+
+async def rebuildSkillIndex(supabase) -> int:
+    # reindex every job, touching only the entries that changed, returns the number of indexed jobs
+    fresh, fresh_disabilities = {}, {}
+    start = 0
+    while True:
+        page = await runQuery(
+            supabase.table("jobs").select(INDEX_COLUMNS).eq("pwd_friendly", True)
+            .order("id").range(start, start + REBUILD_PAGE_SIZE - 1)
+        )
+        for job in page.data or []:
+            skills = getJobSkills(job)
+            if skills:
+                fresh[str(job["id"])] = skills
+                fresh_disabilities[str(job["id"])] = getJobDisabilities(job)
+        if len(page.data or []) < REBUILD_PAGE_SIZE:
+            break
+        start += REBUILD_PAGE_SIZE
+
+    await syncIndex(JOB_SKILLS_KEY, fresh, lambda skills: {skillKey(skill) for skill in skills})
+    await syncIndex(JOB_DISABILITIES_KEY, fresh_disabilities, disabilityKeys)
+    await redis.set(READY_KEY, "1", ex=SKILL_INDEX_TTL)
+    return len(fresh)
+
+async def ensureSkillIndex(supabase):
+    if await redis.exists(READY_KEY):
+        return
+    async with _rebuild_lock:
+        if not await redis.exists(READY_KEY):
+            await rebuildSkillIndex(supabase)
+
+async def filterCompatibleJobIds(job_ids, user_disabilities: set) -> list:
+    # the job ids that are open to everyone or allow every one of the user's disabilities, one round trip
+    job_ids = list(job_ids)
+    if not job_ids or not user_disabilities:
+        return job_ids
+    pipe = redis.pipeline(transaction=False)
+    pipe.smismember(OPEN_JOBS_KEY, job_ids)
+    for disability in sorted(user_disabilities):
+        pipe.smismember(disabilityKey(disability), job_ids)
+    open_flags, *allowed_flags = await runPipeline(pipe)
+    return [job_id for job_id, is_open, *allowed in zip(job_ids, open_flags, *allowed_flags) if is_open or all(allowed)]
+
+async def findCandidateJobIds(supabase, skills, disabilities=frozenset()) -> list:
+    # ids of pwd-friendly jobs that share at least one skill with the given skills
+    # and are compatible with the given (normalized) disabilities
+    await ensureSkillIndex(supabase)
+    keys = sorted({skillKey(skill) for skill in map(normalizeSkill, skills) if skill})
+    if not keys:
+        return []
+    job_ids = await filterCompatibleJobIds(await redis.sunion(*keys), disabilities)
+    return sorted(job_ids, key=jobIdSortKey)
+
+async def loadJobsByIds(supabase, job_ids, columns: str) -> list:
+    # pwd-friendly job rows for the given ids, fetched in id chunks and returned in id order
+    job_ids = list(job_ids)
+    if not job_ids:
+        return []
+    chunks = [job_ids[i:i + FETCH_CHUNK_SIZE] for i in range(0, len(job_ids), FETCH_CHUNK_SIZE)]
+    results = await runQueries(*(
+        supabase.table("jobs").select(columns).in_("id", chunk).eq("pwd_friendly", True)
+        for chunk in chunks
+    ))
+    jobs = [job for result in results for job in (result.data or [])]
+    jobs.sort(key=lambda job: jobIdSortKey(job["id"]))
+    return jobs
+
+async def loadCandidateJobs(supabase, skills, columns: str, exclude=(), disabilities=frozenset()) -> list:
+    # job rows for the candidates, in id order, minus the excluded job ids
+    job_ids = [job_id for job_id in await findCandidateJobIds(supabase, skills, disabilities) if job_id not in exclude]
+    return await loadJobsByIds(supabase, job_ids, columns)
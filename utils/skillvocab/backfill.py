@@ -0,0 +1,45 @@
+# one-off backfill of skill_names / skill_ids for employees who signed up before them
+#
+#   python -m utils.skillvocab.backfill
+#
+# Safe to rerun: it only touches rows whose skill_names is still null.
+import asyncio
+import sys
+
+from utils.database.service import runQuery
+from utils.general.service import getSupabaseServiceClient
+from utils.skillvocab.service import canonicalSkills, internSkills
+
+PAGE_SIZE = 500
+
+
+async def backfill(supabase) -> int:
+    updated, last_id = 0, 0
+    while True:
+        page = (await runQuery(
+            supabase.table("employee").select("id, user_id, skills").is_("skill_names", "null")
+            .gt("id", last_id).order("id").limit(PAGE_SIZE)
+        )).data or []
+        if not page:
+            return updated
+        names = {row["id"]: await canonicalSkills(row.get("skills", "[]")) for row in page}
+        # one vocabulary round trip per page instead of one per employee
+        vocabulary = sorted({name for row_names in names.values() for name in row_names})
+        ids = dict(zip(vocabulary, await internSkills(supabase, vocabulary)))
+        for row in page:
+            await runQuery(
+                supabase.table("employee")
+                .update({"skill_names": names[row["id"]], "skill_ids": [ids[name] for name in names[row["id"]]]}, returning="minimal")
+                .eq("id", row["id"])
+            )
+        updated += len(page)
+        last_id = page[-1]["id"]
+        print(f"📦 {updated} employees normalized")
+
+def main():
+    updated = asyncio.run(backfill(getSupabaseServiceClient()))
+    print(f"✅ {updated} employees backfilled")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+# employee skills normalized at write time
+# signUp and updateEmployeeProfile store the canonical form of the raw `skills` text
+# next to it, in the same insert / update: skill_names (sorted, lowercase, deduplicated)
+# and skill_ids, their ids in the shared skill_vocabulary table. The recommender reads
+# skill_names as is; rows written before the columns existed are still parsed from the
+# raw text. Until the migration has run, nothing selects or writes the new columns.
+from utils.database.service import runQuery
+from utils.projection.service import PROJECTIONS
+from utils.recomendation.service import parseSkills
+
+FETCH_CHUNK_SIZE = 200
+NORMALIZED_COLUMNS = ("skill_names", "skill_ids")
+UNDEFINED_COLUMN = "42703"  # postgres error code PostgREST passes on for a missing column
+
+_has_normalized_columns = None  # probed once per process
+
+
+async def canonicalSkills(skills_raw) -> list:
+    return sorted(skill for skill in await parseSkills(skills_raw) if skill)
+
+async def readEmployeeSkills(employee: dict) -> set:
+    # an employee row's skills as a set of normalized names
+    names = employee.get("skill_names")
+    if isinstance(names, list):
+        return set(names)
+    return await parseSkills(employee.get("skills", "[]"))
+
+async def lookupSkillIds(supabase, names) -> dict:
+    ids = {}
+    names = list(names)
+    for i in range(0, len(names), FETCH_CHUNK_SIZE):
+        result = await runQuery(supabase.table("skill_vocabulary").select("id, name").in_("name", names[i:i + FETCH_CHUNK_SIZE]))
+        ids.update({row["name"]: row["id"] for row in result.data or []})
+    return ids
+
+async def internSkills(supabase, names) -> list:
+    # ids of the given normalized names, adding the new ones to skill_vocabulary
+    ids = await lookupSkillIds(supabase, names)
+    missing = [name for name in names if name not in ids]
+    if missing:
+        # concurrent writers may add the same name, the unique key keeps one and the lookup below finds it
+        await runQuery(
+            supabase.table("skill_vocabulary")
+            .upsert([{"name": name} for name in missing], on_conflict="name", ignore_duplicates=True, returning="minimal")
+        )
+        ids.update(await lookupSkillIds(supabase, missing))
+    return [ids[name] for name in names]
+
+async def hasNormalizedSkills(supabase) -> bool:
+    # whether the employee table has skill_names / skill_ids yet; a failed probe other than
+    # a missing column is retried on the next call
+    global _has_normalized_columns
+    if _has_normalized_columns is None:
+        try:
+            await runQuery(supabase.table("employee").select(", ".join(NORMALIZED_COLUMNS)).limit(1))
+            _has_normalized_columns = True
+        except Exception as e:
+            if getattr(e, "code", None) != UNDEFINED_COLUMN:
+                raise
+            print("⚠️ employee.skill_names / skill_ids are missing, reading the raw skills until the migration runs")
+            _has_normalized_columns = False
+    return _has_normalized_columns
+
+async def employeeColumns(supabase, use_case: str) -> str:
+    # getColumns(use_case), minus the normalized skill columns on a database without them
+    columns = PROJECTIONS[use_case]
+    if not await hasNormalizedSkills(supabase):
+        columns = [column for column in columns if column not in NORMALIZED_COLUMNS]
+    return ", ".join(columns)
+
+async def normalizedSkillColumns(supabase, skills_raw) -> dict:
+    # skill_names / skill_ids for an employee insert or update payload, {} before the migration
+    if not await hasNormalizedSkills(supabase):
+        return {}
+    names = await canonicalSkills(skills_raw)
+    return {"skill_names": names, "skill_ids": await internSkills(supabase, names)}
+
+async def employeeSkillIds(supabase, employee: dict) -> list:
+    # skill_ids of an employee row, interned from the raw skills for rows written before normalization
+    skill_ids = employee.get("skill_ids")
+    if isinstance(skill_ids, list):
+        return skill_ids
+    return await internSkills(supabase, await canonicalSkills(employee.get("skills", "[]")))
@@ -0,0 +1,56 @@
+# cold start bookkeeping
+# Loads .env once per process, imports heavy SDKs (groq, supabase, redis) on first
+# use instead of at import time, and keeps the timings so a cold start can be
+# explained from /startup-stats. Keep this module free of heavy imports itself.
+import importlib
+import os
+import sys
+import threading
+import time
+
+_env_loaded = False
+_lock = threading.Lock()
+_import_timings = {}
+_lazy_timings = {}
+
+
+def loadEnvironment():
+    # one load_dotenv() per process, every module that reads env vars calls this first
+    global _env_loaded
+    if _env_loaded:
+        return
+    with _lock:
+        if not _env_loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _env_loaded = True
+
+def isEagerStartup() -> bool:
+    # STARTUP_MODE=eager loads every SDK and client at app startup (long-running servers),
+    # the default "lazy" keeps serverless cold starts short
+    loadEnvironment()
+    return os.getenv("STARTUP_MODE", "lazy").lower() == "eager"
+
+def lazyImport(module_name: str):
+    # import a heavy module on first use and remember how long it took
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    with _lock:
+        _lazy_timings.setdefault(module_name, time.perf_counter() - start)
+    return module
+
+def recordImportTime(name: str, seconds: float):
+    with _lock:
+        _import_timings[name] = seconds
+
+def getStartupStats() -> dict:
+    mode = "eager" if isEagerStartup() else "lazy"
+    with _lock:
+        return {
+            "mode": mode,
+            "import_ms": {name: round(seconds * 1000, 1) for name, seconds in _import_timings.items()},
+            "lazy_import_ms": {name: round(seconds * 1000, 1) for name, seconds in _lazy_timings.items()},
+        }
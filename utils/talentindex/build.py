@@ -0,0 +1,24 @@
+# offline build of the /talent/search index
+#
+#   python -m utils.talentindex.build
+#
+# Searches never rebuild inside a request: a missing or expired index starts a
+# background rebuild, so running this after the skill_vocabulary migration or a
+# bulk import means the first searches already see every employee.
+import asyncio
+import sys
+
+from utils.general.service import getSupabaseServiceClient
+from utils.talentindex.service import lockedRebuild
+
+
+def main():
+    indexed = asyncio.run(lockedRebuild(getSupabaseServiceClient()))
+    if indexed is None:
+        print("⚠️ Another instance is rebuilding the talent index, try again when it finishes")
+        return 1
+    print(f"✅ {indexed} employees indexed for talent search")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
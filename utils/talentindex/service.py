@@ -0,0 +1,160 @@
+# skill -> employee inverted index for /talent/search
+# Redis sets of user ids per skill id (from skill_vocabulary), per disability, plus
+# one set of verified employees. signUp, updateEmployeeProfile and the PWD ID check
+# reindex the one employee they wrote. When the index is missing or older than
+# TALENT_INDEX_TTL a rebuild starts in the background, never inside a search, and
+# searches answer from the sets already indexed meanwhile (python -m
+# utils.talentindex.build builds it offline). Searches only read the sets and then
+# fetch the employee rows of the page they return. Skill ids come from
+# skill_vocabulary, so nothing is indexed until that migration has run.
+import asyncio
+import json
+import os
+import uuid
+
+from utils.database.service import runQuery
+from utils.redis_server.redis_client import redis, runPipeline
+from utils.skillindex.service import parseDisabilities, syncIndex
+from utils.skillvocab.service import canonicalSkills, employeeSkillIds, hasNormalizedSkills, internSkills
+
+SKILL_USERS_PREFIX = "talent_index:skill:"  # set of user ids per skill id
+DISABILITY_USERS_PREFIX = "talent_index:disability:"  # set of user ids per normalized disability
+VERIFIED_KEY = "talent_index:verified"  # set of user ids with is_verified
+USER_KEYS_KEY = "talent_index:users"  # hash: user id -> json list of the sets above it is in
+READY_KEY = "talent_index:ready"
+REBUILD_LOCK_KEY = "talent_index:rebuilding"  # held by the one instance rebuilding, SET NX
+WRITTEN_KEY = "talent_index:written"  # user ids reindexed since the running rebuild started
+TALENT_INDEX_TTL = int(os.getenv("TALENT_INDEX_TTL", "86400"))
+REBUILD_LOCK_TTL = int(os.getenv("TALENT_REBUILD_LOCK_TTL", "900"))
+
+REBUILD_PAGE_SIZE = 1000
+INDEX_COLUMNS = "id, user_id, skills, skill_ids, disability, is_verified"
+
+_rebuild_task = None
+
+
+def skillUsersKey(skill_id) -> str:
+    return f"{SKILL_USERS_PREFIX}{skill_id}"
+
+def disabilityUsersKey(disability: str) -> str:
+    return f"{DISABILITY_USERS_PREFIX}{disability}"
+
+def employeeKeys(skill_ids, disability, is_verified) -> set:
+    keys = {skillUsersKey(skill_id) for skill_id in skill_ids}
+    keys |= {disabilityUsersKey(disability) for disability in parseDisabilities(disability)}
+    if is_verified:
+        keys.add(VERIFIED_KEY)
+    return keys
+
+async def indexEmployee(supabase, user_id: str):
+    # (re)index one employee from their current row, dropped from the index if the row is gone
+    if not await hasNormalizedSkills(supabase):
+        return
+    result = await runQuery(supabase.table("employee").select(INDEX_COLUMNS).eq("user_id", user_id))
+    employee = (result.data or [None])[0]
+    keys = set()
+    if employee:
+        keys = employeeKeys(await employeeSkillIds(supabase, employee), employee.get("disability"), employee.get("is_verified"))
+    previous = await redis.hget(USER_KEYS_KEY, user_id)
+    previous = set(json.loads(previous)) if previous else set()
+    pipe = redis.pipeline(transaction=False)
+    for key in previous - keys:
+        pipe.srem(key, user_id)
+    for key in keys - previous:
+        pipe.sadd(key, user_id)
+    if keys:
+        pipe.hset(USER_KEYS_KEY, user_id, json.dumps(sorted(keys)))
+    elif previous:
+        pipe.hdel(USER_KEYS_KEY, user_id)
+    # a running rebuild leaves this user alone, its pages may predate the write;
+    # every rebuild clears the set when it starts, the expiry bounds it if rebuilds stop
+    pipe.sadd(WRITTEN_KEY, user_id)
+    pipe.expire(WRITTEN_KEY, 2 * TALENT_INDEX_TTL)
+    await runPipeline(pipe)
+
+async def rebuildTalentIndex(supabase) -> int:
+    # reindex every employee, touching only the entries that changed, returns the number of indexed employees;
+    # callers hold REBUILD_LOCK_KEY (see lockedRebuild), so only one instance scans the employee table
+    await redis.delete(WRITTEN_KEY)
+    fresh, last_id = {}, 0
+    while True:
+        page = (await runQuery(
+            supabase.table("employee").select(INDEX_COLUMNS).gt("id", last_id).order("id").limit(REBUILD_PAGE_SIZE)
+        )).data or []
+        if not page:
+            break
+        # employees written before skill normalization are interned a page at a time
+        legacy = {row["user_id"]: await canonicalSkills(row.get("skills", "[]")) for row in page if not isinstance(row.get("skill_ids"), list)}
+        vocabulary = sorted({name for names in legacy.values() for name in names})
+        ids = dict(zip(vocabulary, await internSkills(supabase, vocabulary))) if vocabulary else {}
+        for row in page:
+            skill_ids = [ids[name] for name in legacy[row["user_id"]]] if row["user_id"] in legacy else row["skill_ids"]
+            keys = employeeKeys(skill_ids, row.get("disability"), row.get("is_verified"))
+            if keys:
+                fresh[row["user_id"]] = keys
+        last_id = page[-1]["id"]
+
+    # employees reindexed during the scan are already current, the pages read may be older than them
+    await syncIndex(USER_KEYS_KEY, fresh, lambda keys: keys, keep=await redis.smembers(WRITTEN_KEY))
+    await redis.set(READY_KEY, "1", ex=TALENT_INDEX_TTL)
+    return len(fresh)
+
+async def lockedRebuild(supabase):
+    # rebuild unless another instance already is, returns the number of indexed employees or None when skipped
+    token = uuid.uuid4().hex
+    if not await redis.set(REBUILD_LOCK_KEY, token, nx=True, ex=REBUILD_LOCK_TTL):
+        return None
+    try:
+        return await rebuildTalentIndex(supabase)
+    finally:
+        if await redis.get(REBUILD_LOCK_KEY) == token:
+            await redis.delete(REBUILD_LOCK_KEY)
+
+async def rebuildInBackground(supabase):
+    try:
+        await lockedRebuild(supabase)
+    except Exception as e:
+        print(f"⚠️ Talent index rebuild failed: {e}")
+
+async def talentIndexReady(supabase) -> bool:
+    # whether the index is built and fresh; if not, starts a background rebuild unless one is running
+    global _rebuild_task
+    if await redis.exists(READY_KEY):
+        return True
+    if _rebuild_task is None or _rebuild_task.done():
+        _rebuild_task = asyncio.create_task(rebuildInBackground(supabase))
+    return False
+
+async def markTalentIndexStale():
+    await redis.delete(READY_KEY)
+
+async def searchTalent(supabase, skill_ids: list, query_size: int, disabilities: set, verified_only: bool) -> list:
+    # [(user id, score)], score = matched query skills / query skills; without skills every match scores 0.
+    # While a rebuild runs this answers from the sets already indexed
+    await talentIndexReady(supabase)
+    filters = sorted(disabilityUsersKey(disability) for disability in disabilities)
+    if verified_only:
+        filters.append(VERIFIED_KEY)
+
+    if not skill_ids:
+        if not filters:
+            return []
+        return [(user_id, 0.0) for user_id in await redis.sinter(*filters)]
+
+    pipe = redis.pipeline(transaction=False)
+    for skill_id in skill_ids:
+        pipe.smembers(skillUsersKey(skill_id))
+    matched = {}
+    for users in await runPipeline(pipe):
+        for user_id in users:
+            matched[user_id] = matched.get(user_id, 0) + 1
+    if not matched or not filters:
+        return [(user_id, count / query_size) for user_id, count in matched.items()]
+
+    # every filter has to hold, checked for the matched users only
+    user_ids = list(matched)
+    pipe = redis.pipeline(transaction=False)
+    for key in filters:
+        pipe.smismember(key, user_ids)
+    flags = await runPipeline(pipe)
+    return [(user_id, matched[user_id] / query_size) for user_id, *checks in zip(user_ids, *flags) if all(checks)]
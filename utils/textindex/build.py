@@ -0,0 +1,28 @@
+# offline fit of the /reco-jobs description index
+#
+#   DESCRIPTION_INDEX_PATH=/srv/pwde/descriptions.joblib python -m utils.textindex.build
+#
+# Workers load the saved file on first use instead of fitting over the jobs table
+# themselves, and catch up with later job writes from the redis change log.
+import argparse
+import asyncio
+import sys
+
+from utils.general.service import getSupabaseServiceClient
+from utils.textindex.service import DESCRIPTION_INDEX_PATH, buildDescriptionIndex
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit and save the job description index.")
+    parser.add_argument("--path", default=DESCRIPTION_INDEX_PATH, help="output file (default: DESCRIPTION_INDEX_PATH)")
+    args = parser.parse_args(argv)
+    if not args.path:
+        print("⚠️ DESCRIPTION_INDEX_PATH is empty, pass --path")
+        return 1
+
+    index = asyncio.run(buildDescriptionIndex(getSupabaseServiceClient(), args.path))
+    print(f"✅ {len(index.rows)} job descriptions indexed at seq {index.seq}, saved to {args.path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
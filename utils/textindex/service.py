@@ -0,0 +1,307 @@
+# tf-idf index over job descriptions for /reco-jobs
+# Each worker holds the tf-idf rows of every pwd-friendly job as one sparse matrix, plus
+# the fitted vectorizer, and scores the employee's short_bio by cosine similarity.
+# Single jobs are added, replaced or dropped without refitting: new text goes through
+# the fitted vocabulary and idf, and replaced rows are tombstoned until the next compaction.
+# Job writes bump a redis sequence and record the job id under it, so every worker
+# catches up by re-reading only the changed descriptions. The fit itself only comes from
+# the offline build (python -m utils.textindex.build) saved to DESCRIPTION_INDEX_PATH,
+# which every worker has to be able to read; a worker without it serves /reco-jobs
+# without the description boost. Requests never wait on the index: loading, catching
+# up and saving run in a background task and the next request sees the result.
+import asyncio
+import os
+import tempfile
+
+from utils.database.service import runQuery
+from utils.redis_server.redis_client import redis
+from utils.startup.service import lazyImport, loadEnvironment
+
+loadEnvironment()
+
+# the temp dir stays writable on read-only deploys (Vercel); an empty value turns saving off
+DESCRIPTION_INDEX_PATH = os.getenv("DESCRIPTION_INDEX_PATH", os.path.join(tempfile.gettempdir(), "pwde_text_index", "descriptions.joblib"))
+DESCRIPTION_WEIGHT = float(os.getenv("DESCRIPTION_WEIGHT", "0.2"))
+SEQ_KEY = "description_index:seq"
+CHANGED_KEY = "description_index:changed"  # sorted set: job id -> sequence number of its last write
+TRIMMED_KEY = "description_index:trimmed"  # highest sequence number trimmed from CHANGED_KEY
+
+PAGE_SIZE = 1000
+FETCH_CHUNK_SIZE = 200
+SAVE_EVERY_CHANGES = 200
+COMPACT_DEAD_RATIO = 0.25
+REFIT_GROWTH = 2.0  # refit (new vocabulary and idf) once the index has grown this much since the last fit
+# changes kept below a saved index, for workers and precompute runs still catching up from an older sequence
+CHANGE_LOG_RETAIN = int(os.getenv("DESCRIPTION_CHANGE_LOG_RETAIN", "10000"))
+
+_index = None
+_index_mtime = None  # mtime of the saved file _index was loaded from or saved to
+_maintain_task = None
+_warned = set()
+_lock = asyncio.Lock()  # held by the background task and batch callers, never by a request
+
+
+class DescriptionIndex:
+    def __init__(self, vectorizer, matrix, rows: dict, seq: int, fitted_rows: int):
+        self.vectorizer = vectorizer  # None while there was nothing to fit on
+        self.matrix = matrix  # csr, one l2-normalized tf-idf row per slot
+        self.rows = rows  # job id -> live row
+        self.seq = seq
+        self.fitted_rows = fitted_rows
+        self.pending = []
+        self.dead = 0
+        self.unsaved = 0
+
+    @classmethod
+    def fit(cls, descriptions: dict, seq: int):
+        np = lazyImport("numpy")
+        sparse = lazyImport("scipy.sparse")
+        text = lazyImport("sklearn.feature_extraction.text")
+        vectorizer = text.TfidfVectorizer(stop_words="english", sublinear_tf=True, max_features=50000, dtype=np.float32)
+        job_ids = list(descriptions)
+        try:
+            matrix = vectorizer.fit_transform([descriptions[job_id] for job_id in job_ids]).tocsr()
+        except ValueError:
+            # no jobs, or no indexable words in any description yet
+            return cls(None, sparse.csr_matrix((0, 0), dtype=np.float32), {}, seq, 0)
+        return cls(vectorizer, matrix, {job_id: row for row, job_id in enumerate(job_ids)}, seq, len(job_ids))
+
+    def needsRefit(self) -> bool:
+        return self.vectorizer is None or len(self.rows) > REFIT_GROWTH * max(self.fitted_rows, 1)
+
+    def size(self) -> int:
+        return self.matrix.shape[0] + len(self.pending)
+
+    def upsert(self, job_id: str, description: str):
+        if self.vectorizer is None:
+            return
+        if job_id in self.rows:
+            self.dead += 1
+        self.pending.append(self.vectorizer.transform([description or ""]))
+        self.rows[job_id] = self.size() - 1
+        self.unsaved += 1
+
+    def remove(self, job_id: str):
+        if self.rows.pop(job_id, None) is not None:
+            self.dead += 1
+            self.unsaved += 1
+
+    def flush(self):
+        # fold pending rows into the matrix and compact once enough rows are dead
+        sparse = lazyImport("scipy.sparse")
+        if self.pending:
+            self.matrix = sparse.vstack([self.matrix, *self.pending], format="csr")
+            self.pending = []
+        if self.dead and self.dead > COMPACT_DEAD_RATIO * self.matrix.shape[0]:
+            job_ids = list(self.rows)
+            self.matrix = self.matrix[[self.rows[job_id] for job_id in job_ids]]
+            self.rows = {job_id: row for row, job_id in enumerate(job_ids)}
+            self.dead = 0
+
+    def similarity(self, query: str, job_ids: list):
+        # cosine similarity between the query and each job's description, 0 for unknown jobs
+        np = lazyImport("numpy")
+        result = np.zeros(len(job_ids))
+        if self.vectorizer is None or not query or not query.strip():
+            return result
+        self.flush()
+        positions, rows = [], []
+        for position, job_id in enumerate(job_ids):
+            row = self.rows.get(str(job_id))
+            if row is not None:
+                positions.append(position)
+                rows.append(row)
+        if rows:
+            vector = self.vectorizer.transform([query])
+            result[positions] = (self.matrix[rows] @ vector.T).toarray().ravel()
+        return result
+
+    def state(self) -> dict:
+        # picklable snapshot; flush() replaces the matrix instead of mutating it, so this stays valid
+        self.flush()
+        self.unsaved = 0
+        return {"vectorizer": self.vectorizer, "matrix": self.matrix, "rows": dict(self.rows), "seq": self.seq, "fitted_rows": self.fitted_rows}
+
+    @classmethod
+    def load(cls, path: str = DESCRIPTION_INDEX_PATH):
+        joblib = lazyImport("joblib")
+        state = joblib.load(path)
+        return cls(state["vectorizer"], state["matrix"], state["rows"], state["seq"], state["fitted_rows"])
+
+
+def writeIndexState(state: dict, path: str = DESCRIPTION_INDEX_PATH):
+    joblib = lazyImport("joblib")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    joblib.dump(state, tmp_path)
+    os.replace(tmp_path, path)
+
+
+async def getSequence() -> int:
+    return int(await redis.get(SEQ_KEY) or 0)
+
+async def getTrimmedSequence() -> int:
+    return int(await redis.get(TRIMMED_KEY) or 0)
+
+async def recordDescriptionChange(job_ids):
+    # called after a job is created, updated or deleted
+    for job_id in job_ids:
+        seq = await redis.incr(SEQ_KEY)
+        await redis.zadd(CHANGED_KEY, {str(job_id): seq})
+
+async def trimChangeLog(saved_seq: int):
+    # a saved index covers every change up to saved_seq, only the last CHANGE_LOG_RETAIN are kept below it
+    floor = saved_seq - CHANGE_LOG_RETAIN
+    if floor <= await getTrimmedSequence():
+        return
+    await redis.zremrangebyscore(CHANGED_KEY, "-inf", floor)
+    await redis.set(TRIMMED_KEY, floor)
+
+async def loadDescriptions(supabase, job_ids=None) -> dict:
+    # job id -> description of the pwd-friendly jobs, all of them or just the given ids
+    descriptions = {}
+    if job_ids is None:
+        start = 0
+        while True:
+            page = await runQuery(
+                supabase.table("jobs").select("id, job_description").eq("pwd_friendly", True)
+                .order("id").range(start, start + PAGE_SIZE - 1)
+            )
+            descriptions.update({str(job["id"]): job.get("job_description") or "" for job in page.data or []})
+            if len(page.data or []) < PAGE_SIZE:
+                return descriptions
+            start += PAGE_SIZE
+    job_ids = list(job_ids)
+    for i in range(0, len(job_ids), FETCH_CHUNK_SIZE):
+        result = await runQuery(
+            supabase.table("jobs").select("id, job_description").in_("id", job_ids[i:i + FETCH_CHUNK_SIZE]).eq("pwd_friendly", True)
+        )
+        descriptions.update({str(job["id"]): job.get("job_description") or "" for job in result.data or []})
+    return descriptions
+
+async def fitDescriptionIndex(supabase) -> DescriptionIndex:
+    seq = await getSequence()
+    descriptions = await loadDescriptions(supabase)
+    return await asyncio.to_thread(DescriptionIndex.fit, descriptions, seq)
+
+async def buildDescriptionIndex(supabase, path: str = DESCRIPTION_INDEX_PATH) -> DescriptionIndex:
+    # the offline build: fit over every pwd-friendly job and save it for the workers to load
+    index = await fitDescriptionIndex(supabase)
+    await asyncio.to_thread(writeIndexState, index.state(), path)
+    await trimChangeLog(index.seq)
+    return index
+
+def savedIndexMtime():
+    try:
+        return os.path.getmtime(DESCRIPTION_INDEX_PATH) if DESCRIPTION_INDEX_PATH else None
+    except OSError:
+        return None
+
+async def loadSavedIndex():
+    global _index_mtime
+    mtime = savedIndexMtime()
+    if mtime is None:
+        return None
+    try:
+        index = await asyncio.to_thread(DescriptionIndex.load)
+    except (OSError, ValueError, KeyError, EOFError) as e:
+        print(f"⚠️ Could not load the description index from {DESCRIPTION_INDEX_PATH}: {e}")
+        return None
+    _index_mtime = mtime
+    return index
+
+async def saveIndexQuietly(index: DescriptionIndex):
+    # a read-only or missing directory only means the next start replays more of the change log
+    global _index_mtime
+    if not DESCRIPTION_INDEX_PATH:
+        return
+    try:
+        await asyncio.to_thread(writeIndexState, index.state())
+    except OSError as e:
+        print(f"⚠️ Could not save the description index to {DESCRIPTION_INDEX_PATH}: {e}")
+        return
+    _index_mtime = savedIndexMtime()
+    await trimChangeLog(index.seq)
+
+def warnOnce(key: str, message: str):
+    if key not in _warned:
+        _warned.add(key)
+        print(f"⚠️ {message}")
+
+async def refreshIndex(supabase, fit_inline: bool = False):
+    # load (or reload a newer) saved index, then apply the change log; only batch jobs pass fit_inline to refit here
+    global _index
+    mtime = savedIndexMtime()
+    if _index is None or (mtime is not None and mtime != _index_mtime):
+        _index = await loadSavedIndex() or _index
+    if _index is None:
+        if not fit_inline:
+            warnOnce("missing", f"No description index at {DESCRIPTION_INDEX_PATH}, run python -m utils.textindex.build; serving without the description boost")
+            return
+        _index = await fitDescriptionIndex(supabase)
+        await saveIndexQuietly(_index)
+
+    seq = await getSequence()
+    stale = seq < _index.seq or _index.seq < await getTrimmedSequence() or (seq > _index.seq and _index.needsRefit())
+    if stale and fit_inline:
+        # the change log was reset or trimmed past the index, or the vocabulary is too old to extend
+        _index = await fitDescriptionIndex(supabase)
+        await saveIndexQuietly(_index)
+    elif stale:
+        warnOnce("stale", "The description index is behind the job change log, rerun python -m utils.textindex.build")
+        _index.seq = min(_index.seq, seq)
+    if seq > _index.seq:
+        changed = await redis.zrangebyscore(CHANGED_KEY, _index.seq + 1, seq)
+        descriptions = await loadDescriptions(supabase, changed)
+        for job_id in changed:
+            if job_id in descriptions:
+                _index.upsert(job_id, descriptions[job_id])
+            else:
+                _index.remove(job_id)
+        _index.seq = seq
+        if _index.unsaved >= SAVE_EVERY_CHANGES:
+            await saveIndexQuietly(_index)
+
+async def refreshInBackground(supabase):
+    try:
+        async with _lock:
+            await refreshIndex(supabase)
+    except Exception as e:
+        print(f"⚠️ Description index refresh failed: {e}")
+
+def startRefresh(supabase):
+    # at most one refresh per worker at a time
+    global _maintain_task
+    if _maintain_task is None or _maintain_task.done():
+        _maintain_task = asyncio.create_task(refreshInBackground(supabase))
+
+async def getDescriptionIndex(supabase, fit_inline: bool = False):
+    # the worker's index as of the last background refresh, None until one is loaded; a request only
+    # reads the sequence number and, when it moved, leaves the catch-up to a background task.
+    # Batch jobs pass fit_inline to wait for a fully caught-up index instead
+    if fit_inline:
+        async with _lock:
+            await refreshIndex(supabase, fit_inline=True)
+        return _index
+    if _index is None or await getSequence() != _index.seq or savedIndexMtime() != _index_mtime:
+        startRefresh(supabase)
+    return _index
+
+async def blendDescriptionScores(supabase, query: str, ranked: list) -> list:
+    # [(job id, rank score)] with DESCRIPTION_WEIGHT * cosine(query, description) added
+    if DESCRIPTION_WEIGHT <= 0 or not ranked or not query or not query.strip():
+        return ranked
+    index = await getDescriptionIndex(supabase)
+    return ranked if index is None else blendSimilarity(index, query, ranked)
+
+def blendSimilarity(index: DescriptionIndex, query: str, ranked: list) -> list:
+    # same blend against an index the caller already holds (the batch precompute workers)
+    if DESCRIPTION_WEIGHT <= 0 or not ranked or not query or not query.strip():
+        return ranked
+    similarity = index.similarity(query, [job_id for job_id, _ in ranked]).tolist()
+    return [(job_id, score + DESCRIPTION_WEIGHT * cosine) for (job_id, score), cosine in zip(ranked, similarity)]
+
+def saveDescriptionIndex():
+    # on shutdown, so the next start doesn't replay the change log
+    if _index is not None and _index.unsaved and DESCRIPTION_INDEX_PATH:
+        writeIndexState(_index.state())